@@ -5,3 +5,6 @@ class AdsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ads"
     verbose_name = "Ads"
+
+    def ready(self):
+        import ads.signals  # noqa: F401
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Q, QuerySet
+
+from config.cache import is_cache_enabled, make_cache_key
+
+# Границы корзин гистограммы цен; последняя корзина открыта сверху
+DEFAULT_PRICE_FACET_BOUNDS = (0, 1000, 5000, 10000, 50000, 100000, 500000)
+
+
+def get_price_facet_bounds() -> tuple[int, ...]:
+    return tuple(
+        getattr(settings, "ADS_PRICE_FACET_BOUNDS", DEFAULT_PRICE_FACET_BOUNDS)
+    )
+
+
+def price_histogram(queryset: QuerySet) -> list[dict[str, int | None]]:
+    """
+    Количество объявлений по ценовым корзинам для текущего набора фильтров.
+
+    Все корзины считаются одним агрегирующим запросом (COUNT ... FILTER / CASE
+    для каждой корзины). При включённом кэше результат кэшируется по
+    нормализованному набору фильтров и поколению данных объявлений.
+    Args:
+        queryset(QuerySet): Отфильтрованная выборка объявлений
+
+    Returns:
+        list[dict]: Корзины вида {"min": 0, "max": 1000, "count": 3},
+                    у последней корзины max = None
+    """
+    bounds = get_price_facet_bounds()
+    ranges = list(zip(bounds, bounds[1:] + (None,)))
+    queryset = queryset.order_by()
+
+    key = None
+    if is_cache_enabled():
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # Условие заведомо ложно (например, .none()): все корзины пусты
+            return [{"min": low, "max": high, "count": 0} for low, high in ranges]
+        key = make_cache_key("facets:price", queryset.model, sql, params, bounds)
+        histogram = cache.get(key)
+        if histogram is not None:
+            return histogram
+
+    aggregates = {}
+    for index, (low, high) in enumerate(ranges):
+        condition = Q(price__gte=low)
+        if high is not None:
+            condition &= Q(price__lt=high)
+        aggregates[f"bucket_{index}"] = Count("pk", filter=condition)
+    counts = queryset.aggregate(**aggregates)
+
+    histogram = [
+        {"min": low, "max": high, "count": counts[f"bucket_{index}"]}
+        for index, (low, high) in enumerate(ranges)
+    ]
+    if key is not None:
+        cache.set(key, histogram, getattr(settings, "LIST_CACHE_TIMEOUT", 300))
+    return histogram
@@ -1,16 +1,79 @@
+import re
+
 import django_filters
 
 from ads.models import Ad
+from ads.search import get_search_backend
 
 
 class AdFilter(django_filters.FilterSet):
     """
-    Фильтр для поиска объявлений по названию.
+    Фильтр для поиска объявлений по названию, полнотекстового и нечёткого поиска,
+    фильтрации по цене, дате создания и автору и сортировки.
     """
 
+    # Разрешённые варианты сортировки; id добавлен для однозначного порядка,
+    # каждый вариант соответствует составному индексу модели Ad
+    ORDERINGS = {
+        "price": ("price", "id"),
+        "-price": ("-price", "-id"),
+        "newest": ("-created_at", "-id"),
+    }
+
     # поиск будет регистронезависимым и будет искать частичное совпадение
-    title = django_filters.CharFilter(lookup_expr="iregex", label="Название")
+    title = django_filters.CharFilter(method="filter_title", label="Название")
+    # полнотекстовый поиск по названию и описанию с ранжированием
+    search = django_filters.CharFilter(method="filter_search", label="Поиск")
+    # нечёткий поиск по названию, устойчивый к опечаткам
+    fuzzy = django_filters.CharFilter(method="filter_fuzzy", label="Нечёткий поиск")
+    price_min = django_filters.NumberFilter(
+        field_name="price", lookup_expr="gte", label="Цена от"
+    )
+    price_max = django_filters.NumberFilter(
+        field_name="price", lookup_expr="lte", label="Цена до"
+    )
+    created_after = django_filters.IsoDateTimeFilter(
+        field_name="created_at", lookup_expr="gte", label="Создано не раньше"
+    )
+    created_before = django_filters.IsoDateTimeFilter(
+        field_name="created_at", lookup_expr="lte", label="Создано не позже"
+    )
+    author = django_filters.NumberFilter(field_name="author_id", label="Автор")
+    # сортировка применяется последней и заменяет сортировку по релевантности
+    ordering = django_filters.ChoiceFilter(
+        choices=(
+            ("price", "Сначала дешёвые"),
+            ("-price", "Сначала дорогие"),
+            ("newest", "Сначала новые"),
+        ),
+        method="filter_ordering",
+        label="Сортировка",
+    )
 
     class Meta:
         model = Ad
-        fields = ["title"]
+        fields = [
+            "title",
+            "search",
+            "fuzzy",
+            "price_min",
+            "price_max",
+            "created_after",
+            "created_before",
+            "author",
+            "ordering",
+        ]
+
+    def filter_title(self, queryset, name, value):
+        # Значение экранируется: пользователь не может передать произвольный regex.
+        # На PostgreSQL такой поиск ускоряет триграммный GIN - индекс по названию
+        return queryset.filter(title__iregex=re.escape(value))
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value)
+
+    def filter_fuzzy(self, queryset, name, value):
+        return get_search_backend().fuzzy_search(queryset, value)
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*self.ORDERINGS[value])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from config.images import collect_media_garbage
+
+
+class Command(BaseCommand):
+    help = "Delete media files that are no longer referenced by any record"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать файлы, которые будут удалены",
+        )
+
+    def handle(self, *args, **options):
+        removed = collect_media_garbage(dry_run=options["dry_run"])
+        for name in removed:
+            self.stdout.write(name)
+        self.stdout.write(f"Удалено файлов: {len(removed)}")
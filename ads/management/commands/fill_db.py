@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from ads.models import Ad
+from reviews.counters import reconcile_review_counters
 from reviews.models import Review
 from users.models import User
 
@@ -77,6 +78,8 @@ class Command(BaseCommand):
         Review.objects.bulk_create(
             [Review(**review_data) for review_data in reviews_data]
         )
+        # bulk_create не обновляет счётчики отзывов объявлений
+        reconcile_review_counters()
 
         # Вывод информации о созданных пользователях
         self.stdout.write(self.style.SUCCESS("Созданные пользователи:"))
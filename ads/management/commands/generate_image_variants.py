@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from config.images import IMAGE_STATUS_READY, process_image_variants
+
+# Модели с изображениями, для которых генерируются варианты
+MODELS = {"ads": "ads.Ad", "users": "users.User"}
+
+
+def _init_worker():
+    # Соединения с БД нельзя разделять между процессами
+    django.setup()
+    connections.close_all()
+
+
+def _process(model_label: str, pk: int) -> bool:
+    return process_image_variants(apps.get_model(model_label), pk)
+
+
+class Command(BaseCommand):
+    help = "Generate resized image variants for existing ads and user avatars"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Обрабатывать только указанные модели (по умолчанию все)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Количество процессов (1 - без пула процессов)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать варианты, даже если они уже готовы",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        for name in options["model"] or sorted(MODELS):
+            model_label = MODELS[name]
+            queryset = apps.get_model(model_label).objects.exclude(
+                Q(image__isnull=True) | Q(image="")
+            )
+            if not options["force"]:
+                queryset = queryset.exclude(image_status=IMAGE_STATUS_READY)
+            ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+
+            if workers == 1 or len(ids) < 2:
+                for pk in ids:
+                    _process(model_label, pk)
+            else:
+                # Дочерние процессы не должны унаследовать открытые соединения
+                connections.close_all()
+                with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                    chunksize = max(1, len(ids) // (workers * 4))
+                    labels = [model_label] * len(ids)
+                    list(pool.map(_process, labels, ids, chunksize=chunksize))
+
+            self.stdout.write(f"{name}: обработано изображений - {len(ids)}")
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:25
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Поисковый вектор поддерживается триггером, чтобы он обновлялся при любой
+# записи в таблицу (в том числе при bulk_create и update из queryset).
+CREATE_SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION ads_ad_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ads_ad_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON ads_ad
+    FOR EACH ROW EXECUTE FUNCTION ads_ad_search_vector_update();
+
+UPDATE ads_ad SET search_vector =
+    setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(description, '')), 'B');
+
+CREATE INDEX ads_ad_search_vector_gin ON ads_ad USING gin (search_vector);
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP INDEX IF EXISTS ads_ad_search_vector_gin;
+DROP TRIGGER IF EXISTS ads_ad_search_vector_trigger ON ads_ad;
+DROP FUNCTION IF EXISTS ads_ad_search_vector_update();
+"""
+
+
+def create_search_vector(apps, schema_editor):
+    # Триггер и GIN - индекс есть только в PostgreSQL (тесты работают на SQLite)
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH_VECTOR_SQL)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ad",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:10
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+CREATE_TRIGRAM_INDEX_SQL = (
+    "CREATE INDEX ads_ad_title_trgm_gin ON ads_ad USING gin (title gin_trgm_ops);"
+)
+
+DROP_TRIGRAM_INDEX_SQL = "DROP INDEX IF EXISTS ads_ad_title_trgm_gin;"
+
+
+def create_trigram_index(apps, schema_editor):
+    # Индекс по триграммам есть только в PostgreSQL (тесты работают на SQLite)
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGRAM_INDEX_SQL)
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGRAM_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0002_ad_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
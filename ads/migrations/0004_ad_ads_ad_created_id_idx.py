@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0003_ad_title_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="ads_ad_created_id_idx"
+            ),
+        ),
+    ]
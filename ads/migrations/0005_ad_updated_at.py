@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0004_ad_ads_ad_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ad",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="Обновляется при каждом сохранении объявления",
+                verbose_name="Дата и время изменения",
+            ),
+        ),
+    ]
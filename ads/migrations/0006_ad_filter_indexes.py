@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0005_ad_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(fields=["price", "id"], name="ads_ad_price_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["author", "-created_at"], name="ads_ad_author_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0006_ad_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ad",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("none", "Нет изображения"),
+                    ("pending", "Обрабатывается"),
+                    ("ready", "Готово"),
+                    ("failed", "Ошибка обработки"),
+                ],
+                default="none",
+                editable=False,
+                max_length=10,
+                verbose_name="Состояние обработки изображения",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ad",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Варианты изображения",
+            ),
+        ),
+    ]
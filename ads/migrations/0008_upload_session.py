@@ -0,0 +1,64 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:45
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("ads", "0007_ad_image_status_ad_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="Имя файла"),
+                ),
+                ("size", models.PositiveIntegerField(verbose_name="Размер файла")),
+                (
+                    "offset",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Получено байт"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Дата и время создания",
+                    ),
+                ),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор загрузки",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Сессия загрузки",
+                "verbose_name_plural": "Сессии загрузки",
+            },
+        ),
+    ]
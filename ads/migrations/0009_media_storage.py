@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:52
+
+import config.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0008_upload_session"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ad",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                help_text="Загрузите изображение товара",
+                null=True,
+                storage=config.storage.get_media_storage,
+                upload_to="ads/images/",
+                verbose_name="Изображение товара",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:10
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_review_counters(apps, schema_editor):
+    """
+    Заполняет счётчики отзывов для существующих объявлений одним UPDATE.
+    """
+    Ad = apps.get_model("ads", "Ad")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(ad=OuterRef("pk")).order_by().values("ad")
+    Ad.objects.update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(count=Count("pk")).values("count")), 0
+        ),
+        last_reviewed_at=Subquery(
+            reviews.annotate(last=Max("created_at")).values("last")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0009_media_storage"),
+        ("reviews", "0003_review_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ad",
+            name="last_reviewed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Дата и время последнего отзыва",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ad",
+            name="review_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Количество отзывов"
+            ),
+        ),
+        migrations.RunPython(fill_review_counters, migrations.RunPython.noop),
+    ]
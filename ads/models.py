@@ -1,7 +1,14 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from config.images import IMAGE_STATUS_CHOICES, IMAGE_STATUS_NONE
+from config.storage import get_media_storage
 from users.models import User
 
 NULLABLE = {"null": True, "blank": True}
@@ -17,7 +24,13 @@ class Ad(models.Model):
         description (str): Описание товара.
         author (ForeignKey): Пользователь, создавший объявление.
         created_at (DateTimeField): Дата и время создания объявления.
+        updated_at (DateTimeField): Дата и время последнего изменения объявления.
         image (ImageField): Изображение товара (опционально).
+        image_variants (JSONField): Уменьшенные копии изображения (WebP и JPEG).
+        image_status (str): Состояние генерации копий изображения.
+        review_count (int): Количество отзывов на объявление.
+        last_reviewed_at (DateTimeField): Дата и время последнего отзыва.
+        search_vector (SearchVectorField): Поисковый вектор по названию и описанию.
     """
 
     title = models.CharField(
@@ -46,12 +59,52 @@ class Ad(models.Model):
         verbose_name="Дата и время создания",
         help_text="Укажите дату и время создания объявления",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата и время изменения",
+        help_text="Обновляется при каждом сохранении объявления",
+    )
     image = models.ImageField(
         upload_to="ads/images/",
+        storage=get_media_storage,
+        # Индекс для подсчёта ссылок на файл при его освобождении
+        db_index=True,
         verbose_name="Изображение товара",
         help_text="Загрузите изображение товара",
         **NULLABLE,
     )
+    # Заполняются задачей Celery после загрузки изображения (config/images.py)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Варианты изображения",
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_STATUS_NONE,
+        editable=False,
+        verbose_name="Состояние обработки изображения",
+    )
+    # Денормализованные данные об отзывах: обновляются вместе с отзывами
+    # (reviews/counters.py), расхождения исправляет reconcile_review_counters
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество отзывов",
+    )
+    last_reviewed_at = models.DateTimeField(
+        editable=False,
+        verbose_name="Дата и время последнего отзыва",
+        **NULLABLE,
+    )
+    # Заполняется триггером PostgreSQL (см. миграцию 0002), индексируется GIN
+    search_vector = SearchVectorField(
+        editable=False,
+        verbose_name="Поисковый вектор",
+        **NULLABLE,
+    )
 
     def clean(self):
         """
@@ -97,3 +150,69 @@ image={self.image})"""
         verbose_name_plural = "Объявления"
         # Сортировка по дате создания (новые выше)
         ordering = ["-created_at"]
+        indexes = [
+            # Ключ пагинации по курсору (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="ads_ad_created_id_idx"),
+            # Сортировка по цене и фильтр по диапазону цен
+            models.Index(fields=["price", "id"], name="ads_ad_price_id_idx"),
+            # Объявления автора, новые выше
+            models.Index(
+                fields=["author", "-created_at"], name="ads_ad_author_created_idx"
+            ),
+        ]
+
+
+class UploadSession(models.Model):
+    """
+    Сессия возобновляемой загрузки изображения объявления по частям.
+
+    Части дописываются в файл path (вне MEDIA_ROOT) по смещению offset;
+    после загрузки всех size байт файл прикрепляется к объявлению.
+
+    Атрибуты:
+        id (UUIDField): Идентификатор сессии.
+        author (ForeignKey): Пользователь, открывший сессию.
+        filename (str): Исходное имя файла.
+        size (int): Размер файла в байтах.
+        offset (int): Количество уже полученных байт.
+        created_at (DateTimeField): Дата и время открытия сессии.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name="Автор загрузки",
+        related_name="upload_sessions",
+    )
+    filename = models.CharField(max_length=255, verbose_name="Имя файла")
+    size = models.PositiveIntegerField(verbose_name="Размер файла")
+    offset = models.PositiveIntegerField(default=0, verbose_name="Получено байт")
+    created_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Дата и время создания"
+    )
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.UPLOAD_SESSION_ROOT, f"{self.id}.part")
+
+    @property
+    def is_expired(self) -> bool:
+        return self.created_at + settings.UPLOAD_SESSION_TTL < timezone.now()
+
+    def discard(self) -> None:
+        """
+        Удаляет сессию вместе с частично загруженным файлом.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.delete()
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    class Meta:
+        verbose_name = "Сессия загрузки"
+        verbose_name_plural = "Сессии загрузки"
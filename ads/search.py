@@ -0,0 +1,309 @@
+import re
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, QuerySet, Value, When
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# Конфигурация полнотекстового поиска PostgreSQL (стемминг для русского языка)
+SEARCH_CONFIG = "russian"
+
+# Веса совпадений для резервного поиска (аналог весов A и B в tsvector)
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+# Порог сходства по триграммам для нечёткого поиска (от 0 до 1)
+DEFAULT_TRIGRAM_THRESHOLD = 0.3
+
+DEFAULT_SEARCH_BACKEND = "ads.search.DatabaseSearchBackend"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Разбивает строку на слова в нижнем регистре.
+    Args:
+        text(str): Исходная строка
+
+    Returns:
+        list[str]: Список слов
+    """
+    return TOKEN_RE.findall(text.lower())
+
+
+def search_ads(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Полнотекстовый поиск объявлений по названию и описанию.
+
+    На PostgreSQL используется поддерживаемый триггером столбец search_vector
+    с GIN - индексом, на остальных СУБД - резервный поиск по словам.
+    Результаты упорядочены по релевантности (поле rank).
+    Args:
+        queryset(QuerySet): Исходная выборка объявлений
+        query(str): Поисковый запрос пользователя
+
+    Returns:
+        QuerySet: Отфильтрованная и отсортированная выборка
+    """
+    if not tokenize(query):
+        return queryset.none()
+
+    if connection.vendor == "postgresql":
+        return _search_postgres(queryset, query)
+    return _search_fallback(queryset, query)
+
+
+def _search_postgres(queryset: QuerySet, query: str) -> QuerySet:
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created_at")
+    )
+
+
+def _search_fallback(queryset: QuerySet, query: str) -> QuerySet:
+    # iregex с экранированным словом вместо icontains: в SQLite LIKE
+    # не учитывает регистр только для ASCII, а кириллица встречается чаще всего
+    rank = Value(0.0, output_field=FloatField())
+    for token in tokenize(query):
+        pattern = re.escape(token)
+        in_title = Q(title__iregex=pattern)
+        in_description = Q(description__iregex=pattern)
+        queryset = queryset.filter(in_title | in_description)
+        rank = (
+            rank
+            + Case(
+                When(in_title, then=Value(TITLE_WEIGHT)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            + Case(
+                When(in_description, then=Value(DESCRIPTION_WEIGHT)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+    return queryset.annotate(rank=rank).order_by("-rank", "-created_at")
+
+
+def rank_by(queryset: QuerySet, scores: dict, name: str) -> QuerySet:
+    """
+    Ограничивает выборку найденными объявлениями и сортирует по оценке.
+    Args:
+        queryset(QuerySet): Исходная выборка объявлений
+        scores(dict): Оценка для каждого найденного первичного ключа
+        name(str): Имя аннотации с оценкой (rank, similarity)
+
+    Returns:
+        QuerySet: Отфильтрованная и отсортированная выборка
+    """
+    if not scores:
+        return queryset.none()
+    score = Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in scores.items()],
+        output_field=FloatField(),
+    )
+    return (
+        queryset.filter(pk__in=scores)
+        .annotate(**{name: score})
+        .order_by(f"-{name}", "-created_at")
+    )
+
+
+def get_trigram_threshold() -> float:
+    return getattr(
+        settings, "ADS_TRIGRAM_SIMILARITY_THRESHOLD", DEFAULT_TRIGRAM_THRESHOLD
+    )
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Разбивает строку на триграммы так же, как расширение pg_trgm:
+    каждое слово дополняется двумя пробелами слева и одним справа.
+    Args:
+        text(str): Исходная строка
+
+    Returns:
+        set[str]: Множество триграмм
+    """
+    result = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        result.update(map("".join, zip(padded, padded[1:], padded[2:])))
+    return result
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Сходство запроса с наиболее похожей непрерывной последовательностью слов
+    строки - близкий аналог функции word_similarity из pg_trgm.
+    Args:
+        query(str): Поисковый запрос
+        text(str): Строка, в которой ищется совпадение
+
+    Returns:
+        float: Сходство от 0 до 1
+    """
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return 0.0
+    word_trigrams = [trigrams(word) for word in tokenize(text)]
+    best = 0.0
+    for start in range(len(word_trigrams)):
+        extent = set()
+        for word in word_trigrams[start:]:
+            extent |= word
+            common = len(query_trigrams & extent)
+            best = max(best, common / len(query_trigrams | extent))
+    return best
+
+
+def fuzzy_search_ads(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Нечёткий поиск объявлений по названию с учётом опечаток.
+
+    На PostgreSQL используется оператор pg_trgm %> с GIN - индексом
+    по триграммам названия, на остальных СУБД - расчёт сходства в Python.
+    Результаты упорядочены по сходству (поле similarity).
+    Args:
+        queryset(QuerySet): Исходная выборка объявлений
+        query(str): Поисковый запрос пользователя
+
+    Returns:
+        QuerySet: Отфильтрованная и отсортированная выборка
+    """
+    if not tokenize(query):
+        return queryset.none()
+
+    threshold = get_trigram_threshold()
+    if connection.vendor == "postgresql":
+        return _fuzzy_search_postgres(queryset, query, threshold)
+    return _fuzzy_search_fallback(queryset, query, threshold)
+
+
+def _fuzzy_search_postgres(queryset: QuerySet, query: str, threshold: float):
+    # Оператор %> (условие GIN - индекса) сравнивает с порогом из параметра
+    # pg_trgm.word_similarity_threshold, который выставляет trigram_threshold();
+    # явное условие по similarity оставляет порог из настроек и без него
+    return (
+        queryset.filter(title__trigram_word_similar=query)
+        .annotate(similarity=TrigramWordSimilarity(query, "title"))
+        .filter(similarity__gte=threshold)
+        .order_by("-similarity", "-created_at")
+    )
+
+
+@contextmanager
+def trigram_threshold():
+    """
+    Выставляет порог нечёткого поиска для запросов внутри блока.
+
+    На PostgreSQL блок выполняется в транзакции, а параметр
+    pg_trgm.word_similarity_threshold задаётся только для неё
+    (set_config(..., true)): порог не переходит к другим запросам через
+    постоянные соединения (CONN_MAX_AGE), а при pgbouncer в режиме транзакций
+    действует на том же соединении сервера, что и сам поиск. Выборка
+    fuzzy_search_ads должна вычисляться внутри блока, иначе оператор %>
+    использует порог по умолчанию (0.6) и часть совпадений не найдётся.
+    """
+    if connection.vendor != "postgresql":
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(get_trigram_threshold())],
+            )
+        yield
+
+
+def _fuzzy_search_fallback(queryset: QuerySet, query: str, threshold: float):
+    scores = {}
+    for pk, title in queryset.values_list("pk", "title"):
+        score = word_similarity(query, title)
+        if score >= threshold:
+            scores[pk] = score
+
+    return rank_by(queryset, scores, "similarity")
+
+
+class BaseSearchBackend:
+    """
+    Интерфейс поискового движка объявлений.
+
+    Движок фильтрует выборку объявлений по запросу и упорядочивает её по
+    релевантности. Движки с собственным индексом получают изменения
+    объявлений через index_ad / remove_ad (вызываются из сигналов модели Ad).
+    """
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Полнотекстовый поиск по названию и описанию (аннотация rank).
+        """
+        raise NotImplementedError
+
+    def fuzzy_search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Нечёткий поиск по названию с учётом опечаток (аннотация similarity).
+        """
+        return fuzzy_search_ads(queryset, query)
+
+    def index_ad(self, ad) -> None:
+        """
+        Добавляет или обновляет объявление в индексе.
+        """
+
+    def index_ads(self, ads) -> None:
+        """
+        Добавляет в индекс несколько объявлений (например, после bulk_create).
+        """
+        for ad in ads:
+            self.index_ad(ad)
+
+    def remove_ad(self, ad_id: int) -> None:
+        """
+        Удаляет объявление из индекса.
+        """
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Поиск средствами СУБД: tsvector и pg_trgm на PostgreSQL,
+    резервный поиск по словам на остальных СУБД.
+    """
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        return search_ads(queryset, query)
+
+
+_backend = None
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """
+    Возвращает поисковый движок из настройки ADS_SEARCH_BACKEND
+    (путь к классу, по умолчанию ads.search.DatabaseSearchBackend).
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "ADS_SEARCH_BACKEND", DEFAULT_SEARCH_BACKEND)
+        _backend = import_string(path)()
+    return _backend
+
+
+@receiver(setting_changed)
+def reset_search_backend(setting, **kwargs):
+    global _backend
+    if setting == "ADS_SEARCH_BACKEND":
+        _backend = None
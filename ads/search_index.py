@@ -0,0 +1,184 @@
+import bisect
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from ads.search import (
+    DESCRIPTION_WEIGHT,
+    TITLE_WEIGHT,
+    BaseSearchBackend,
+    rank_by,
+    tokenize,
+)
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс по словам названий и описаний объявлений.
+
+    Для каждого слова хранится отсортированный список id объявлений (posting
+    list) в компактном массиве array("q"). Словарь слов хранится отсортированным,
+    поэтому слово запроса совпадает со всеми словами индекса, которые с него
+    начинаются ("ноутбук" находит "ноутбука", "ноутбуки").
+    """
+
+    def __init__(self):
+        self.postings = {"title": {}, "description": {}}
+        self.vocabulary = []
+        # Слова каждого объявления - чтобы удалять его из индекса без перебора
+        self.documents = {}
+
+    def add(self, ad_id: int, title: str, description: str) -> None:
+        self.remove(ad_id)
+        words = {
+            "title": set(tokenize(title or "")),
+            "description": set(tokenize(description or "")),
+        }
+        for field, field_words in words.items():
+            postings = self.postings[field]
+            for word in field_words:
+                posting = postings.get(word)
+                if posting is None:
+                    posting = postings[word] = array("q")
+                    if not self._in_vocabulary(word):
+                        bisect.insort(self.vocabulary, word)
+                bisect.insort(posting, ad_id)
+        self.documents[ad_id] = words
+
+    def remove(self, ad_id: int) -> None:
+        words = self.documents.pop(ad_id, None)
+        if words is None:
+            return
+        for field, field_words in words.items():
+            postings = self.postings[field]
+            for word in field_words:
+                posting = postings[word]
+                del posting[bisect.bisect_left(posting, ad_id)]
+                if not posting:
+                    del postings[word]
+                    if not any(word in other for other in self.postings.values()):
+                        del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]
+
+    def search(self, query: str) -> dict[int, float]:
+        """
+        Ищет объявления, содержащие все слова запроса (или слова с таким началом).
+        Args:
+            query(str): Поисковый запрос
+
+        Returns:
+            dict[int, float]: Оценка релевантности для каждого найденного id
+        """
+        scores = None
+        for token in tokenize(query):
+            token_scores = {}
+            for word in self._expand(token):
+                for field, weight in (
+                    ("title", TITLE_WEIGHT),
+                    ("description", DESCRIPTION_WEIGHT),
+                ):
+                    for ad_id in self.postings[field].get(word, ()):
+                        token_scores[ad_id] = max(token_scores.get(ad_id, 0), weight)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    ad_id: score + token_scores[ad_id]
+                    for ad_id, score in scores.items()
+                    if ad_id in token_scores
+                }
+            if not scores:
+                break
+        return scores or {}
+
+    def _in_vocabulary(self, word: str) -> bool:
+        index = bisect.bisect_left(self.vocabulary, word)
+        return index < len(self.vocabulary) and self.vocabulary[index] == word
+
+    def _expand(self, token: str) -> list[str]:
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + "\U0010ffff")
+        return self.vocabulary[start:end]
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """
+    Поиск по инвертированному индексу в памяти процесса.
+
+    Индекс строится из таблицы объявлений при первом поиске, обновляется
+    сигналами модели Ad и перестраивается раз в rebuild_interval секунд, чтобы
+    подхватить изменения из других процессов. Перестроение идёт без
+    блокировки: поиск обслуживается старым индексом, а изменения, пришедшие
+    за время перестроения, применяются к новому после замены. Каждый процесс
+    держит свою копию, поэтому движок рассчитан на среду разработки, тесты на
+    SQLite и небольшие шарды; выборка всё равно фильтруется базой по
+    найденным id.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index = None
+        self.built_at = 0.0
+        # Изменения во время перестроения (None - перестроение не идёт)
+        self.pending = None
+
+    @property
+    def rebuild_interval(self):
+        return getattr(settings, "ADS_SEARCH_INDEX_REBUILD_INTERVAL", 300)
+
+    def build(self) -> None:
+        from ads.models import Ad
+
+        with self.lock:
+            if self.pending is not None:
+                # Индекс уже перестраивает другой поток
+                return
+            self.pending = []
+        try:
+            index = InvertedIndex()
+            rows = Ad.objects.values_list("pk", "title", "description")
+            for ad_id, title, description in rows.iterator():
+                index.add(ad_id, title, description)
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+
+        with self.lock:
+            self.index = index
+            self.built_at = time.monotonic()
+            pending, self.pending = self.pending, None
+            for action, args in pending:
+                action(*args)
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        expired = time.monotonic() - self.built_at > self.rebuild_interval
+        if self.index is None or expired:
+            self.build()
+        with self.lock:
+            scores = self.index.search(query) if self.index is not None else {}
+        return rank_by(queryset, scores, "rank")
+
+    def index_ad(self, ad) -> None:
+        with self.lock:
+            args = (ad.pk, ad.title, ad.description)
+            if self.pending is not None:
+                self.pending.append((self._add, args))
+            # До первого поиска индекс не построен - он будет прочитан из БД
+            if self.index is not None:
+                self._add(*args)
+
+    def remove_ad(self, ad_id: int) -> None:
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((self._remove, (ad_id,)))
+            if self.index is not None:
+                self._remove(ad_id)
+
+    def _add(self, ad_id: int, title: str, description: str) -> None:
+        self.index.add(ad_id, title, description)
+
+    def _remove(self, ad_id: int) -> None:
+        self.index.remove(ad_id)
@@ -1,10 +1,14 @@
 from rest_framework import serializers
 
-from ads.models import Ad
+from ads.models import Ad, UploadSession
 from ads.validators import AdValidator
+from config.images import ImageVariantsField
+from config.media import MediaImageField
+from config.serializers import ExpandableFieldsSerializerMixin
+from users.serializers import AuthorSummarySerializer
 
 
-class AdSerializer(serializers.ModelSerializer):
+class AdSerializer(ExpandableFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Ad.
     """
@@ -19,7 +23,7 @@ class AdSerializer(serializers.ModelSerializer):
     description = serializers.CharField(allow_null=True, required=False)
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
-    image = serializers.ImageField(
+    image = MediaImageField(
         # Поле может быть пустым
         allow_null=True,
         # Необязательно для заполнения
@@ -27,6 +31,12 @@ class AdSerializer(serializers.ModelSerializer):
         # Возвращает полный URL (если настроен MEDIA_URL)
         use_url=True,
     )
+    # Уменьшенные копии изображения (WebP и JPEG) и состояние их генерации
+    image_variants = ImageVariantsField()
+    image_status = serializers.CharField(read_only=True)
+    # Счётчики отзывов для карточки объявления (без запроса списка отзывов)
+    review_count = serializers.IntegerField(read_only=True)
+    last_reviewed_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Ad
@@ -38,7 +48,13 @@ class AdSerializer(serializers.ModelSerializer):
             "author",  # Только для чтения
             "created_at",  # Только для чтения
             "image",  # Не обязателен для заполнения
+            "image_variants",  # Только для чтения
+            "image_status",  # Только для чтения
+            "review_count",  # Только для чтения
+            "last_reviewed_at",  # Только для чтения
         )
+        # ?expand=author: автор объектом вместо id
+        expandable_fields = {"author": AuthorSummarySerializer}
 
     def validate(self, data):
         """
@@ -47,3 +63,56 @@ class AdSerializer(serializers.ModelSerializer):
         validator = AdValidator()
         validator(data)
         return data
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор для сессии загрузки изображения по частям.
+    """
+
+    id = serializers.UUIDField(read_only=True)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    offset = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",  # Только для чтения
+            "filename",  # Обязателен для заполнения
+            "size",  # Обязателен для заполнения
+            "offset",  # Только для чтения
+            "created_at",  # Только для чтения
+        )
+
+    def validate(self, data):
+        """
+        Проверяем имя и размер файла теми же правилами, что и для image.
+        """
+        validator = AdValidator()
+        validator.validate_image_name(data["filename"])
+        validator.validate_image_size(data["size"])
+        return data
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    """
+    Сериализатор запроса на прямую загрузку изображения в хранилище.
+    """
+
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    content_hash = serializers.RegexField(
+        r"^[0-9a-f]{64}$",
+        error_messages={"invalid": "Укажите SHA-256 файла в шестнадцатеричном виде."},
+    )
+
+    def validate(self, data):
+        """
+        Проверяем имя и размер файла теми же правилами, что и для image.
+        """
+        validator = AdValidator()
+        validator.validate_image_name(data["filename"])
+        validator.validate_image_size(data["size"])
+        return data
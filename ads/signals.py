@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ads.models import Ad
+from ads.search import get_search_backend
+from ads.suggestions import title_suggester
+from ads.tasks import generate_ad_image_variants
+from config.cache import bump_generation
+from config.images import release_deleted_image, schedule_image_variants
+
+
+@receiver(post_save, sender=Ad)
+@receiver(post_delete, sender=Ad)
+def ad_changed(sender, **kwargs):
+    """
+    Сбрасывает кэши, зависящие от таблицы объявлений.
+    """
+    bump_generation(Ad)
+
+
+@receiver(post_save, sender=Ad)
+def index_ad(sender, instance, **kwargs):
+    """
+    Обновляет объявление в индексе поискового движка и в подсказках.
+    """
+    get_search_backend().index_ad(instance)
+    title_suggester.add(instance)
+
+
+@receiver(post_save, sender=Ad)
+def schedule_ad_image_variants(sender, instance, **kwargs):
+    """
+    Ставит генерацию уменьшенных копий изображения после его загрузки.
+    """
+    schedule_image_variants(instance, generate_ad_image_variants)
+
+
+@receiver(post_delete, sender=Ad)
+def remove_ad_from_index(sender, instance, **kwargs):
+    """
+    Удаляет объявление из индекса поискового движка и из подсказок.
+    """
+    get_search_backend().remove_ad(instance.pk)
+    title_suggester.remove(instance.pk)
+
+
+@receiver(post_delete, sender=Ad)
+def release_ad_image(sender, instance, **kwargs):
+    """
+    Удаляет файл изображения, если на него больше не ссылаются другие записи.
+    """
+    release_deleted_image(instance)
+
+
+def ads_bulk_changed(ads) -> None:
+    """
+    bulk_create и QuerySet.update() не отправляют сигналы post_save, поэтому
+    после массового создания или изменения объявлений кэши и индексы
+    обновляются этой функцией.
+    Args:
+        ads(Iterable[Ad]): Созданные или изменённые объявления (с заполненными id)
+    """
+    bump_generation(Ad)
+    ads = list(ads)
+    get_search_backend().index_ads(ads)
+    for ad in ads:
+        title_suggester.add(ad)
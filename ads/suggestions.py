@@ -0,0 +1,245 @@
+import bisect
+import heapq
+import threading
+import time
+
+from django.conf import settings
+
+from ads.search import TOKEN_RE
+
+# Верхняя граница символов: (prefix + MAX_CHAR,) больше всех ключей с префиксом
+MAX_CHAR = "\U0010ffff"
+
+
+class TitleSuggester:
+    """
+    Подсказки для автодополнения названий объявлений по префиксу.
+
+    Для каждого слова названия хранится ключ - хвост названия в нижнем
+    регистре, начиная с этого слова. Ключи лежат в отсортированном списке,
+    поэтому все продолжения префикса находятся двоичным поиском (bisect),
+    а лучшие из них выбираются по весу - времени создания объявления.
+    Одинаковые названия возвращаются один раз (самое новое объявление).
+
+    Для коротких префиксов (первые нажатия клавиш), которым соответствует
+    большая часть ключей, заранее хранятся лучшие bucket_size названий, поэтому
+    запрос не перебирает диапазон ключей. Для длинных префиксов перебирается не
+    больше max_scan ключей.
+
+    Структура строится из таблицы объявлений при первом запросе, обновляется
+    сигналами модели Ad и перестраивается раз в rebuild_interval секунд, чтобы
+    подхватить изменения из других процессов. Перестроение идёт без
+    блокировки: запросы обслуживаются старой структурой, а изменения,
+    пришедшие за время перестроения, применяются к новой после замены.
+    """
+
+    bucket_prefix_length = 3
+    bucket_size = 20
+    max_scan = 5000
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.entries = None
+        self.documents = {}
+        # Префикс -> (лучшие названия [(-вес, -id)], известны ли все названия)
+        self.buckets = {}
+        self.built_at = 0.0
+        # Изменения во время перестроения (None - перестроение не идёт)
+        self.pending = None
+
+    @property
+    def rebuild_interval(self):
+        return getattr(settings, "ADS_SUGGEST_REBUILD_INTERVAL", 300)
+
+    def build(self) -> None:
+        from ads.models import Ad
+
+        with self.lock:
+            if self.pending is not None:
+                # Структуру уже перестраивает другой поток
+                return
+            self.pending = []
+        try:
+            entries, documents = [], {}
+            rows = Ad.objects.values_list("pk", "title", "created_at")
+            for ad_id, title, created_at in rows.iterator():
+                keys = self._keys(title)
+                documents[ad_id] = self._document(title, created_at)
+                entries.extend((key, ad_id) for key in keys)
+            entries.sort()
+            buckets = self._build_buckets(entries, documents)
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+
+        with self.lock:
+            self.entries, self.documents, self.buckets = entries, documents, buckets
+            self.built_at = time.monotonic()
+            pending, self.pending = self.pending, None
+            for action, args in pending:
+                action(*args)
+
+    def add(self, ad) -> None:
+        with self.lock:
+            args = (ad.pk, ad.title, ad.created_at)
+            if self.pending is not None:
+                self.pending.append((self._add, args))
+            if self.entries is not None:
+                self._add(*args)
+
+    def remove(self, ad_id: int) -> None:
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((self._remove, (ad_id,)))
+            if self.entries is not None:
+                self._remove(ad_id)
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """
+        Возвращает до limit самых новых объявлений с разными названиями, у
+        которых одно из слов названия (вместе с продолжением) начинается с
+        prefix.
+        Args:
+            prefix(str): Введённая пользователем строка
+            limit(int): Максимальное количество подсказок
+
+        Returns:
+            list[tuple[int, str]]: Пары (id объявления, название)
+        """
+        prefix = " ".join(TOKEN_RE.findall(prefix.lower()))
+        if not prefix:
+            return []
+
+        expired = time.monotonic() - self.built_at > self.rebuild_interval
+        if self.entries is None or expired:
+            self.build()
+
+        with self.lock:
+            if self.entries is None:
+                return []
+            if len(prefix) <= self.bucket_prefix_length and limit <= self.bucket_size:
+                items = self._bucket(prefix, limit)
+            else:
+                start = bisect.bisect_left(self.entries, (prefix,))
+                stop = bisect.bisect_left(self.entries, (prefix + MAX_CHAR,), start)
+                items, _ = self._top(
+                    self.entries,
+                    self.documents,
+                    start,
+                    min(stop, start + self.max_scan),
+                    limit,
+                )
+            return [(-ad_id, self.documents[-ad_id][0]) for _, ad_id in items]
+
+    def _add(self, ad_id: int, title: str, created_at) -> None:
+        document = self._document(title, created_at)
+        if self.documents.get(ad_id) == document:
+            # Название и дата не изменились - подсказки тоже
+            return
+        self._remove(ad_id)
+        self.documents[ad_id] = document
+        keys = self._keys(title)
+        for key in keys:
+            bisect.insort(self.entries, (key, ad_id))
+        item = (-document[1], -ad_id)
+        for prefix in self._prefixes(keys):
+            self._bucket_insert(prefix, item, document[2])
+
+    def _remove(self, ad_id: int) -> None:
+        document = self.documents.pop(ad_id, None)
+        if document is None:
+            return
+        keys = self._keys(document[0])
+        for key in keys:
+            index = bisect.bisect_left(self.entries, (key, ad_id))
+            del self.entries[index]
+        for prefix in self._prefixes(keys):
+            items, _ = self.buckets.get(prefix, ([], True))
+            for index, (_, other_id) in enumerate(items):
+                if other_id == -ad_id:
+                    # Вместо удалённого могло подняться более старое объявление
+                    # с тем же названием: верны только названия выше него
+                    self.buckets[prefix] = (items[:index], False)
+                    break
+
+    def _bucket(self, prefix: str, limit: int) -> list[tuple]:
+        items, complete = self.buckets.get(prefix, ([], True))
+        if len(items) < limit and not complete:
+            # Лучшие названия были удалены - пересчитываем префикс один раз
+            start = bisect.bisect_left(self.entries, (prefix,))
+            stop = bisect.bisect_left(self.entries, (prefix + MAX_CHAR,), start)
+            items, complete = self._top(
+                self.entries, self.documents, start, stop, self.bucket_size
+            )
+            self.buckets[prefix] = (items, complete)
+        return items[:limit]
+
+    def _bucket_insert(self, prefix: str, item: tuple, title_key: str) -> None:
+        items, complete = self.buckets.get(prefix, ([], True))
+        items = list(items)
+        for index, (_, other_id) in enumerate(items):
+            if self.documents[-other_id][2] == title_key:
+                if items[index] <= item:
+                    return
+                del items[index]
+                break
+        # Без полного списка названий новое можно добавить, только если оно
+        # лучше худшего из известных
+        if complete or (items and item < items[-1]):
+            bisect.insort(items, item)
+            if len(items) > self.bucket_size:
+                items, complete = items[: self.bucket_size], False
+        self.buckets[prefix] = (items, complete)
+
+    def _build_buckets(self, entries, documents) -> dict:
+        buckets = {}
+        for length in range(1, self.bucket_prefix_length + 1):
+            start = 0
+            while start < len(entries):
+                prefix = entries[start][0][:length]
+                if len(prefix) < length:
+                    start += 1
+                    continue
+                stop = bisect.bisect_left(entries, (prefix + MAX_CHAR,), start)
+                buckets[prefix] = self._top(
+                    entries, documents, start, stop, self.bucket_size
+                )
+                start = stop
+        return buckets
+
+    @staticmethod
+    def _top(entries, documents, start, stop, limit) -> tuple[list[tuple], bool]:
+        """
+        Лучшие limit названий среди ключей entries[start:stop] в виде
+        [(-вес, -id)] и признак того, что других названий в диапазоне нет.
+        """
+        best = {}
+        for index in range(start, stop):
+            ad_id = entries[index][1]
+            _, weight, title_key = documents[ad_id]
+            item = (-weight, -ad_id)
+            if title_key not in best or item < best[title_key]:
+                best[title_key] = item
+        return heapq.nsmallest(limit, best.values()), len(best) <= limit
+
+    def _prefixes(self, keys) -> set[str]:
+        return {
+            key[:length]
+            for key in keys
+            for length in range(1, self.bucket_prefix_length + 1)
+            if len(key) >= length
+        }
+
+    @staticmethod
+    def _document(title: str, created_at) -> tuple[str, float, str]:
+        # (название, вес, нормализованное название для объединения одинаковых)
+        return title, created_at.timestamp(), " ".join(TOKEN_RE.findall(title.lower()))
+
+    @staticmethod
+    def _keys(title: str) -> set[str]:
+        words = TOKEN_RE.findall(title.lower())
+        return {" ".join(words[start:]) for start in range(len(words))}
+
+
+title_suggester = TitleSuggester()
@@ -0,0 +1,35 @@
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from ads.models import Ad, UploadSession
+from config.images import collect_media_garbage as collect_garbage
+from config.images import process_image_variants
+
+
+@shared_task
+def generate_ad_image_variants(ad_id: int) -> None:
+    """
+    Генерирует уменьшенные копии изображения объявления.
+    """
+    if not process_image_variants(Ad, ad_id):
+        # Изображение заменили во время обработки - обрабатываем новое
+        generate_ad_image_variants.delay(ad_id)
+
+
+@shared_task
+def clear_expired_upload_sessions() -> None:
+    """
+    Удаляет незавершённые сессии загрузки и их файлы по истечении срока.
+    """
+    expired_before = timezone.now() - settings.UPLOAD_SESSION_TTL
+    for session in UploadSession.objects.filter(created_at__lt=expired_before):
+        session.discard()
+
+
+@shared_task
+def collect_media_garbage() -> None:
+    """
+    Удаляет файлы изображений, на которые не ссылается ни одна запись.
+    """
+    collect_garbage()
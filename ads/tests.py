@@ -1,15 +1,54 @@
+import base64
+import hashlib
+import io
 import json
-
+import os
+import random
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import boto3
+import requests
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import storages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework import status
-from rest_framework.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from djangorestframework_camel_case.parser import (
+    CamelCaseJSONParser as LibraryCamelCaseJSONParser,
+)
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as LibraryCamelCaseJSONRenderer,
+)
+from moto import mock_aws
+from PIL import Image
+from rest_framework import serializers, status
+from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.test import APITestCase
 
-from ads.models import Ad
+from ads.models import Ad, UploadSession
+from ads.search import get_search_backend
+from ads.serializers import AdSerializer
+from ads.suggestions import TitleSuggester
+from ads.tasks import clear_expired_upload_sessions
 from ads.validators import AdValidator
+from config.cache import get_generation
+from config.parsers import CamelCaseJSONParser
+from config.renderers import CamelCaseJSONRenderer
+from config.serializers import ValuesSerializer
 from reviews.models import Review
 from users.models import User
 
@@ -53,6 +92,69 @@ class AdTestCase(APITestCase):
         self.assertEqual(ad.price, 1200)
         self.assertEqual(ad.author, self.user)
 
+    def test_bulk_create_ads(self):
+        """
+        Тестирование массового создания объявлений одним INSERT.
+        """
+        data = [
+            {"title": "book", "price": 1200},
+            {"title": "lamp", "price": 800, "description": "desk lamp"},
+            {"title": "chair", "price": 3000},
+        ]
+        url = reverse("ads:ads-bulk-create")
+
+        # 1 гипотеза - проверка прав, SAVEPOINT, INSERT и RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                url, data=json.dumps(data), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # 2 гипотеза - ответ содержит созданные объявления с id
+        response_data = response.json()
+        self.assertEqual(
+            [ad["title"] for ad in response_data], ["book", "lamp", "chair"]
+        )
+        self.assertTrue(all(ad["id"] for ad in response_data))
+        self.assertEqual(Ad.objects.filter(author=self.user).count(), 3)
+
+        # 3 гипотеза - созданные объявления видны в списке (кэш сброшен)
+        response = self.client.get(reverse("ads:ads-list"))
+        self.assertEqual(response.json()["count"], 3)
+
+    def test_bulk_create_ads_item_errors(self):
+        """
+        Тестирование ошибок валидации по каждому элементу массового создания.
+        """
+        data = [
+            {"title": "book", "price": 1200},
+            {"title": "x", "price": 100},
+            {"title": "lamp"},
+        ]
+        url = reverse("ads:ads-bulk-create")
+        response = self.client.post(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 2 гипотеза - ошибки по позициям, ничего не сохранено
+        response_data = response.json()
+        self.assertEqual(response_data[0], {})
+        self.assertEqual(
+            response_data[1]["nonFieldErrors"],
+            ["Название должно содержать минимум 2 символа."],
+        )
+        self.assertEqual(response_data[2]["price"], ["Указание цены обязательно."])
+        self.assertFalse(Ad.objects.exists())
+
+        # 3 гипотеза - тело запроса должно быть списком
+        response = self.client.post(
+            url, data=json.dumps(data[0]), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_list_ad(self):
         """
         Тестирование вывода списка объявлений.
@@ -85,6 +187,175 @@ class AdTestCase(APITestCase):
         self.assertEqual(response_data["results"][1]["price"], 650000)
         self.assertEqual(response_data["results"][1]["author"], self.user.id)
 
+    def test_list_ad_cursor_pagination(self):
+        """
+        Тестирование пагинации по курсору (created_at, id) в обе стороны.
+        """
+        created_at = timezone.now()
+        ads = [
+            Ad.objects.create(
+                title=f"ad {i}", price=1000, author=self.user, created_at=created_at
+            )
+            for i in range(6)
+        ]
+
+        url = reverse("ads:ads-list")
+        response = self.client.get(url, {"pagination": "cursor"})
+
+        # 1 гипотеза - первая страница без count, при равных датах новее больший id
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertNotIn("count", response_data)
+        self.assertIsNone(response_data["previous"])
+        self.assertEqual(
+            [ad["id"] for ad in response_data["results"]],
+            [ad.id for ad in reversed(ads[2:])],
+        )
+
+        # 2 гипотеза - вторая страница по ссылке next
+        response_data = self.client.get(response_data["next"]).json()
+        self.assertEqual(
+            [ad["id"] for ad in response_data["results"]],
+            [ads[1].id, ads[0].id],
+        )
+        self.assertIsNone(response_data["next"])
+
+        # 3 гипотеза - возврат на первую страницу по ссылке previous
+        response_data = self.client.get(response_data["previous"]).json()
+        self.assertEqual(len(response_data["results"]), 4)
+        self.assertEqual(response_data["results"][0]["id"], ads[5].id)
+        self.assertIsNone(response_data["previous"])
+
+        # 4 гипотеза - некорректный курсор
+        response = self.client.get(url, {"cursor": "broken"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # 5 гипотеза - корректный по структуре, но подделанный курсор
+        for position in (
+            ["garbage", 1],
+            ["2020-01-01T00:00:00Z", "zz"],
+            [{"a": 1}, 1],
+            [None, None],
+        ):
+            payload = json.dumps(
+                {"p": position, "r": 0, "k": ["-created_at", "-id"]}
+            ).encode()
+            cursor = base64.urlsafe_b64encode(payload).decode()
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(CACHE_ENABLED=True)
+    def test_list_ad_count_cache(self):
+        """
+        Тестирование кэширования точного количества объявлений в списке.
+        """
+        Ad.objects.create(title="yacht", price=650000, author=self.user)
+        url = reverse("ads:ads-list")
+
+        response_data = self.client.get(url).json()
+        self.assertEqual(response_data["count"], 1)
+        self.assertFalse(response_data["countIsApproximate"])
+
+        # bulk_create не отправляет сигналы - count берётся из кэша
+        Ad.objects.bulk_create([Ad(title="car", price=250000, author=self.user)])
+        self.assertEqual(self.client.get(url).json()["count"], 1)
+
+        # для другого набора фильтров - свой ключ кэша
+        self.assertEqual(self.client.get(url, {"title": "car"}).json()["count"], 1)
+
+        # сохранение через модель сбрасывает кэш
+        Ad.objects.create(title="moto", price=120000, author=self.user)
+        self.assertEqual(self.client.get(url).json()["count"], 3)
+
+    @override_settings(CACHE_ENABLED=True)
+    def test_list_ad_response_cache(self):
+        """
+        Тестирование кэша страниц списка и его сброса при изменении объявлений.
+        """
+        ad = Ad.objects.create(title="yacht", price=650000, author=self.user)
+        url = reverse("ads:ads-list")
+
+        self.assertEqual(self.client.get(url).json()["count"], 1)
+
+        # 1 гипотеза - повторный запрос обслуживается из кэша без запросов к БД
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["results"][0]["title"], "yacht")
+
+        # 2 гипотеза - изменение объявления сбрасывает кэш
+        ad.title = "boat"
+        ad.save()
+        response_data = self.client.get(url).json()
+        self.assertEqual(response_data["results"][0]["title"], "boat")
+
+        # 3 гипотеза - удаление объявления сбрасывает кэш
+        ad.delete()
+        self.assertEqual(self.client.get(url).json()["count"], 0)
+
+    @override_settings(CACHE_ENABLED=True)
+    def test_list_ad_cache_bumped_on_commit(self):
+        """
+        Тестирование сброса кэша списка после фиксации транзакции.
+        """
+        ad = Ad.objects.create(title="yacht", price=650000, author=self.user)
+        url = reverse("ads:ads-list")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ad.title = "boat"
+            ad.save()
+            # Страница, закэшированная до фиксации (другой процесс ещё видит
+            # старую строку), не должна пережить фиксацию
+            generation = get_generation(Ad)
+            self.client.get(url)
+
+        # 1 гипотеза - после фиксации поколение снова увеличено
+        self.assertGreater(get_generation(Ad), generation)
+        response_data = self.client.get(url).json()
+        self.assertEqual(response_data["results"][0]["title"], "boat")
+
+    def test_list_ad_estimated_count(self):
+        """
+        Тестирование приблизительного количества для больших таблиц.
+        """
+        Ad.objects.create(title="yacht", price=650000, author=self.user)
+        url = reverse("ads:ads-list")
+
+        with patch("config.paginations.estimate_count", return_value=250000):
+            response_data = self.client.get(url).json()
+        self.assertEqual(response_data["count"], 250000)
+        self.assertTrue(response_data["countIsApproximate"])
+        self.assertEqual(len(response_data["results"]), 1)
+
+        # оценка ниже порога - точный подсчёт
+        with patch("config.paginations.estimate_count", return_value=10):
+            response_data = self.client.get(url).json()
+        self.assertEqual(response_data["count"], 1)
+        self.assertFalse(response_data["countIsApproximate"])
+
+    @override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=5)
+    def test_list_ad_estimate_below_actual_count(self):
+        """
+        Тестирование страниц за пределами заниженной оценки количества.
+        """
+        for i in range(12):
+            Ad.objects.create(title=f"ad {i}", price=100 + i, author=self.user)
+        url = reverse("ads:ads-list")
+
+        with patch("config.paginations.estimate_count", return_value=7):
+            page_2 = self.client.get(url, {"page": 2}).json()
+            page_3 = self.client.get(url, {"page": 3}).json()
+            page_4 = self.client.get(url, {"page": 4})
+
+        # 1 гипотеза - в ответе показывается оценка
+        self.assertEqual(page_2["count"], 7)
+        self.assertTrue(page_2["countIsApproximate"])
+
+        # 2 гипотеза - следующая страница определяется по данным, а не по оценке
+        self.assertIsNotNone(page_2["next"])
+        self.assertEqual(len(page_3["results"]), 4)
+        self.assertIsNone(page_3["next"])
+        self.assertEqual(page_4.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_retrieve_ad(self):
         """
         Тестирование просмотра 1 объявления
@@ -105,6 +376,35 @@ class AdTestCase(APITestCase):
         self.assertEqual(response_data["price"], 120000)
         self.assertEqual(response_data["author"], self.user.id)
 
+    def test_retrieve_ad_conditional_get(self):
+        """
+        Тестирование условного GET (ETag / Last-Modified) для объявления.
+        """
+        ad = Ad.objects.create(title="moto", price=120000, author=self.user)
+        url = reverse("ads:ads-retrieve", kwargs={"pk": ad.pk})
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # 1 гипотеза - неизменённое объявление не передаётся повторно
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # 2 гипотеза - после изменения отдаётся новая версия с другим ETag
+        ad.price = 100000
+        ad.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["price"], 100000)
+
     def test_retrieve_nonexistent_ad(self):
         """
         Тестирование попытки просмотра несуществующего объявления
@@ -192,6 +492,140 @@ class AdTestCase(APITestCase):
         # Проверяем, что объявление больше не существует в базе данных
         self.assertFalse(Ad.objects.filter(id=ad.id).exists())
 
+    def test_bulk_update_ads(self):
+        """
+        Тестирование массового изменения объявлений по списку ids.
+        """
+        ad1 = Ad.objects.create(title="moto", price=100, author=self.user)
+        ad2 = Ad.objects.create(title="bike", price=200, author=self.user)
+        Ad.objects.create(title="car", price=300, author=self.user)
+        updated_at = ad1.updated_at
+
+        url = reverse("ads:ads-bulk-update")
+        data = {"ids": [ad1.pk, ad2.pk], "data": {"price": 150}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+
+        # 1 гипотеза - изменены только выбранные объявления
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"updated": 2})
+        self.assertEqual(
+            list(Ad.objects.order_by("pk").values_list("price", flat=True)),
+            [150, 150, 300],
+        )
+
+        # 2 гипотеза - updated_at обновлён (от него зависит ETag)
+        ad1.refresh_from_db()
+        self.assertGreater(ad1.updated_at, updated_at)
+
+        # 3 гипотеза - значения проверяются AdValidator
+        data = {"ids": [ad1.pk], "data": {"price": -1}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 4 гипотеза - поля вне bulk_update_fields изменять нельзя
+        data = {"ids": [ad1.pk], "data": {"author": 1}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 5 гипотеза - пустое значение фильтра не выбирает все объявления
+        data = {"data": {"price": 1}}
+        response = self.client.patch(
+            f"{url}?title=", data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ad.objects.filter(price=1).exists())
+
+    def test_bulk_update_ads_reindexes_titles(self):
+        """
+        Тестирование обновления поиска после массового изменения названий.
+        """
+        ad = Ad.objects.create(title="moto", price=100, author=self.user)
+        url = reverse("ads:ads-bulk-update")
+        data = {"ids": [ad.pk], "data": {"title": "scooter"}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("ads:ads-suggest"), {"q": "scoo"})
+        self.assertEqual(
+            response.json()["results"], [{"id": ad.pk, "title": "scooter"}]
+        )
+
+    def test_bulk_update_ads_of_other_author(self):
+        """
+        Тестирование запрета массового изменения чужих объявлений.
+        """
+        other_user = User.objects.create_user(
+            email="other@example.com", password="testpass", is_active=True
+        )
+        own = Ad.objects.create(title="moto", price=100, author=self.user)
+        foreign = Ad.objects.create(title="bike", price=200, author=other_user)
+
+        url = reverse("ads:ads-bulk-update")
+        data = {"ids": [own.pk, foreign.pk], "data": {"price": 1}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+
+        # 1 гипотеза - запрос отклонён целиком, ни одна строка не изменена
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            list(Ad.objects.order_by("pk").values_list("price", flat=True)),
+            [100, 200],
+        )
+
+        # 2 гипотеза - администратор может изменять любые объявления
+        admins, _ = Group.objects.get_or_create(name="admins")
+        self.user.groups.add(admins)
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"updated": 2})
+
+    def test_bulk_delete_ads(self):
+        """
+        Тестирование массового удаления объявлений по ids и по фильтру.
+        """
+        ads = [
+            Ad.objects.create(title=f"ad {i}", price=100 * i, author=self.user)
+            for i in range(1, 6)
+        ]
+        Review.objects.create(text="Отличный товар", author=self.user, ad=ads[0])
+        url = reverse("ads:ads-bulk-delete")
+
+        # 1 гипотеза - удаление по списку ids (вместе с отзывами)
+        data = {"ids": [ads[0].pk, ads[1].pk]}
+        response = self.client.delete(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(Ad.objects.count(), 3)
+        self.assertFalse(Review.objects.exists())
+
+        # 2 гипотеза - удаление по фильтру
+        response = self.client.delete(f"{url}?price_min=400")
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(list(Ad.objects.values_list("pk", flat=True)), [ads[2].pk])
+
+        # 3 гипотеза - без ids и фильтров запрос отклоняется
+        response = self.client.delete(f"{url}?ordering=price")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ad.objects.count(), 1)
+
+        # 4 гипотеза - пустое значение фильтра не считается фильтром
+        response = self.client.delete(f"{url}?title=")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ad.objects.count(), 1)
+
     def test_filter_ads_by_title(self):
         """
         Проверяет фильтрацию объявлений по названию.
@@ -270,93 +704,1384 @@ class AdTestCase(APITestCase):
         self.assertEqual(response_data["count"], 0)
         self.assertEqual(len(response_data["results"]), 0)
 
-    def test_create_ad_without_price(self):
+    def test_filter_ads_by_title_escapes_regex(self):
         """
-        Проверяет, что нельзя создать объявление без указания цены.
+        Проверяет, что спецсимволы регулярных выражений в названии ищутся буквально.
         """
-        data = {"title": "No Price Ad"}
+        Ad.objects.create(title="Ноутбук", price=150000, author=self.user)
+        Ad.objects.create(title="Кабель USB (2 м)", price=500, author=self.user)
 
-        url = reverse("ads:ads-create")
+        url = reverse("ads:ads-list")
 
-        response = self.client.post(
-            url, data=json.dumps(data), content_type="application/json"
+        response = self.client.get(url, {"title": ".*"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+
+        response = self.client.get(url, {"title": "(2 м)"})
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(response.json()["results"][0]["title"], "Кабель USB (2 м)")
+
+    def test_search_ads(self):
+        """
+        Проверяет полнотекстовый поиск по названию и описанию с ранжированием.
+        """
+        Ad.objects.create(
+            title="Чехол",
+            price=1000,
+            description="Подходит для ноутбука 15 дюймов",
+            author=self.user,
+        )
+        Ad.objects.create(
+            title="Ноутбук Lenovo",
+            price=50000,
+            description="Мощный ноутбук",
+            author=self.user,
         )
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
 
-        # Ожидаем ошибку валидации
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        #  Проверяем, что ошибка связана с полем "price"
+        url = reverse("ads:ads-list")
+        response = self.client.get(url, {"search": "ноутбук"})
+
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 2 гипотеза - совпадение в названии выше совпадения в описании
         response_data = response.json()
-        self.assertIn("price", response_data)
-        # Проверяем текст ошибки
-        self.assertEqual(response_data["price"], ["Указание цены обязательно."])
+        self.assertEqual(response_data["count"], 2)
+        self.assertEqual(response_data["results"][0]["title"], "Ноутбук Lenovo")
+        self.assertEqual(response_data["results"][1]["title"], "Чехол")
 
-    def test_create_ad_without_title(self):
+        # 3 гипотеза - все слова запроса должны присутствовать
+        response = self.client.get(url, {"search": "ноутбук велосипед"})
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_fuzzy_search_ads(self):
         """
-        Проверяет, что нельзя создать объявление без указания названия.
+        Проверяет нечёткий поиск по названию с опечаткой и сортировку по сходству.
         """
-        data = {"price": 1000}
+        Ad.objects.create(title="Ноутбук Apple", price=150000, author=self.user)
+        Ad.objects.create(title="Ноутбуки б/у", price=40000, author=self.user)
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
 
-        url = reverse("ads:ads-create")
+        url = reverse("ads:ads-list")
+        response = self.client.get(url, {"fuzzy": "нотбук"})
 
-        response = self.client.post(
-            url, data=json.dumps(data), content_type="application/json"
-        )
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        # Ожидаем ошибку валидации
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        # Проверяем, что ошибка связана с полем "title"
+        # 2 гипотеза - найдены оба ноутбука, ближайшее совпадение выше
         response_data = response.json()
-        self.assertIn("title", response_data)
-        self.assertEqual(response_data["title"], ["Название товара обязательно."])
+        self.assertEqual(response_data["count"], 2)
+        self.assertEqual(response_data["results"][0]["title"], "Ноутбук Apple")
+        self.assertEqual(response_data["results"][1]["title"], "Ноутбуки б/у")
 
-    def test_ad_repr(self):
+        # 3 гипотеза - порог сходства настраивается
+        with self.settings(ADS_TRIGRAM_SIMILARITY_THRESHOLD=0.5):
+            response = self.client.get(url, {"fuzzy": "нотбук"})
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_filter_ads_by_price_date_and_author(self):
         """
-        Проверяет строковое представление объекта Ad (__repr__).
+        Проверяет фильтры по диапазону цен, дате создания и автору.
         """
-        ad = Ad.objects.create(
-            title="Ноутбук Apple MacBook Pro",
-            price=150000,
-            description="Мощный ноутбук для работы",
+        other_user = User.objects.create_user(
+            email="other@example.com", password="testpass", is_active=True
+        )
+        now = timezone.now()
+        Ad.objects.create(
+            title="old",
+            price=100,
             author=self.user,
+            created_at=now - timedelta(days=10),
         )
+        Ad.objects.create(title="cheap", price=500, author=self.user, created_at=now)
+        Ad.objects.create(title="pricey", price=5000, author=other_user, created_at=now)
 
-        expected_repr = f"""Ad(
-title={ad.title},
-price={ad.price},
-description={ad.description},
-author={ad.author},
-created_at={ad.created_at},
-image={ad.image})"""
+        url = reverse("ads:ads-list")
 
-        self.assertEqual(repr(ad), expected_repr)
+        response_data = self.client.get(
+            url, {"price_min": 200, "price_max": 1000}
+        ).json()
+        self.assertEqual([ad["title"] for ad in response_data["results"]], ["cheap"])
 
-    def test_ad_str(self):
+        response_data = self.client.get(
+            url, {"created_after": (now - timedelta(days=1)).isoformat()}
+        ).json()
+        self.assertEqual(response_data["count"], 2)
+
+        response_data = self.client.get(
+            url, {"created_before": (now - timedelta(days=1)).isoformat()}
+        ).json()
+        self.assertEqual([ad["title"] for ad in response_data["results"]], ["old"])
+
+        response_data = self.client.get(url, {"author": other_user.id}).json()
+        self.assertEqual([ad["title"] for ad in response_data["results"]], ["pricey"])
+
+    def test_ordering_ads(self):
         """
-        Проверяет строковое представление объекта Ad (__str__).
+        Проверяет сортировку объявлений по цене и дате и отказ на неизвестную сортировку.
         """
-        ad = Ad.objects.create(
-            title="Ноутбук Apple MacBook Pro",
-            price=150000,
-            description="Мощный ноутбук для работы",
-            author=self.user,
+        Ad.objects.create(title="middle", price=500, author=self.user)
+        Ad.objects.create(title="expensive", price=5000, author=self.user)
+        Ad.objects.create(title="cheap", price=100, author=self.user)
+
+        url = reverse("ads:ads-list")
+
+        response_data = self.client.get(url, {"ordering": "price"}).json()
+        self.assertEqual(
+            [ad["title"] for ad in response_data["results"]],
+            ["cheap", "middle", "expensive"],
         )
 
-        self.assertEqual(str(ad), "Ноутбук Apple MacBook Pro")
+        response_data = self.client.get(url, {"ordering": "-price"}).json()
+        self.assertEqual(
+            [ad["title"] for ad in response_data["results"]],
+            ["expensive", "middle", "cheap"],
+        )
 
+        response_data = self.client.get(url, {"ordering": "newest"}).json()
+        self.assertEqual(response_data["results"][0]["title"], "cheap")
 
-class FillDbCommandTest(TestCase):
-    def test_fill_db_command(self):
+        response = self.client.get(url, {"ordering": "description"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_ads_cursor_pagination(self):
         """
-        Проверяет, что команда fill_db корректно создает тестовые данные.
+        Проверяет, что в режиме курсора ключ строится по выбранной сортировке.
         """
-        # Вызываем команду fill_db
-        call_command("fill_db")
+        prices = [300, 100, 500, 100, 200, 400]
+        ads = [
+            Ad.objects.create(title=f"ad {i}", price=price, author=self.user)
+            for i, price in enumerate(prices)
+        ]
+        expected = [ad.id for ad in sorted(ads, key=lambda ad: (ad.price, ad.id))]
+        url = reverse("ads:ads-list")
 
-        # Проверяем, что пользователи созданы
-        users = User.objects.all()
-        self.assertEqual(users.count(), 2)
+        # 1 гипотеза - ключ (price, id) по возрастанию на обеих страницах
+        first_page = self.client.get(
+            url, {"pagination": "cursor", "ordering": "price"}
+        ).json()
+        second_page = self.client.get(first_page["next"]).json()
+        self.assertEqual(
+            [ad["id"] for ad in first_page["results"] + second_page["results"]],
+            expected,
+        )
 
-        # Проверяем, что объявления созданы
+        # 2 гипотеза - previous возвращает первую страницу
+        previous_page = self.client.get(second_page["previous"]).json()
+        self.assertEqual(previous_page["results"], first_page["results"])
+
+        # 3 гипотеза - сортировка по убыванию цены
+        first_page = self.client.get(
+            url, {"pagination": "cursor", "ordering": "-price"}
+        ).json()
+        second_page = self.client.get(first_page["next"]).json()
+        self.assertEqual(
+            [ad["id"] for ad in first_page["results"] + second_page["results"]],
+            [ad.id for ad in sorted(ads, key=lambda ad: (-ad.price, -ad.id))],
+        )
+
+        # 4 гипотеза - курсор другой сортировки не принимается
+        cursor = parse_qs(urlparse(first_page["next"]).query)["cursor"][0]
+        response = self.client.get(url, {"cursor": cursor, "ordering": "price"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # 5 гипотеза - сортировка по релевантности в режиме курсора - 400
+        response = self.client.get(url, {"pagination": "cursor", "search": "ad"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.json())
+
+        # 6 гипотеза - поиск с явной сортировкой работает
+        response = self.client.get(
+            url, {"pagination": "cursor", "search": "ad", "ordering": "price"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_ads_price_facets(self):
+        """
+        Проверяет гистограмму цен по текущему набору фильтров одним запросом.
+        """
+        Ad.objects.create(title="Чехол для ноутбука", price=500, author=self.user)
+        Ad.objects.create(title="Ноутбук б/у", price=20000, author=self.user)
+        Ad.objects.create(title="Ноутбук новый", price=80000, author=self.user)
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+
+        url = reverse("ads:ads-list")
+        with self.settings(ADS_PRICE_FACET_BOUNDS=(0, 1000, 50000)):
+            response = self.client.get(url, {"title": "ноутбук", "facets": "price"})
+
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 2 гипотеза - корзины учитывают фильтр, последняя открыта сверху
+        self.assertEqual(
+            response.json()["facets"]["price"],
+            [
+                {"min": 0, "max": 1000, "count": 1},
+                {"min": 1000, "max": 50000, "count": 1},
+                {"min": 50000, "max": None, "count": 1},
+            ],
+        )
+
+        # 3 гипотеза - без параметра facets фасеты не считаются
+        self.assertNotIn("facets", self.client.get(url).json())
+
+    @override_settings(CACHE_ENABLED=True, ADS_PRICE_FACET_BOUNDS=(0, 1000))
+    def test_list_ads_empty_search_with_cache(self):
+        """
+        Проверяет заведомо пустой поиск при включённом кэше счётчиков и фасетов.
+        """
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+        url = reverse("ads:ads-list")
+
+        # 1 гипотеза - запрос из одних знаков препинания ничего не находит
+        response = self.client.get(url, {"search": "!!!"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+
+        # 2 гипотеза - гистограмма пустой выборки состоит из нулей
+        response = self.client.get(url, {"search": "!!!", "facets": "price"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["facets"]["price"],
+            [
+                {"min": 0, "max": 1000, "count": 0},
+                {"min": 1000, "max": None, "count": 0},
+            ],
+        )
+
+    def test_suggest_ad_titles(self):
+        """
+        Проверяет подсказки по префиксу слова названия: новые объявления выше.
+        """
+        now = timezone.now()
+        Ad.objects.create(
+            title="Ноутбук Apple",
+            price=150000,
+            author=self.user,
+            created_at=now - timedelta(days=1),
+        )
+        Ad.objects.create(
+            title="Игровой ноутбук", price=90000, author=self.user, created_at=now
+        )
+        bike = Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+
+        url = reverse("ads:ads-suggest")
+        response = self.client.get(url, {"q": "ноут"})
+
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 2 гипотеза - совпадение с любым словом, сначала новые
+        self.assertEqual(
+            [ad["title"] for ad in response.json()["results"]],
+            ["Игровой ноутбук", "Ноутбук Apple"],
+        )
+        response = self.client.get(url, {"q": "ноутбук ap", "limit": 1})
+        self.assertEqual(response.json()["results"][0]["title"], "Ноутбук Apple")
+
+        # 3 гипотеза - подсказки обновляются при изменении и удалении
+        bike.title = "Велосипед горный"
+        bike.save()
+        response = self.client.get(url, {"q": "велосипед г"})
+        self.assertEqual(
+            response.json()["results"], [{"id": bike.id, "title": "Велосипед горный"}]
+        )
+
+        bike.delete()
+        self.assertEqual(self.client.get(url, {"q": "вело"}).json()["results"], [])
+
+    def test_suggest_ad_titles_deduplicated(self):
+        """
+        Проверяет, что одинаковые названия возвращаются одной подсказкой.
+        """
+        now = timezone.now()
+        for days in range(3):
+            Ad.objects.create(
+                title="Ноутбук Apple",
+                price=1000,
+                author=self.user,
+                created_at=now - timedelta(days=days),
+            )
+        newest = Ad.objects.get(created_at=now)
+        asus = Ad.objects.create(title="Ноутбук Asus", price=1000, author=self.user)
+
+        response = self.client.get(reverse("ads:ads-suggest"), {"q": "н"})
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": asus.id, "title": "Ноутбук Asus"},
+                {"id": newest.id, "title": "Ноутбук Apple"},
+            ],
+        )
+
+    def test_create_ad_without_price(self):
+        """
+        Проверяет, что нельзя создать объявление без указания цены.
+        """
+        data = {"title": "No Price Ad"}
+
+        url = reverse("ads:ads-create")
+
+        response = self.client.post(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+
+        # Ожидаем ошибку валидации
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        #  Проверяем, что ошибка связана с полем "price"
+        response_data = response.json()
+        self.assertIn("price", response_data)
+        # Проверяем текст ошибки
+        self.assertEqual(response_data["price"], ["Указание цены обязательно."])
+
+    def test_create_ad_without_title(self):
+        """
+        Проверяет, что нельзя создать объявление без указания названия.
+        """
+        data = {"price": 1000}
+
+        url = reverse("ads:ads-create")
+
+        response = self.client.post(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+
+        # Ожидаем ошибку валидации
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Проверяем, что ошибка связана с полем "title"
+        response_data = response.json()
+        self.assertIn("title", response_data)
+        self.assertEqual(response_data["title"], ["Название товара обязательно."])
+
+    def test_ad_repr(self):
+        """
+        Проверяет строковое представление объекта Ad (__repr__).
+        """
+        ad = Ad.objects.create(
+            title="Ноутбук Apple MacBook Pro",
+            price=150000,
+            description="Мощный ноутбук для работы",
+            author=self.user,
+        )
+
+        expected_repr = f"""Ad(
+title={ad.title},
+price={ad.price},
+description={ad.description},
+author={ad.author},
+created_at={ad.created_at},
+image={ad.image})"""
+
+        self.assertEqual(repr(ad), expected_repr)
+
+    def test_ad_str(self):
+        """
+        Проверяет строковое представление объекта Ad (__str__).
+        """
+        ad = Ad.objects.create(
+            title="Ноутбук Apple MacBook Pro",
+            price=150000,
+            description="Мощный ноутбук для работы",
+            author=self.user,
+        )
+
+        self.assertEqual(str(ad), "Ноутбук Apple MacBook Pro")
+
+
+def make_image(name="photo.png", size=(800, 600), image_format="PNG"):
+    """
+    Создаёт загружаемый файл с настоящим изображением заданного размера.
+    """
+    buffer = io.BytesIO()
+    mode = "RGB" if image_format == "JPEG" else "RGBA"
+    Image.new(mode, size, (200, 50, 50, 128)[: len(mode)]).save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ImageVariantsTest(APITestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_GC_GRACE_PERIOD=timedelta(0)
+        )
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_variants_generated_after_upload(self):
+        """
+        Тестирование генерации вариантов изображения после загрузки.
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            ad = Ad.objects.create(
+                title="moto", price=100, author=self.user, image=make_image()
+            )
+        url = reverse("ads:ads-retrieve", kwargs={"pk": ad.pk})
+
+        # 1 гипотеза - до выполнения задачи варианты ещё не готовы
+        response = self.client.get(url)
+        self.assertEqual(response.json()["imageStatus"], "pending")
+        self.assertEqual(response.json()["imageVariants"], {})
+        self.assertEqual(len(callbacks), 1)
+
+        # 2 гипотеза - после выполнения задачи варианты готовы
+        callbacks[0]()
+        response = self.client.get(url)
+        variants = response.json()["imageVariants"]
+        self.assertEqual(response.json()["imageStatus"], "ready")
+        self.assertEqual(
+            {label: (v["width"], v["height"]) for label, v in variants.items()},
+            {"thumb": (200, 150), "card": (400, 300), "large": (800, 600)},
+        )
+        self.assertTrue(variants["thumb"]["webp"].endswith(".webp"))
+        self.assertTrue(variants["thumb"]["jpeg"].startswith("http://testserver/"))
+
+        # 3 гипотеза - файлы вариантов лежат в хранилище в нужных форматах
+        ad.refresh_from_db()
+        thumb = ad.image_variants["variants"]["thumb"]
+        with Image.open(os.path.join(self.media_root, thumb["webp"])) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (200, 150)))
+        with Image.open(os.path.join(self.media_root, thumb["jpeg"])) as image:
+            self.assertEqual((image.format, image.mode), ("JPEG", "RGB"))
+
+    def test_variants_replaced_with_image(self):
+        """
+        Тестирование замены вариантов при замене изображения.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = Ad.objects.create(
+                title="moto", price=100, author=self.user, image=make_image()
+            )
+        ad.refresh_from_db()
+        old_thumb = ad.image_variants["variants"]["thumb"]["webp"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ad.image = make_image("new.png", size=(300, 100))
+            ad.save()
+        ad.refresh_from_db()
+
+        # 1 гипотеза - варианты построены по новому изображению
+        self.assertEqual(ad.image_variants["source"], ad.image.name)
+        self.assertEqual(ad.image_variants["variants"]["large"]["width"], 300)
+
+        # 2 гипотеза - файлы старых вариантов удалены
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, old_thumb)))
+
+        # 3 гипотеза - сохранение без замены изображения не ставит задачу
+        with self.captureOnCommitCallbacks() as callbacks:
+            ad.title = "bike"
+            ad.save()
+        self.assertEqual(callbacks, [])
+
+    def test_broken_image_marked_failed(self):
+        """
+        Тестирование состояния failed для файла, который не является изображением.
+        """
+        broken = SimpleUploadedFile("broken.jpg", b"not an image")
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = Ad.objects.create(
+                title="moto", price=100, author=self.user, image=broken
+            )
+        ad.refresh_from_db()
+        self.assertEqual(ad.image_status, "failed")
+        self.assertEqual(ad.image_variants, {"source": ad.image.name})
+
+    def test_exif_stripped_from_original(self):
+        """
+        Тестирование удаления EXIF из исходного изображения с учётом поворота.
+        """
+        exif = Image.Exif()
+        exif[0x010F] = "Camera"  # Make
+        exif[0x0112] = 6  # Orientation: поворот на 90 градусов
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 20), "red").save(buffer, "JPEG", exif=exif)
+        upload = SimpleUploadedFile("photo.jpg", buffer.getvalue())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = Ad.objects.create(
+                title="moto", price=100, author=self.user, image=upload
+            )
+        ad.refresh_from_db()
+        content_hash = hashlib.sha256(buffer.getvalue()).hexdigest()
+        original = os.path.join(
+            self.media_root,
+            "ads/images",
+            content_hash[:2],
+            content_hash[2:4],
+            f"{content_hash}.jpg",
+        )
+
+        # 1 гипотеза - EXIF удалён, поворот применён к пикселям
+        with ad.image.open("rb"), Image.open(ad.image) as image:
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertEqual(image.size, (20, 40))
+
+        # 2 гипотеза - очищенный файл заменил исходный, варианты построены по нему
+        self.assertEqual(ad.image_variants["source"], ad.image.name)
+        self.assertEqual(ad.image_status, "ready")
+        self.assertNotEqual(ad.image.path, original)
+        self.assertFalse(os.path.exists(original))
+
+        # 3 гипотеза - очищенный файл лежит в том же каталоге upload_to
+        content_hash = os.path.splitext(os.path.basename(ad.image.name))[0]
+        self.assertEqual(
+            ad.image.name,
+            f"ads/images/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.jpg",
+        )
+
+    @override_settings(IMAGE_MAX_PIXELS=10_000)
+    def test_too_many_pixels_marked_failed(self):
+        """
+        Тестирование отказа в обработке изображения слишком большого разрешения.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = Ad.objects.create(
+                title="moto", price=100, author=self.user, image=make_image()
+            )
+        ad.refresh_from_db()
+        self.assertEqual(ad.image_status, "failed")
+
+    def test_backfill_command(self):
+        """
+        Тестирование команды generate_image_variants для существующих файлов.
+        """
+        # Без выполнения on_commit задачи не запускаются - как у старых записей
+        ad = Ad.objects.create(
+            title="moto", price=100, author=self.user, image=make_image()
+        )
+        self.user.image = make_image("avatar.png", size=(100, 100))
+        self.user.save()
+        Ad.objects.create(title="bike", price=100, author=self.user)
+
+        out = io.StringIO()
+        call_command("generate_image_variants", workers=1, stdout=out)
+
+        # 1 гипотеза - обработаны только объекты с изображениями
+        self.assertIn("ads: обработано изображений - 1", out.getvalue())
+        self.assertIn("users: обработано изображений - 1", out.getvalue())
+        ad.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(ad.image_status, "ready")
+        self.assertEqual(self.user.image_status, "ready")
+        self.assertEqual(self.user.image_variants["variants"]["thumb"]["width"], 100)
+
+        # 2 гипотеза - готовые варианты без --force не пересоздаются
+        out = io.StringIO()
+        call_command("generate_image_variants", model=["ads"], workers=1, stdout=out)
+        self.assertEqual(out.getvalue().strip(), "ads: обработано изображений - 0")
+
+
+class ContentAddressedStorageTest(APITestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_GC_GRACE_PERIOD=timedelta(0)
+        )
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def media_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _, names in os.walk(self.media_root)
+            for name in names
+        )
+
+    def test_identical_uploads_share_file(self):
+        """
+        Тестирование хранения одинаковых загрузок одним файлом.
+        """
+        ad1 = Ad.objects.create(
+            title="moto", price=100, author=self.user, image=make_image("a.png")
+        )
+        ad2 = Ad.objects.create(
+            title="bike", price=100, author=self.user, image=make_image("b.png")
+        )
+        self.user.image = make_image("avatar.png")
+        self.user.save()
+
+        # 1 гипотеза - имя файла - хэш содержимого, копия не создаётся
+        content_hash = hashlib.sha256(make_image().read()).hexdigest()
+        expected = (
+            f"ads/images/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.png"
+        )
+        self.assertEqual(ad1.image.name, expected)
+        self.assertEqual(ad2.image.name, expected)
+        self.assertEqual(
+            self.media_files(),
+            [expected, expected.replace("ads/images", "users/avatars")],
+        )
+
+        # 2 гипотеза - файл удаляется только вместе с последней ссылкой
+        with self.captureOnCommitCallbacks(execute=True):
+            ad1.delete()
+        self.assertIn(expected, self.media_files())
+        with self.captureOnCommitCallbacks(execute=True):
+            ad2.delete()
+        self.assertNotIn(expected, self.media_files())
+
+    def test_recent_file_not_released(self):
+        """
+        Тестирование защиты недавно загруженных файлов от удаления.
+        """
+        ad = Ad.objects.create(
+            title="moto", price=100, author=self.user, image=make_image()
+        )
+        with override_settings(MEDIA_GC_GRACE_PERIOD=timedelta(hours=1)):
+            with self.captureOnCommitCallbacks(execute=True):
+                ad.delete()
+        self.assertEqual(len(self.media_files()), 1)
+
+    def test_collect_media_garbage_command(self):
+        """
+        Тестирование команды collect_media_garbage.
+        """
+        ad = Ad.objects.create(
+            title="moto", price=100, author=self.user, image=make_image()
+        )
+        # Файл без ссылок - например, после удаления через QuerySet.update()
+        orphan = Ad.objects.create(
+            title="bike", price=100, author=self.user, image=make_image(size=(5, 5))
+        )
+        orphan_name = orphan.image.name
+        Ad.objects.filter(pk=orphan.pk).update(image=None)
+
+        # 1 гипотеза - в режиме --dry-run ничего не удаляется
+        out = io.StringIO()
+        call_command("collect_media_garbage", dry_run=True, stdout=out)
+        self.assertIn(orphan_name, out.getvalue())
+        self.assertIn(orphan_name, self.media_files())
+
+        # 2 гипотеза - удаляются только файлы без ссылок
+        out = io.StringIO()
+        call_command("collect_media_garbage", stdout=out)
+        self.assertIn("Удалено файлов: 1", out.getvalue())
+        self.assertEqual(self.media_files(), [ad.image.name])
+
+
+@override_settings(UPLOAD_CHUNK_MAX_SIZE=1024)
+class UploadSessionTest(APITestCase):
+    def setUp(self) -> None:
+        self.upload_root = tempfile.mkdtemp()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            UPLOAD_SESSION_ROOT=self.upload_root, MEDIA_ROOT=self.media_root
+        )
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.ad = Ad.objects.create(title="moto", price=100, author=self.user)
+        # Шум не сжимается - файл получается больше одной части
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (60, 40), os.urandom(60 * 40 * 3)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.upload_root, ignore_errors=True)
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def open_session(self, filename="photo.png", size=None):
+        data = {"filename": filename, "size": size or len(self.content)}
+        return self.client.post(
+            reverse("ads:ads-upload-create"),
+            data=json.dumps(data),
+            content_type="application/json",
+        )
+
+    def send_chunk(self, session_id, offset, chunk):
+        return self.client.put(
+            reverse("ads:ads-upload", kwargs={"pk": session_id}),
+            data=chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunked_upload(self):
+        """
+        Тестирование загрузки изображения частями и прикрепления к объявлению.
+        """
+        response = self.open_session()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        session_id = response.json()["id"]
+        self.assertEqual(response.json()["offset"], 0)
+
+        # 1 гипотеза - части дописываются по смещению
+        offset = 0
+        while offset < len(self.content):
+            chunk = self.content[offset:][:1000]
+            response = self.send_chunk(session_id, offset, chunk)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            offset = response.json()["offset"]
+        self.assertEqual(offset, len(self.content))
+
+        # 2 гипотеза - файл прикрепляется к объявлению, сессия удаляется
+        response = self.client.post(
+            reverse("ads:ads-upload-complete", kwargs={"pk": session_id}),
+            data=json.dumps({"ad": self.ad.pk}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Имя файла в хранилище - хэш содержимого
+        content_hash = hashlib.sha256(self.content).hexdigest()
+        self.assertTrue(response.json()["image"].endswith(f"/{content_hash}.png"))
+        self.ad.refresh_from_db()
+        with self.ad.image.open("rb") as image:
+            self.assertEqual(image.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.upload_root), [])
+
+    def test_resume_upload(self):
+        """
+        Тестирование продолжения прерванной загрузки.
+        """
+        session_id = self.open_session().json()["id"]
+        self.send_chunk(session_id, 0, self.content[:500])
+        url = reverse("ads:ads-upload", kwargs={"pk": session_id})
+
+        # 1 гипотеза - клиент узнаёт, с какого места продолжать
+        response = self.client.get(url)
+        self.assertEqual(response.json()["offset"], 500)
+
+        # 2 гипотеза - часть с неверным смещением отклоняется
+        response = self.send_chunk(session_id, 0, self.content[:500])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json()["offset"], 500)
+
+        # 3 гипотеза - часть больше UPLOAD_CHUNK_MAX_SIZE отклоняется
+        response = self.send_chunk(session_id, 500, self.content[500:2000])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 4 гипотеза - незавершённую загрузку нельзя прикрепить
+        response = self.client.post(
+            reverse("ads:ads-upload-complete", kwargs={"pk": session_id}),
+            data=json.dumps({"ad": self.ad.pk}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upload_validation(self):
+        """
+        Тестирование проверки файла и прав при загрузке по частям.
+        """
+        # 1 гипотеза - расширение и размер проверяются при открытии сессии
+        response = self.open_session(filename="photo.gif")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.open_session(size=5 * 1024 * 1024 + 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 2 гипотеза - файл, не являющийся изображением, не прикрепляется
+        session_id = self.open_session(size=10).json()["id"]
+        self.send_chunk(session_id, 0, b"not image!")
+        complete_url = reverse("ads:ads-upload-complete", kwargs={"pk": session_id})
+        data = json.dumps({"ad": self.ad.pk})
+        response = self.client.post(
+            complete_url, data=data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 3 гипотеза - чужую сессию нельзя продолжить, к чужому объявлению
+        # нельзя прикрепить файл
+        other_user = User.objects.create_user(
+            email="other@example.com", password="testpass", is_active=True
+        )
+        other_ad = Ad.objects.create(title="bike", price=100, author=other_user)
+        session_id = self.open_session().json()["id"]
+        for offset in range(0, len(self.content), 1000):
+            self.send_chunk(session_id, offset, self.content[offset:][:1000])
+        response = self.client.post(
+            reverse("ads:ads-upload-complete", kwargs={"pk": session_id}),
+            data=json.dumps({"ad": other_ad.pk}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=other_user)
+        response = self.client.get(reverse("ads:ads-upload", kwargs={"pk": session_id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_clear_expired_upload_sessions(self):
+        """
+        Тестирование удаления истёкших сессий загрузки.
+        """
+        expired_id = self.open_session().json()["id"]
+        UploadSession.objects.filter(pk=expired_id).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        active_id = self.open_session().json()["id"]
+
+        response = self.client.get(reverse("ads:ads-upload", kwargs={"pk": expired_id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        clear_expired_upload_sessions()
+        self.assertEqual(
+            list(UploadSession.objects.values_list("pk", flat=True)),
+            [uuid.UUID(active_id)],
+        )
+        self.assertEqual(os.listdir(self.upload_root), [f"{active_id}.part"])
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "media": {
+            "BACKEND": "config.s3.S3ContentAddressedStorage",
+            "OPTIONS": {"bucket_name": "media-test", "region_name": "us-east-1"},
+        },
+    }
+)
+class DirectUploadTest(APITestCase):
+    def setUp(self) -> None:
+        # S3 заменяется moto: запросы boto3 и requests к AWS не уходят в сеть
+        self.aws = mock_aws()
+        self.aws.start()
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="media-test")
+        self.storage = storages["media"]
+        # Хранилище поля выбирается при загрузке модели, поэтому подменяем его
+        self.storage_patch = patch.object(
+            Ad._meta.get_field("image"), "storage", self.storage
+        )
+        self.storage_patch.start()
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.ad = Ad.objects.create(title="moto", price=100, author=self.user)
+        self.content = make_image(size=(60, 40)).read()
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self) -> None:
+        self.storage_patch.stop()
+        self.aws.stop()
+
+    def request_upload(self, ad=None, **data):
+        data = {
+            "filename": "photo.png",
+            "size": len(self.content),
+            "contentHash": self.sha256,
+            **data,
+        }
+        return self.client.post(
+            reverse("ads:ads-direct-upload", kwargs={"pk": (ad or self.ad).pk}),
+            data=json.dumps(data),
+            content_type="application/json",
+        )
+
+    def confirm(self, token, ad=None):
+        return self.client.post(
+            reverse("ads:ads-direct-upload-confirm", kwargs={"pk": (ad or self.ad).pk}),
+            data=json.dumps({"token": token}),
+            content_type="application/json",
+        )
+
+    def test_direct_upload(self):
+        """
+        Тестирование загрузки изображения напрямую в хранилище.
+        """
+        # 1 гипотеза - выдаётся подписанный запрос PUT с контрольной суммой
+        response = self.request_upload()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        upload = response.json()
+        self.assertEqual(upload["method"], "PUT")
+        self.assertIn("X-Amz-Signature=", upload["url"])
+        self.assertIn("x-amz-checksum-sha256", upload["headers"])
+        # размер файла входит в подпись
+        self.assertEqual(upload["headers"]["Content-Length"], str(len(self.content)))
+        signed_headers = parse_qs(urlparse(upload["url"]).query)["X-Amz-SignedHeaders"]
+        self.assertIn("content-length", signed_headers[0].split(";"))
+
+        # 2 гипотеза - файл загружается в хранилище под хэшем содержимого
+        put = requests.put(upload["url"], data=self.content, headers=upload["headers"])
+        self.assertEqual(put.status_code, 200)
+        name = f"ads/images/{self.sha256[:2]}/{self.sha256[2:4]}/{self.sha256}.png"
+        self.assertTrue(self.storage.exists(name))
+
+        # 3 гипотеза - после подтверждения файл прикреплён к объявлению,
+        # а варианты создаются в том же хранилище
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.confirm(upload["token"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.ad.refresh_from_db()
+        self.assertEqual(self.ad.image.name, name)
+        self.assertEqual(self.ad.image_status, "ready")
+        self.assertTrue(
+            self.storage.exists(self.ad.image_variants["variants"]["thumb"]["webp"])
+        )
+        self.assertTrue(
+            response.json()["image"].startswith("https://media-test.s3.amazonaws.com/")
+        )
+
+    def test_direct_upload_rejected(self):
+        """
+        Тестирование отказа в прямой загрузке и подтверждении.
+        """
+        # 1 гипотеза - недопустимый формат и размер файла отклоняются
+        response = self.request_upload(filename="photo.gif")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.request_upload(size=AdValidator.MAX_IMAGE_SIZE + 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 2 гипотеза - нельзя подтвердить незагруженный файл
+        token = self.request_upload().json()["token"]
+        response = self.confirm(token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Файл не загружен в хранилище.", response.json())
+
+        # 3 гипотеза - токен действует только для своего объявления
+        other_ad = Ad.objects.create(title="auto", price=100, author=self.user)
+        response = self.confirm(token, ad=other_ad)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Недействительный токен загрузки.", response.json())
+
+        # 4 гипотеза - загрузить изображение в чужое объявление нельзя
+        stranger = User.objects.create_user(
+            email="stranger@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=stranger)
+        response = self.request_upload()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_direct_upload_size_mismatch(self):
+        """
+        Тестирование отклонения файла, размер которого больше заявленного.
+        """
+        upload = self.request_upload(size=100).json()
+        # Загрузка в обход подписи (хранилище не сверило Content-Length)
+        name = f"ads/images/{self.sha256[:2]}/{self.sha256[2:4]}/{self.sha256}.png"
+        self.storage.bucket.put_object(
+            Key=self.storage._normalize_name(name), Body=self.content
+        )
+
+        response = self.confirm(upload["token"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Размер файла не совпадает с заявленным.", response.json())
+        self.ad.refresh_from_db()
+        self.assertFalse(self.ad.image)
+
+    def test_direct_upload_invalid_content(self):
+        """
+        Тестирование отклонения загруженного файла, не являющегося изображением.
+        """
+        content = b"not an image"
+        sha256 = hashlib.sha256(content).hexdigest()
+        upload = self.request_upload(size=len(content), contentHash=sha256).json()
+        requests.put(upload["url"], data=content, headers=upload["headers"])
+
+        response = self.confirm(upload["token"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.ad.refresh_from_db()
+        self.assertFalse(self.ad.image)
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "media": {"BACKEND": "config.storage.ContentAddressedStorage"},
+        }
+    )
+    def test_direct_upload_not_configured(self):
+        """
+        Тестирование отказа, если хранилище не поддерживает прямую загрузку.
+        """
+        with patch.object(Ad._meta.get_field("image"), "storage", storages["media"]):
+            response = self.request_upload()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Прямая загрузка в хранилище не настроена.", response.json())
+
+
+class AdListValuesParityTest(APITestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            Ad.objects.create(
+                title="moto", price=100, author=self.user, image=make_image()
+            )
+        Ad.objects.create(title="auto", price=2000, author=self.user)
+        Ad.objects.create(
+            title="bike", price=300, description="Почти новый", author=self.user
+        )
+        Ad.objects.create(title="boat", price=5000, description="", author=self.user)
+        Ad.objects.create(title="ski", price=50, author=self.user)
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def assertParity(self, response, queryset):
+        """
+        Сравнивает байты ответа быстрого пути с рендерингом AdSerializer.
+        """
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = AdSerializer(
+            queryset, many=True, context={"request": response.wsgi_request}
+        ).data
+        renderer = CamelCaseJSONRenderer()
+        self.assertEqual(
+            renderer.render(response.data["results"]), renderer.render(expected)
+        )
+
+    def test_list_parity(self):
+        """
+        Проверяет, что список через .values() совпадает с выводом AdSerializer.
+        """
+        url = reverse("ads:ads-list")
+        ordered = Ad.objects.order_by("-created_at", "-id")
+
+        # 1 гипотеза - постраничная пагинация
+        self.assertParity(self.client.get(url), ordered[:4])
+        response = self.client.get(url, {"page": 2})
+        self.assertParity(response, ordered[4:])
+        self.assertIn("thumb", response.data["results"][0]["image_variants"])
+
+        # 2 гипотеза - пагинация по курсору
+        response = self.client.get(url, {"pagination": "cursor"})
+        self.assertParity(response, ordered[:4])
+        self.assertParity(self.client.get(response.data["next"]), ordered[4:])
+
+        # 3 гипотеза - с фильтрами
+        self.assertParity(
+            self.client.get(url, {"price_min": 200}), ordered.filter(price__gte=200)
+        )
+
+    def test_values_serializer_rejects_computed_fields(self):
+        """
+        Проверяет, что поле, не соответствующее колонке, не попадёт в быстрый путь.
+        """
+
+        class ComputedSerializer(AdSerializer):
+            author_email = serializers.CharField(source="author.email")
+
+            class Meta(AdSerializer.Meta):
+                fields = AdSerializer.Meta.fields + ("author_email",)
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(ComputedSerializer)
+
+
+class SparseFieldsetTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(5):
+            Ad.objects.create(
+                title=f"moto {index}",
+                price=100 + index,
+                description="Длинное описание",
+                author=self.user,
+            )
+
+    def test_fields_narrow_output_and_columns(self):
+        """
+        Проверяет, что ?fields= сужает и ответ, и список колонок в SQL.
+        """
+        url = reverse("ads:ads-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "id,title,price"})
+
+        # 1 гипотеза - в ответе только запрошенные поля
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for item in response.json()["results"]:
+            self.assertEqual(set(item), {"id", "title", "price"})
+
+        # 2 гипотеза - описание и изображение не читаются из базы данных
+        select = [q["sql"] for q in queries if '"ads_ad"."title"' in q["sql"]]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn("description", select[0])
+        self.assertNotIn("image", select[0])
+
+    def test_fields_with_cursor_pagination(self):
+        """
+        Проверяет ?fields= в режиме курсора и имена полей в camelCase.
+        """
+        url = reverse("ads:ads-list")
+        response = self.client.get(
+            url, {"fields": "title,imageStatus", "pagination": "cursor"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()["results"][0]), {"title", "imageStatus"})
+
+        # Курсор строится по created_at и id, которых нет в ответе
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_unknown_fields(self):
+        """
+        Проверяет отказ при запросе неизвестных полей.
+        """
+        response = self.client.get(reverse("ads:ads-list"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"fields": "Неизвестные поля: secret."})
+
+
+class ExpandAuthorTest(APITestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass",
+            is_active=True,
+            first_name="Иван",
+            tg_nick="ivan",
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.image = make_image("avatar.png")
+            self.user.save()
+        Ad.objects.create(title="moto", price=100, author=self.user)
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_expand_author(self):
+        """
+        Проверяет ?expand=author: автор объектом и совпадение с AdSerializer.
+        """
+        url = reverse("ads:ads-list")
+        response = self.client.get(url, {"expand": "author"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 1 гипотеза - автор возвращается кратким объектом с миниатюрой аватара
+        author = response.json()["results"][0]["author"]
+        self.assertEqual(
+            set(author), {"id", "firstName", "lastName", "tgNick", "avatar"}
+        )
+        self.assertEqual(author["tgNick"], "ivan")
+        self.assertIn("/variants/", author["avatar"])
+        self.assertIn("signature=", author["avatar"])
+
+        # 2 гипотеза - быстрый путь совпадает с сериализатором DRF
+        expected = AdSerializer(
+            Ad.objects.select_related("author").order_by("-created_at", "-id"),
+            many=True,
+            expand=["author"],
+            context={"request": response.wsgi_request},
+        ).data
+        renderer = CamelCaseJSONRenderer()
+        self.assertEqual(
+            renderer.render(response.data["results"]), renderer.render(expected)
+        )
+
+        # 3 гипотеза - без параметра автор остаётся id
+        response = self.client.get(url)
+        self.assertEqual(response.json()["results"][0]["author"], self.user.pk)
+
+    @override_settings(CACHE_ENABLED=True)
+    def test_expand_author_cache(self):
+        """
+        Проверяет сброс кэша списка с ?expand=author при изменении автора.
+        """
+        url = reverse("ads:ads-list")
+        response = self.client.get(url, {"expand": "author"})
+        self.assertEqual(response.json()["results"][0]["author"]["tgNick"], "ivan")
+
+        # 1 гипотеза - изменение пользователя сбрасывает страницы с автором
+        self.user.tg_nick = "petr"
+        self.user.save()
+        response = self.client.get(url, {"expand": "author"})
+        self.assertEqual(response.json()["results"][0]["author"]["tgNick"], "petr")
+
+    def test_expand_author_constant_queries(self):
+        """
+        Проверяет, что число запросов не зависит от количества авторов на странице.
+        """
+        url = reverse("ads:ads-list")
+        # Количество + страница с JOIN пользователей
+        with self.assertNumQueries(2):
+            self.client.get(url, {"expand": "author"})
+
+        for index in range(3):
+            author = User.objects.create_user(
+                email=f"author{index}@example.com", password="testpass"
+            )
+            Ad.objects.create(title=f"ad {index}", price=100, author=author)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"expand": "author"})
+        self.assertEqual(
+            len({ad["author"]["id"] for ad in response.json()["results"]}), 4
+        )
+
+        with self.assertNumQueries(1):
+            self.client.get(url, {"expand": "author", "pagination": "cursor"})
+
+    def test_expand_unknown_field(self):
+        """
+        Проверяет отказ при раскрытии неподдерживаемого поля.
+        """
+        response = self.client.get(reverse("ads:ads-list"), {"expand": "reviews"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"expand": "Нельзя раскрыть поля: reviews."})
+
+
+class CamelCaseJSONTest(TestCase):
+    def test_renderer_matches_library(self):
+        """
+        Проверяет, что рендерер на orjson выдаёт те же байты, что и библиотечный.
+        """
+        data = {
+            "id": 1,
+            "image_variants": {"thumb": {"width": 200, "webp": "/media/a.webp"}},
+            "count_is_approximate": False,
+            "sha_256": "x",
+            "_private": None,
+            "results": [
+                {"created_at": "2024-01-01T00:00:00Z", "description": None},
+                ("tuple_value", 2),
+            ],
+            "text": 'Привет \u2028 \u2029 "кавычки" \\ \n\t\x01 / <tag>',
+            "price": 1.5,
+            1: "int key",
+            "when": datetime(2024, 1, 2, 3, 4, 5, 6789, tzinfo=dt_timezone.utc),
+            "uuid": uuid.UUID(int=1),
+            "decimal": Decimal("10.25"),
+            "lazy": gettext_lazy("lazy_value"),
+        }
+        for value in (
+            data,
+            [data, data],
+            {"detail": "Не найдено."},
+            {"big": 2**70},
+            [],
+        ):
+            self.assertEqual(
+                CamelCaseJSONRenderer().render(value),
+                LibraryCamelCaseJSONRenderer().render(value),
+            )
+        self.assertEqual(CamelCaseJSONRenderer().render(None), b"")
+
+    def test_parser_matches_library(self):
+        """
+        Проверяет, что парсер на orjson возвращает те же данные, что и библиотечный.
+        """
+        content = json.dumps(
+            {
+                "contentHash": "abc",
+                "sha256": "x",
+                "imageURL": "y",
+                "HTTPResponse": 1,
+                "v2Api": [{"nestedKey": {"deepKey": None}}, 1, "camelValue"],
+                "ids": [1, 2, 3],
+                "text": "Привет",
+            }
+        ).encode()
+        self.assertEqual(
+            CamelCaseJSONParser().parse(io.BytesIO(content)),
+            LibraryCamelCaseJSONParser().parse(io.BytesIO(content)),
+        )
+
+        # 2 гипотеза - ошибка разбора возвращается как ParseError
+        with self.assertRaises(ParseError):
+            CamelCaseJSONParser().parse(io.BytesIO(b"{bad json"))
+
+
+@override_settings(ADS_SEARCH_BACKEND="ads.search_index.InvertedIndexSearchBackend")
+class InvertedIndexSearchBackendTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.url = reverse("ads:ads-list")
+        # Движок живёт дольше теста: индекс прошлого теста мог сохранить id,
+        # которые SQLite выдаст снова после отката транзакции
+        get_search_backend().build()
+
+    def search_titles(self, query):
+        response = self.client.get(self.url, {"search": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [ad["title"] for ad in response.json()["results"]]
+
+    def test_search_ranking(self):
+        """
+        Проверяет поиск по индексу: совпадение в названии выше, чем в описании.
+        """
+        Ad.objects.create(
+            title="Чехол",
+            price=1000,
+            description="Подходит для ноутбука 15 дюймов",
+            author=self.user,
+        )
+        Ad.objects.create(title="Ноутбук Lenovo", price=50000, author=self.user)
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+
+        self.assertEqual(self.search_titles("ноутбук"), ["Ноутбук Lenovo", "Чехол"])
+        self.assertEqual(self.search_titles("ноутбук lenovo"), ["Ноутбук Lenovo"])
+        self.assertEqual(self.search_titles("ноутбук велосипед"), [])
+
+    def test_incremental_updates(self):
+        """
+        Проверяет, что индекс обновляется при создании, изменении и удалении.
+        """
+        ad = Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+        self.assertEqual(self.search_titles("велосипед"), ["Велосипед"])
+
+        Ad.objects.create(title="Велосипед детский", price=5000, author=self.user)
+        self.assertEqual(len(self.search_titles("велосипед")), 2)
+
+        ad.title = "Самокат"
+        ad.save()
+        self.assertEqual(self.search_titles("велосипед"), ["Велосипед детский"])
+        self.assertEqual(self.search_titles("самокат"), ["Самокат"])
+
+        ad.delete()
+        self.assertEqual(self.search_titles("самокат"), [])
+
+    def test_rebuild_picks_up_changes_from_other_processes(self):
+        """
+        Проверяет, что индекс перестраивается раз в rebuild_interval секунд.
+        """
+        Ad.objects.create(title="Велосипед", price=25000, author=self.user)
+        self.assertEqual(self.search_titles("велосипед"), ["Велосипед"])
+
+        # bulk_create не отправляет сигналы - как изменение в другом процессе
+        Ad.objects.bulk_create(
+            [Ad(title="Велосипед детский", price=5000, author=self.user)]
+        )
+        self.assertEqual(self.search_titles("велосипед"), ["Велосипед"])
+
+        # 1 гипотеза - после истечения интервала индекс читается из БД заново
+        with self.settings(ADS_SEARCH_INDEX_REBUILD_INTERVAL=0):
+            self.assertEqual(len(self.search_titles("велосипед")), 2)
+
+
+class FillDbCommandTest(TestCase):
+    def test_fill_db_command(self):
+        """
+        Проверяет, что команда fill_db корректно создает тестовые данные.
+        """
+        # Вызываем команду fill_db
+        call_command("fill_db")
+
+        # Проверяем, что пользователи созданы
+        users = User.objects.all()
+        self.assertEqual(users.count(), 2)
+
+        # Проверяем, что объявления созданы
         ads = Ad.objects.all()
         self.assertEqual(ads.count(), 3)
 
@@ -541,9 +2266,7 @@ class AdValidatorTest(TestCase):
         """
         Проверяет, что корректное изображение не вызывает ошибок.
         """
-        valid_image = SimpleUploadedFile(
-            "test.jpg", b"file_content", content_type="image/jpeg"
-        )
+        valid_image = make_image("test.jpg", size=(20, 10), image_format="JPEG")
         try:
             self.validator.validate_image(valid_image)
         except ValidationError:
@@ -551,6 +2274,37 @@ class AdValidatorTest(TestCase):
                 "validate_image вызвал ValidationError для корректного изображения."
             )
 
+    def test_validate_image_content_not_image(self):
+        """
+        Проверяет, что файл с допустимым расширением, но не изображение,
+        вызывает ValidationError (формат определяется по сигнатуре).
+        """
+        fake_image = SimpleUploadedFile(
+            "test.jpg", b"<?php echo 1; ?>", content_type="image/jpeg"
+        )
+        with self.assertRaises(ValidationError) as context:
+            self.validator.validate_image(fake_image)
+        self.assertEqual(
+            str(context.exception.detail[0]),
+            "Файл не является изображением JPG, PNG или WEBP.",
+        )
+
+    @override_settings(IMAGE_MAX_PIXELS=1_000_000)
+    def test_validate_image_content_too_many_pixels(self):
+        """
+        Проверяет, что изображение большого разрешения отклоняется по заголовку,
+        без декодирования пикселей.
+        """
+        image = make_image("test.png", size=(2000, 1000))
+        with patch("PIL.ImageFile.ImageFile.load") as load:
+            with self.assertRaises(ValidationError) as context:
+                self.validator.validate_image(image)
+        load.assert_not_called()
+        self.assertEqual(
+            str(context.exception.detail[0]),
+            "Разрешение изображения не должно превышать 1 Мп.",
+        )
+
     def test_call_method_valid(self):
         """
         Проверяет, что метод __call__ корректно обрабатывает валидные данные.
@@ -572,3 +2326,46 @@ class AdValidatorTest(TestCase):
             str(context.exception.detail[0]),
             "Название товара обязательно для заполнения.",
         )
+
+
+class TitleSuggesterTest(TestCase):
+    def test_matches_full_scan(self):
+        """
+        Сравнивает подсказки (в том числе по коротким префиксам с готовыми
+        списками) с полным перебором после добавлений, переименований и удалений.
+        """
+        suggester = TitleSuggester()
+        suggester.bucket_size = 3
+        suggester.build()
+        rng = random.Random(0)
+        words = ["ab", "abc", "b", "ba", "bac", "c", "ca"]
+        now = timezone.now()
+        ads = {}
+
+        def expected(prefix, limit):
+            best = {}
+            for ad in ads.values():
+                keys = TitleSuggester._keys(ad.title)
+                if any(key.startswith(prefix) for key in keys):
+                    item = (-ad.created_at.timestamp(), -ad.pk)
+                    title_key = " ".join(ad.title.lower().split())
+                    best[title_key] = min(best.get(title_key, item), item)
+            return [-ad_id for _, ad_id in sorted(best.values())[:limit]]
+
+        for step in range(400):
+            ad_id = rng.randrange(1, 30)
+            if ad_id in ads and rng.random() < 0.3:
+                del ads[ad_id]
+                suggester.remove(ad_id)
+            else:
+                title = " ".join(rng.choices(words, k=rng.randrange(1, 3)))
+                created_at = now - timedelta(seconds=rng.randrange(5))
+                ads[ad_id] = Ad(pk=ad_id, title=title, created_at=created_at)
+                suggester.add(ads[ad_id])
+            for prefix in ("a", "b", "ab", "ba", "abc", "b a", "c"):
+                for limit in (1, 3):
+                    self.assertEqual(
+                        [ad_id for ad_id, _ in suggester.suggest(prefix, limit)],
+                        expected(prefix, limit),
+                        (step, prefix, limit),
+                    )
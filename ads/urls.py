@@ -2,20 +2,52 @@ from django.urls import path
 
 from ads.apps import AdsConfig
 from ads.views import (
+    AdBulkCreateAPIView,
+    AdBulkDestroyAPIView,
+    AdBulkUpdateAPIView,
     AdCreateAPIView,
     AdDestroyAPIView,
+    AdDirectUploadAPIView,
+    AdDirectUploadConfirmAPIView,
     AdListAPIView,
     AdRetrieveAPIView,
+    AdSuggestAPIView,
     AdUpdateAPIView,
+    UploadSessionAPIView,
+    UploadSessionCompleteAPIView,
+    UploadSessionCreateAPIView,
 )
+from reviews.views import AdReviewListAPIView
 
 app_name = AdsConfig.name
 
 urlpatterns = [
     path("", AdListAPIView.as_view(), name="ads-list"),
     path("create/", AdCreateAPIView.as_view(), name="ads-create"),
+    path("bulk-create/", AdBulkCreateAPIView.as_view(), name="ads-bulk-create"),
+    path("suggest/", AdSuggestAPIView.as_view(), name="ads-suggest"),
+    path("uploads/", UploadSessionCreateAPIView.as_view(), name="ads-upload-create"),
+    path("uploads/<uuid:pk>/", UploadSessionAPIView.as_view(), name="ads-upload"),
+    path(
+        "uploads/<uuid:pk>/complete/",
+        UploadSessionCompleteAPIView.as_view(),
+        name="ads-upload-complete",
+    ),
     path("<int:pk>/", AdRetrieveAPIView.as_view(), name="ads-retrieve"),
+    path("<int:pk>/reviews/", AdReviewListAPIView.as_view(), name="ads-reviews"),
+    path(
+        "<int:pk>/direct-upload/",
+        AdDirectUploadAPIView.as_view(),
+        name="ads-direct-upload",
+    ),
+    path(
+        "<int:pk>/direct-upload/confirm/",
+        AdDirectUploadConfirmAPIView.as_view(),
+        name="ads-direct-upload-confirm",
+    ),
     path("update/<int:pk>/", AdUpdateAPIView.as_view(), name="ads-update"),
+    path("bulk-update/", AdBulkUpdateAPIView.as_view(), name="ads-bulk-update"),
+    path("bulk-delete/", AdBulkDestroyAPIView.as_view(), name="ads-bulk-delete"),
     path(
         "delete/<int:pk>/",
         AdDestroyAPIView.as_view(),
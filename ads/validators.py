@@ -1,15 +1,20 @@
 import os
 from typing import Union
 
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from rest_framework.exceptions import ValidationError
 
+from config.images import check_image_pixels, read_image_header
+
 
 class AdValidator:
     """
     Валидатор для проверки бизнес-логики объявлений.
     """
 
+    MAX_IMAGE_SIZE = 5 * 1024 * 1024
+
     def __call__(self, data: dict[str, any]) -> None:
         # для реализации PATCH - запроса
         if "title" in data:
@@ -94,16 +99,61 @@ class AdValidator:
         """
 
         if image:
-            # Проверка расширения файла
-            ext = os.path.splitext(image.name)[1].lower()
-            valid_extensions = [".jpg", ".jpeg", ".png", ".webp"]
-            if ext not in valid_extensions:
-                raise ValidationError(
-                    "Неподдерживаемый формат изображения. "
-                    "Допустимые форматы: JPG, JPEG, PNG, WEBP."
-                )
-
-            # Проверка размера файла (не более 5 MB)
-            max_size = 5 * 1024 * 1024
-            if image.size > max_size:
-                raise ValidationError("Размер изображения не должен превышать 5MB.")
+            self.validate_image_name(image.name)
+            # Размер проверяется до чтения содержимого файла
+            self.validate_image_size(image.size)
+            self.validate_image_content(image)
+
+    def validate_image_name(self, name: str) -> None:
+        """
+        Проверка расширения файла изображения.
+        Args:
+            name (str): Имя файла изображения
+
+        Raises:
+            ValidationError: Неподдерживаемый формат изображения.
+                             Допустимые форматы: JPG, JPEG, PNG, WEBP.
+        """
+        ext = os.path.splitext(name)[1].lower()
+        valid_extensions = [".jpg", ".jpeg", ".png", ".webp"]
+        if ext not in valid_extensions:
+            raise ValidationError(
+                "Неподдерживаемый формат изображения. "
+                "Допустимые форматы: JPG, JPEG, PNG, WEBP."
+            )
+
+    def validate_image_size(self, size: int) -> None:
+        """
+        Проверка размера файла изображения (не более 5 MB).
+        Args:
+            size (int): Размер файла в байтах
+
+        Raises:
+            ValidationError: Размер изображения не должен превышать 5MB.
+        """
+        if size > self.MAX_IMAGE_SIZE:
+            raise ValidationError("Размер изображения не должен превышать 5MB.")
+
+    def validate_image_content(self, image) -> None:
+        """
+        Проверка содержимого файла по сигнатуре и заголовку изображения.
+
+        Пиксели не декодируются: формат определяется по первым байтам, размеры
+        читаются из заголовка, поэтому сжатое изображение огромного разрешения
+        (decompression bomb) отклоняется до полной распаковки.
+        Args:
+            image: Файл изображения (UploadedFile или открытый файл)
+
+        Raises:
+            ValidationError: Файл не является изображением JPG, PNG или WEBP.
+                             Разрешение изображения слишком велико.
+        """
+        try:
+            _, width, height = read_image_header(image)
+        except ValueError:
+            raise ValidationError("Файл не является изображением JPG, PNG или WEBP.")
+        if not check_image_pixels(width, height):
+            megapixels = settings.IMAGE_MAX_PIXELS // 1_000_000
+            raise ValidationError(
+                f"Разрешение изображения не должно превышать {megapixels} Мп."
+            )
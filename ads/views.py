@@ -1,11 +1,41 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from ads.facets import price_histogram
 from ads.filters import AdFilter
-from ads.models import Ad
-from ads.paginations import AdPaginator
-from ads.serializers import AdSerializer
+from ads.models import Ad, UploadSession
+from ads.paginations import AdCursorPaginator, AdPaginator
+from ads.search import trigram_threshold
+from ads.serializers import (
+    AdSerializer,
+    DirectUploadSerializer,
+    UploadSessionSerializer,
+)
+from ads.signals import ads_bulk_changed
+from ads.suggestions import title_suggester
+from ads.validators import AdValidator
+from config.cache import bump_generation
+from config.mixins import (
+    BulkDestroyMixin,
+    BulkUpdateMixin,
+    CachedListMixin,
+    ConditionalRetrieveMixin,
+    ValuesListMixin,
+)
+from config.paginations import PaginationModeMixin
+from config.storage import hashed_name
 from users.permissions import IsAdmin, IsAuthor
 
 
@@ -18,18 +48,147 @@ class AdCreateAPIView(generics.CreateAPIView):
         serializer.save(author=self.request.user)
 
 
-class AdListAPIView(generics.ListAPIView):
+class AdBulkCreateAPIView(generics.GenericAPIView):
+    """
+    Массовое создание объявлений.
+
+    - Принимает JSON - массив объявлений (не более max_batch_size).
+    - Проверяет каждое объявление сериализатором и AdValidator и возвращает
+      ошибки по каждому элементу (пустой объект для корректных элементов).
+    - Сохраняет все объявления одним bulk_create в одной транзакции.
+    """
+
+    serializer_class = AdSerializer
+    queryset = Ad.objects.all()
+    permission_classes = (IsAdmin | IsAuthenticated,)
+    max_batch_size = 500
+
+    def post(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError("Ожидается список объявлений.")
+        if len(request.data) > self.max_batch_size:
+            raise ValidationError(
+                f"За один запрос можно создать не более {self.max_batch_size} "
+                "объявлений."
+            )
+
+        # Ошибки собираются по позициям массива: {} для корректных элементов
+        serializers = [self.get_serializer(data=item) for item in request.data]
+        errors = [
+            {} if serializer.is_valid() else serializer.errors
+            for serializer in serializers
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+
+        with transaction.atomic():
+            ads = Ad.objects.bulk_create(
+                [
+                    Ad(author=request.user, **serializer.validated_data)
+                    for serializer in serializers
+                ]
+            )
+        ads_bulk_changed(ads)
+
+        return Response(
+            self.get_serializer(ads, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+
+class FuzzySearchMixin:
+    """
+    Выполняет запрос с нечётким поиском (?fuzzy=) внутри trigram_threshold(),
+    чтобы индекс по триграммам применялся с настроенным порогом сходства.
+    """
+
+    fuzzy_query_param = "fuzzy"
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.fuzzy_query_param not in request.GET:
+            return super().dispatch(request, *args, **kwargs)
+        with trigram_threshold():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class AdListAPIView(
+    FuzzySearchMixin,
+    CachedListMixin,
+    ValuesListMixin,
+    PaginationModeMixin,
+    generics.ListAPIView,
+):
     serializer_class = AdSerializer
-    queryset = Ad.objects.all().order_by("-created_at")
+    queryset = Ad.objects.all().order_by("-created_at", "-id")
     pagination_class = AdPaginator
+    # пагинация по курсору (?pagination=cursor) для бесконечной ленты
+    cursor_pagination_class = AdCursorPaginator
+    # страницы кэшируются до изменения объявлений (при CACHE_ENABLED)
+    cache_model = Ad
     # подключение фильтрации
     filter_backends = [DjangoFilterBackend]
     # используемый фильтр
     filterset_class = AdFilter
     permission_classes = ()
 
+    def paginate_queryset(self, queryset):
+        # фасеты считаются по всей отфильтрованной выборке, а не по странице
+        self.facets = {}
+        if "price" in self.get_requested_facets():
+            self.facets["price"] = price_histogram(queryset)
+        return super().paginate_queryset(queryset)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.facets:
+            response.data["facets"] = self.facets
+        return response
+
+    def get_requested_facets(self):
+        """
+        Фасеты, запрошенные параметром ?facets=price (через запятую).
+        """
+        value = self.request.query_params.get("facets", "")
+        return {facet.strip() for facet in value.split(",") if facet.strip()}
+
+
+class AdSuggestAPIView(APIView):
+    """
+    Подсказки для автодополнения названий объявлений.
+
+    - Принимает начало названия в параметре q (и необязательный limit).
+    - Возвращает самые новые объявления, слова названия которых начинаются с q.
+    - Ищет по отсортированной структуре в памяти, а не запросом iregex к БД.
+    """
+
+    permission_classes = ()
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
 
-class AdRetrieveAPIView(generics.RetrieveAPIView):
+        candidates = title_suggester.suggest(query, limit)
+        # Подсказки других процессов могут устареть: проверяем их по первичному
+        # ключу, чтобы не показывать удалённые и переименованные объявления
+        titles = dict(
+            Ad.objects.filter(pk__in=[ad_id for ad_id, _ in candidates]).values_list(
+                "pk", "title"
+            )
+        )
+        results = [
+            {"id": ad_id, "title": title}
+            for ad_id, title in candidates
+            if titles.get(ad_id) == title
+        ]
+        return Response({"results": results})
+
+
+class AdRetrieveAPIView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     serializer_class = AdSerializer
     queryset = Ad.objects.all()
     permission_classes = (IsAuthenticated | IsAdmin,)
@@ -51,3 +210,260 @@ class AdDestroyAPIView(generics.DestroyAPIView):
         IsAuthenticated,
         IsAdmin | IsAuthor,
     )
+
+
+class AdBulkUpdateAPIView(FuzzySearchMixin, BulkUpdateMixin, generics.GenericAPIView):
+    """
+    Массовое изменение объявлений одним UPDATE.
+
+    Тело запроса: {"ids": [...], "data": {...}}; вместо ids можно передать
+    фильтры AdFilter в строке запроса. Изменять можно только свои объявления
+    (администратор - любые).
+    """
+
+    serializer_class = AdSerializer
+    queryset = Ad.objects.all()
+    filterset_class = AdFilter
+    permission_classes = (IsAuthenticated,)
+    bulk_update_fields = ("title", "price", "description")
+
+    def perform_bulk_update(self, queryset, values):
+        ids = list(queryset.order_by().values_list("pk", flat=True))
+        updated = super().perform_bulk_update(Ad.objects.filter(pk__in=ids), values)
+        if {"title", "description"} & set(values):
+            ads_bulk_changed(Ad.objects.filter(pk__in=ids))
+        else:
+            bump_generation(Ad)
+        return updated
+
+
+class AdBulkDestroyAPIView(FuzzySearchMixin, BulkDestroyMixin, generics.GenericAPIView):
+    """
+    Массовое удаление объявлений по списку ids или по фильтрам AdFilter.
+    """
+
+    serializer_class = AdSerializer
+    queryset = Ad.objects.all()
+    filterset_class = AdFilter
+    permission_classes = (IsAuthenticated,)
+
+
+class UploadSessionCreateAPIView(generics.CreateAPIView):
+    """
+    Открывает сессию загрузки изображения по частям.
+
+    Принимает {"filename": ..., "size": ...} и возвращает id сессии и
+    offset - смещение, с которого нужно отправлять следующую часть.
+    """
+
+    serializer_class = UploadSessionSerializer
+    queryset = UploadSession.objects.all()
+    permission_classes = (IsAuthenticated,)
+
+    def perform_create(self, serializer):
+        session = serializer.save(author=self.request.user)
+        os.makedirs(settings.UPLOAD_SESSION_ROOT, exist_ok=True)
+        open(session.path, "wb").close()
+
+
+class UploadSessionMixin:
+    """
+    Возвращает незавершённую сессию загрузки текущего пользователя.
+    """
+
+    def get_session(self, queryset=None):
+        queryset = UploadSession.objects.all() if queryset is None else queryset
+        session = get_object_or_404(
+            queryset, pk=self.kwargs["pk"], author=self.request.user
+        )
+        # Истёкшие сессии удаляет периодическая задача clear_expired_upload_sessions
+        if session.is_expired:
+            raise NotFound("Сессия загрузки истекла.")
+        return session
+
+
+class UploadSessionAPIView(UploadSessionMixin, APIView):
+    """
+    Состояние сессии загрузки и приём очередной части файла.
+
+    - GET возвращает сессию с offset - с него продолжается прерванная загрузка.
+    - PUT принимает часть файла телом запроса (application/offset+octet-stream)
+      с заголовком Upload-Offset, равным текущему offset сессии. Тело читается
+      из потока блоками и дописывается в файл на диске, не накапливаясь
+      в памяти воркера.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    read_block_size = 64 * 1024
+
+    def get(self, request, pk):
+        return Response(UploadSessionSerializer(self.get_session()).data)
+
+    def put(self, request, pk):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers.get("Content-Length") or 0)
+        except (KeyError, ValueError):
+            raise ValidationError("Укажите заголовки Upload-Offset и Content-Length.")
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            raise ValidationError(
+                f"Часть файла не должна превышать {settings.UPLOAD_CHUNK_MAX_SIZE} байт."
+            )
+
+        with transaction.atomic():
+            # Блокировка строки не даёт двум запросам дописывать одну сессию
+            session = self.get_session(UploadSession.objects.select_for_update())
+            if offset != session.offset:
+                return Response(
+                    UploadSessionSerializer(session).data,
+                    status=status.HTTP_409_CONFLICT,
+                )
+            if offset + length > session.size:
+                raise ValidationError("Данные выходят за пределы размера файла.")
+
+            stream = request.stream
+            received = 0
+            with open(session.path, "r+b") as file:
+                # Остаток прерванной части отбрасывается: запись идёт с offset
+                file.seek(offset)
+                file.truncate()
+                while stream is not None and received < length:
+                    block = stream.read(min(self.read_block_size, length - received))
+                    if not block:
+                        break
+                    file.write(block)
+                    received += len(block)
+
+            session.offset = offset + received
+            session.save(update_fields=["offset"])
+        return Response(UploadSessionSerializer(session).data)
+
+
+class UploadSessionCompleteAPIView(UploadSessionMixin, generics.GenericAPIView):
+    """
+    Прикрепляет полностью загруженный файл к объявлению ({"ad": id}).
+
+    Файл проверяется по сигнатуре и заголовку изображения, копируется
+    в хранилище поля Ad.image, после чего сессия и временный файл удаляются.
+    """
+
+    serializer_class = AdSerializer
+    queryset = Ad.objects.all()
+    permission_classes = (
+        IsAuthenticated,
+        IsAdmin | IsAuthor,
+    )
+
+    def post(self, request, pk):
+        session = self.get_session()
+        if session.offset != session.size:
+            raise ValidationError("Файл загружен не полностью.")
+
+        ad = get_object_or_404(Ad, pk=request.data.get("ad"))
+        self.check_object_permissions(request, ad)
+
+        with open(session.path, "rb") as file:
+            AdValidator().validate_image_content(file)
+            ad.image.save(os.path.basename(session.filename), File(file))
+        session.discard()
+
+        return Response(self.get_serializer(ad).data)
+
+
+class DirectUploadMixin:
+    """
+    Общие настройки прямой загрузки изображения объявления в хранилище.
+    """
+
+    queryset = Ad.objects.all()
+    permission_classes = (
+        IsAuthenticated,
+        IsAdmin | IsAuthor,
+    )
+    token_salt = "ads.direct-upload"
+
+    def get_storage(self):
+        storage = Ad._meta.get_field("image").storage
+        if not hasattr(storage, "presigned_upload"):
+            raise ValidationError("Прямая загрузка в хранилище не настроена.")
+        return storage
+
+
+class AdDirectUploadAPIView(DirectUploadMixin, generics.GenericAPIView):
+    """
+    Выдаёт подписанный запрос для загрузки изображения объявления напрямую
+    в S3-совместимое хранилище.
+
+    Принимает {"filename", "size", "contentHash"} (SHA-256 файла) и возвращает
+    метод, URL и заголовки запроса загрузки, а также token для подтверждения.
+    Имя объекта - хэш содержимого, как у файлов, сохранённых через Django.
+    """
+
+    serializer_class = DirectUploadSerializer
+
+    def post(self, request, pk):
+        ad = self.get_object()
+        storage = self.get_storage()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        name = hashed_name(
+            ad.image.field.generate_filename(ad, data["filename"]), data["content_hash"]
+        )
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        upload = storage.presigned_upload(
+            name,
+            data["content_hash"],
+            content_type,
+            data["size"],
+            settings.MEDIA_DIRECT_UPLOAD_EXPIRE,
+        )
+        upload["token"] = signing.dumps(
+            {"ad": ad.pk, "name": name, "size": data["size"]}, salt=self.token_salt
+        )
+        return Response(upload)
+
+
+class AdDirectUploadConfirmAPIView(DirectUploadMixin, generics.GenericAPIView):
+    """
+    Прикрепляет загруженный напрямую файл к объявлению ({"token": ...}).
+
+    Файл проверяется по размеру (заявленному при выдаче ссылки и
+    допустимому), сигнатуре и заголовку изображения; варианты
+    изображения создаются задачей Celery, как и при обычной загрузке.
+    Отклонённый файл без ссылок удаляет collect_media_garbage.
+    """
+
+    serializer_class = AdSerializer
+
+    def post(self, request, pk):
+        ad = self.get_object()
+        storage = self.get_storage()
+        try:
+            token = signing.loads(
+                request.data.get("token", ""),
+                salt=self.token_salt,
+                max_age=settings.UPLOAD_SESSION_TTL,
+            )
+        except signing.BadSignature:
+            raise ValidationError("Недействительный токен загрузки.")
+        if token["ad"] != ad.pk:
+            raise ValidationError("Недействительный токен загрузки.")
+
+        name = token["name"]
+        if not storage.exists(name):
+            raise ValidationError("Файл не загружен в хранилище.")
+        # Размер входит в подпись запроса загрузки; проверка здесь - на случай
+        # хранилища, которое не сверяет Content-Length с подписью
+        size = storage.size(name)
+        if size != token.get("size"):
+            raise ValidationError("Размер файла не совпадает с заявленным.")
+        validator = AdValidator()
+        validator.validate_image_size(size)
+        with storage.open(name) as file:
+            validator.validate_image_content(file)
+
+        ad.image = name
+        ad.save()
+        return Response(self.get_serializer(ad).data)
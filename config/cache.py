@@ -0,0 +1,80 @@
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def is_cache_enabled() -> bool:
+    """
+    Кэширование данных включается только вместе с общим кэшем (Redis):
+    локальный кэш процесса нельзя согласованно сбросить во всех воркерах.
+    """
+    return getattr(settings, "CACHE_ENABLED", False)
+
+
+def _generation_key(model) -> str:
+    return f"generation:{model._meta.label_lower}"
+
+
+def get_generation(model) -> int:
+    """
+    Возвращает текущее поколение данных модели.
+
+    Поколение входит в ключи всех кэшей, зависящих от таблицы модели: после
+    изменения строк оно увеличивается, и старые записи перестают читаться
+    (без полной очистки кэша). Начальное значение берётся из текущего времени,
+    чтобы после вытеснения ключа поколение не вернулось к уже использованному.
+    Args:
+        model: Класс модели Django
+
+    Returns:
+        int: Номер поколения
+    """
+    key = _generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _incr_generation(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_generation(model) -> None:
+    """
+    Увеличивает поколение данных модели (вызывается из сигналов моделей).
+
+    Внутри транзакции поколение увеличивается сразу (чтобы её собственные
+    запросы не читали старый кэш) и ещё раз после фиксации: до неё другие
+    процессы видят прежние строки и могли закэшировать их с новым поколением.
+    Повтор нужен только при общем кэше (CACHE_ENABLED).
+    Args:
+        model: Класс модели Django
+    """
+    key = _generation_key(model)
+    _incr_generation(key)
+    if is_cache_enabled() and transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_incr_generation, key))
+
+
+def make_cache_key(prefix: str, model, *parts) -> str:
+    """
+    Формирует ключ кэша, привязанный к поколению данных модели.
+    Args:
+        prefix(str): Назначение ключа (count, ads-list и т.п.)
+        model: Класс модели, от данных которой зависит значение
+        *parts: Данные, однозначно описывающие запрос
+
+    Returns:
+        str: Ключ кэша
+    """
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"{prefix}:{model._meta.label_lower}:{get_generation(model)}:{digest}"
@@ -0,0 +1,13 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+
+# Настройки Celery берутся из settings.py с префиксом CELERY_
+app.config_from_object("django.conf:settings", namespace="CELERY")
+
+# Задачи ищутся в модулях tasks.py всех приложений
+app.autodiscover_tasks()
@@ -0,0 +1,399 @@
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps
+from rest_framework import serializers
+
+from config.cache import bump_generation
+from config.media import media_url
+from config.storage import get_file_fields, get_media_storage, is_recent, is_referenced
+
+IMAGE_STATUS_NONE = "none"
+IMAGE_STATUS_PENDING = "pending"
+IMAGE_STATUS_READY = "ready"
+IMAGE_STATUS_FAILED = "failed"
+
+IMAGE_STATUS_CHOICES = [
+    (IMAGE_STATUS_NONE, "Нет изображения"),
+    (IMAGE_STATUS_PENDING, "Обрабатывается"),
+    (IMAGE_STATUS_READY, "Готово"),
+    (IMAGE_STATUS_FAILED, "Ошибка обработки"),
+]
+
+# Форматы вариантов: ключ в карте вариантов -> формат Pillow
+VARIANT_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+# Каталог вариантов внутри каталога владельца (ads/variants, users/variants):
+# варианты наследуют правила доступа исходного файла (MEDIA_PROTECTED_PREFIXES)
+VARIANTS_DIR = "variants"
+
+# Сигнатуры (magic bytes) допустимых форматов загружаемых изображений
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+)
+
+
+def sniff_image_format(head: bytes) -> str | None:
+    """
+    Определяет формат изображения по первым байтам файла.
+    Args:
+        head(bytes): Не менее 12 первых байт файла
+
+    Returns:
+        str | None: JPEG, PNG, WEBP или None для остальных файлов
+    """
+    for signature, image_format in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def read_image_header(file) -> tuple[str, int, int]:
+    """
+    Возвращает формат и размеры изображения, читая только его заголовок.
+
+    Формат определяется по сигнатуре, и Pillow открывает файл только этим
+    форматом; Image.open не декодирует пиксели, поэтому проверка размеров
+    не требует памяти под всё изображение.
+    Args:
+        file: Файловый объект с методами read и seek
+
+    Raises:
+        ValueError: Файл не является изображением JPEG, PNG или WEBP
+
+    Returns:
+        tuple[str, int, int]: Формат, ширина и высота
+    """
+    file.seek(0)
+    try:
+        image_format = sniff_image_format(file.read(12))
+        if image_format is None:
+            raise ValueError("Неизвестный формат изображения")
+        file.seek(0)
+        with Image.open(file, formats=[image_format]) as image:
+            return image_format, image.width, image.height
+    except (OSError, Image.DecompressionBombError) as error:
+        raise ValueError(str(error)) from error
+    finally:
+        file.seek(0)
+
+
+def check_image_pixels(width: int, height: int) -> bool:
+    return width * height <= settings.IMAGE_MAX_PIXELS
+
+
+def strip_image_metadata(field_file) -> str:
+    """
+    Перекодирует изображение без EXIF (геометка, модель камеры и т.п.).
+
+    Поворот из тега Orientation применяется к пикселям. JPEG без поворота
+    сохраняется с исходными таблицами квантования (quality="keep"), чтобы не
+    терять качество. Очищенное изображение сохраняется новым файлом (исходный
+    освобождается после сохранения ссылки); файлы без EXIF не изменяются.
+    Args:
+        field_file(FieldFile): Исходное изображение
+
+    Returns:
+        str: Имя файла в хранилище после обработки
+    """
+    with field_file.open("rb"), Image.open(field_file) as image:
+        exif = image.getexif()
+        if not exif and "exif" not in image.info:
+            return field_file.name
+
+        options = {}
+        if image.info.get("icc_profile"):
+            options["icc_profile"] = image.info["icc_profile"]
+        orientation = exif.get(ExifTags.Base.Orientation, 1)
+        image_format = image.format
+        if orientation != 1:
+            image = ImageOps.exif_transpose(image)
+            options["quality"] = 95
+        elif image_format == "JPEG":
+            options["quality"] = "keep"
+        else:
+            options["quality"] = 95
+
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+
+    # Имя строится от каталога upload_to, а не от сохранённого имени: иначе
+    # каталоги хэша (ab/cd) вложились бы в имя очищенного файла ещё раз
+    name = field_file.field.generate_filename(
+        field_file.instance, posixpath.basename(field_file.name)
+    )
+    return field_file.storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_image_variants(field_file) -> dict:
+    """
+    Создаёт уменьшенные копии изображения в форматах WebP и JPEG.
+
+    Размеры берутся из IMAGE_VARIANT_WIDTHS; изображение не увеличивается.
+    JPEG декодируется сразу в уменьшенном масштабе (Image.draft), а каждый
+    следующий размер получается из предыдущего, а не из оригинала.
+    Args:
+        field_file(FieldFile): Исходное изображение
+
+    Returns:
+        dict: {"thumb": {"width": ..., "height": ..., "webp": ..., "jpeg": ...}}
+              с именами файлов вариантов в хранилище
+    """
+    widths = sorted(
+        settings.IMAGE_VARIANT_WIDTHS.items(), key=lambda item: item[1], reverse=True
+    )
+
+    owner = field_file.name.split("/", 1)[0]
+
+    with field_file.open("rb"), Image.open(field_file) as original:
+        largest = widths[0][1]
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+
+        variants = {}
+        for label, width in widths:
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.Resampling.LANCZOS)
+            variant = {"width": image.width, "height": image.height}
+            for key, image_format in VARIANT_FORMATS.items():
+                content = _encode(image, image_format)
+                name = posixpath.join(owner, VARIANTS_DIR, f"{label}.{key}")
+                variant[key] = field_file.storage.save(name, ContentFile(content))
+            variants[label] = variant
+    return variants
+
+
+def _encode(image, image_format: str) -> bytes:
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    if image_format == "JPEG" and has_alpha:
+        # У JPEG нет прозрачности - накладываем изображение на белый фон
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, "white")
+        image.paste(rgba, mask=rgba.getchannel("A"))
+    elif image.mode not in ("RGB", "RGBA") or (image.mode == "RGBA" and not has_alpha):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    buffer = io.BytesIO()
+    quality = settings.IMAGE_VARIANT_QUALITY
+    if image_format == "JPEG":
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, image_format, quality=quality)
+    return buffer.getvalue()
+
+
+def _variant_names(state: dict) -> list[str]:
+    return [
+        variant[key]
+        for variant in (state or {}).get("variants", {}).values()
+        for key in VARIANT_FORMATS
+        if variant.get(key)
+    ]
+
+
+def release_image(name: str, state: dict | None = None) -> bool:
+    """
+    Удаляет изображение и его варианты, если на файл больше нет ссылок.
+
+    Одинаковые загрузки хранятся одним файлом (ContentAddressedStorage),
+    поэтому файл удаляется только когда его не использует ни одна запись.
+    Недавно изменённые файлы пропускаются: их удалит collect_media_garbage.
+    Args:
+        name(str): Имя файла изображения в хранилище
+        state(dict): Карта вариантов (image_variants), построенных по файлу
+
+    Returns:
+        bool: True, если файлы удалены
+    """
+    storage = get_media_storage()
+    if not name or is_referenced(storage, name) or is_recent(storage, name):
+        return False
+    storage.delete(name)
+    # Варианты одного файла одинаковы у всех ссылающихся на него записей
+    for variant_name in _variant_names(state):
+        storage.delete(variant_name)
+    return True
+
+
+def collect_media_garbage(dry_run: bool = False) -> list[str]:
+    """
+    Удаляет из хранилища изображений файлы, на которые не ссылается ни одна
+    запись (ни полем изображения, ни картой вариантов). Файлы, изменённые
+    в течение MEDIA_GC_GRACE_PERIOD, не удаляются.
+    Args:
+        dry_run(bool): Только вернуть список файлов, ничего не удаляя
+
+    Returns:
+        list[str]: Имена удалённых (для dry_run - подлежащих удалению) файлов
+    """
+    storage = get_media_storage()
+    referenced, directories = set(), {VARIANTS_DIR}
+    for model, field in get_file_fields(storage):
+        if isinstance(field.upload_to, str):
+            directories.add(field.upload_to.strip("/"))
+            owner = field.upload_to.split("/", 1)[0]
+            directories.add(posixpath.join(owner, VARIANTS_DIR))
+        columns = [field.name]
+        if field.name == "image" and hasattr(model, "image_variants"):
+            columns.append("image_variants")
+        for row in model._default_manager.values_list(*columns).iterator():
+            referenced.add(row[0])
+            if len(row) > 1:
+                referenced.update(_variant_names(row[1]))
+
+    removed = []
+    for directory in sorted(directories):
+        for name in _walk(storage, directory):
+            if name in referenced or is_recent(storage, name):
+                continue
+            if not dry_run:
+                storage.delete(name)
+            removed.append(name)
+    return removed
+
+
+def _walk(storage, directory: str):
+    try:
+        directories, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for file_name in files:
+        yield posixpath.join(directory, file_name)
+    for child in directories:
+        yield from _walk(storage, posixpath.join(directory, child))
+
+
+def release_deleted_image(instance) -> None:
+    """
+    Освобождает изображение удалённого объекта после фиксации транзакции
+    (вызывается из сигнала post_delete).
+    """
+    name, state = instance.image.name, instance.image_variants
+    if name:
+        transaction.on_commit(lambda: release_image(name, state))
+
+
+def process_image_variants(model, pk) -> bool:
+    """
+    Генерирует варианты текущего изображения объекта и сохраняет их карту.
+
+    Изображения с числом пикселей больше IMAGE_MAX_PIXELS отклоняются по
+    заголовку, без декодирования; EXIF удаляется из исходного файла.
+    Карта сохраняется условным UPDATE (только если изображение не заменили
+    за время обработки), после чего освобождаются предыдущее изображение
+    и его варианты.
+    Args:
+        model: Модель с полями image, image_variants и image_status
+        pk: Идентификатор объекта
+
+    Returns:
+        bool: False, если изображение заменили во время обработки
+    """
+    instance = model.objects.filter(pk=pk).only("image", "image_variants").first()
+    if instance is None:
+        return True
+
+    name = source = instance.image.name or ""
+    if not name:
+        values = {"image_variants": {}, "image_status": IMAGE_STATUS_NONE}
+        unchanged = Q(image__isnull=True) | Q(image="")
+    else:
+        try:
+            # Размеры проверяются по заголовку до полного декодирования
+            with instance.image.open("rb"):
+                _, width, height = read_image_header(instance.image)
+            if not check_image_pixels(width, height):
+                raise ValueError("Слишком большое изображение")
+            source = instance.image.name = strip_image_metadata(instance.image)
+            variants = generate_image_variants(instance.image)
+        except (ValueError, OSError, Image.DecompressionBombError):
+            values = {"image_variants": {"source": source}}
+            values["image_status"] = IMAGE_STATUS_FAILED
+        else:
+            values = {"image_variants": {"source": source, "variants": variants}}
+            values["image_status"] = IMAGE_STATUS_READY
+        if source != name:
+            values["image"] = source
+        unchanged = Q(image=name)
+
+    updated = model.objects.filter(unchanged, pk=pk).update(
+        **values, updated_at=timezone.now()
+    )
+    if not updated:
+        # Изображение заменили (или объект удалили). Созданные файлы могут быть
+        # общими с другими записями - лишние удалит collect_media_garbage
+        return not model.objects.filter(pk=pk).exists()
+
+    previous = instance.image_variants or {}
+    if previous.get("source") and previous["source"] != source:
+        release_image(previous["source"], previous)
+    if name != source:
+        release_image(name)
+    bump_generation(model)
+    return True
+
+
+def schedule_image_variants(instance, task) -> None:
+    """
+    Ставит задачу генерации вариантов, если изображение объекта изменилось.
+
+    Вызывается из сигнала post_save; задача отправляется после фиксации
+    транзакции, чтобы воркер увидел сохранённый файл и строку.
+    Args:
+        instance: Сохранённый объект с полями image, image_variants, image_status
+        task: Задача Celery, принимающая id объекта
+    """
+    name = instance.image.name or ""
+    source = (instance.image_variants or {}).get("source", "")
+    if name == source or instance.image_status == IMAGE_STATUS_PENDING:
+        return
+
+    model = type(instance)
+    model.objects.filter(pk=instance.pk).update(image_status=IMAGE_STATUS_PENDING)
+    instance.image_status = IMAGE_STATUS_PENDING
+    bump_generation(model)
+    pk = instance.pk
+    transaction.on_commit(lambda: task.delay(pk))
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Карта вариантов изображения: размер -> ширина, высота и URL в WebP и JPEG.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        representation = {}
+        for label, variant in (value or {}).get("variants", {}).items():
+            item = {"width": variant["width"], "height": variant["height"]}
+            for key in VARIANT_FORMATS:
+                item[key] = media_url(variant[key], request)
+            representation[label] = item
+        return representation
+
+
+class ImageThumbnailField(serializers.ReadOnlyField):
+    """
+    URL одного варианта изображения (по умолчанию thumb в WebP) или None,
+    если варианты ещё не готовы. Источник - поле image_variants.
+    """
+
+    def __init__(self, size="thumb", image_format="webp", **kwargs):
+        kwargs.setdefault("source", "image_variants")
+        super().__init__(**kwargs)
+        self.size = size
+        self.image_format = image_format
+
+    def to_representation(self, value):
+        variant = (value or {}).get("variants", {}).get(self.size)
+        if not variant:
+            return None
+        return media_url(variant[self.image_format], self.context.get("request"))
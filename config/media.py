@@ -0,0 +1,89 @@
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.static import serve
+from rest_framework import serializers
+
+from config.storage import get_media_storage, is_protected
+
+_signer = signing.Signer(salt="config.media")
+
+
+def signing_window() -> int:
+    """
+    Номер текущего интервала подписи ссылок (MEDIA_SIGNED_URL_MAX_AGE секунд).
+
+    Внутри интервала подписанные ссылки не меняются; ссылка, выданная в
+    интервале, действует ещё не меньше одного интервала после его конца.
+    """
+    return int(time.time()) // settings.MEDIA_SIGNED_URL_MAX_AGE
+
+
+def media_url(name: str, request=None) -> str:
+    """
+    Возвращает URL файла хранилища изображений.
+
+    Для защищённых файлов на диске к URL добавляются срок действия и подпись.
+    Срок округляется вверх до MEDIA_SIGNED_URL_MAX_AGE, поэтому в пределах
+    этого интервала ссылка не меняется и остаётся кэшируемой. S3-хранилище
+    подписывает ссылки на защищённые файлы само (config/s3.py).
+    Args:
+        name(str): Имя файла в хранилище
+        request: Запрос для построения абсолютного URL (необязательно)
+
+    Returns:
+        str: URL файла
+    """
+    storage = get_media_storage()
+    url = storage.url(name)
+    if is_protected(name) and isinstance(storage, FileSystemStorage):
+        expires = (signing_window() + 2) * settings.MEDIA_SIGNED_URL_MAX_AGE
+        signature = _signer.sign(f"{name}:{expires}").rsplit(":", 1)[1]
+        url = f"{url}?{urlencode({'expires': expires, 'signature': signature})}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def protected_media(request, path):
+    """
+    Проверяет подписанную ссылку на защищённый файл и передаёт его отдачу nginx.
+
+    Django не читает файл: ответ содержит только заголовок X-Accel-Redirect
+    на internal - location nginx. Без nginx (DEBUG) файл отдаётся Django.
+    """
+    if not is_protected(path):
+        raise Http404
+    expires = request.GET.get("expires", "")
+    signature = request.GET.get("signature", "")
+    try:
+        _signer.unsign(f"{path}:{expires}:{signature}")
+        remaining = int(expires) - int(time.time())
+    except (signing.BadSignature, ValueError):
+        return HttpResponseForbidden()
+    if remaining <= 0:
+        return HttpResponseForbidden()
+
+    if settings.DEBUG:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    else:
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        # Тип содержимого nginx определит по расширению файла
+        del response["Content-Type"]
+    response["Cache-Control"] = f"private, max-age={remaining}"
+    return response
+
+
+class MediaImageField(serializers.ImageField):
+    """
+    ImageField, возвращающий URL через media_url (с подписью для защищённых
+    файлов).
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return media_url(value.name, self.context.get("request"))
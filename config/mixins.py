@@ -0,0 +1,355 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from config.cache import get_generation, is_cache_enabled, make_cache_key
+from config.media import signing_window
+from config.paginations import KeysetPagination
+from config.parsers import underscoreize_key
+from config.serializers import ValuesSerializer, get_model_columns
+from users.permissions import IsAdmin, IsAuthor
+
+
+class CachedListMixin:
+    """
+    Кэширует сериализованные страницы списка по строке запроса.
+
+    Ключ кэша включает поколение данных cache_model, которое увеличивается
+    сигналами post_save / post_delete модели, поэтому после любого изменения
+    строк старые страницы больше не читаются, а кэш целиком не очищается.
+    Для ?expand= (ExpandMixin) в ключ входят и поколения связанных моделей
+    раскрытых полей. Попадание в кэш обслуживается без обращения к базе данных.
+    """
+
+    cache_model = None
+
+    @property
+    def list_cache_timeout(self):
+        return getattr(settings, "LIST_CACHE_TIMEOUT", 300)
+
+    def list(self, request, *args, **kwargs):
+        if not is_cache_enabled():
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.list_cache_timeout)
+        return response
+
+    def get_list_cache_key(self, request):
+        model = self.cache_model or self.get_queryset().model
+        get_requested_expand = getattr(self, "get_requested_expand", None)
+        expand = get_requested_expand() if get_requested_expand else None
+        related_generations = [
+            get_generation(model._meta.get_field(name).related_model)
+            for name in expand or ()
+        ]
+        # Хост и схема входят в ключ: ссылки на изображения и страницы абсолютные
+        return make_cache_key(
+            "list",
+            model,
+            related_generations,
+            request.scheme,
+            request.get_host(),
+            request.path,
+            sorted(request.query_params.lists()),
+        )
+
+
+class SparseFieldsetMixin:
+    """
+    Ограничение полей списка параметром ?fields=id,title,price.
+
+    Имена полей принимаются в camelCase или snake_case. Остальные поля
+    удаляются из сериализатора, а выборка читает только колонки оставшихся
+    полей (.only()), поэтому ненужные колонки (description, пути изображений)
+    не читаются из базы данных.
+    """
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        """
+        Возвращает список запрошенных полей или None, если параметр не указан.
+
+        Raises:
+            ValidationError: Неизвестные поля
+        """
+        # При генерации схемы API запроса может не быть
+        if getattr(self, "request", None) is None:
+            return None
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        available = {
+            name
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        }
+        unknown = [name for name in names if underscoreize_key(name) not in available]
+        if unknown:
+            raise ValidationError(
+                {self.fields_query_param: f"Неизвестные поля: {', '.join(unknown)}."}
+            )
+        return [underscoreize_key(name) for name in names]
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_requested_fields() is None:
+            return queryset
+        columns = get_model_columns(self.get_serializer())
+        return queryset if columns is None else queryset.only(*columns)
+
+
+class ExpandMixin:
+    """
+    Встраивание связанных объектов параметром ?expand=author.
+
+    Поля из Meta.expandable_fields сериализатора возвращаются вложенными
+    объектами, а связанные строки загружаются тем же запросом
+    (select_related), поэтому число запросов не зависит от размера страницы.
+    """
+
+    expand_query_param = "expand"
+
+    def get_requested_expand(self):
+        """
+        Возвращает список раскрываемых полей или None, если параметр не указан.
+
+        Raises:
+            ValidationError: Поле нельзя раскрыть
+        """
+        # При генерации схемы API запроса может не быть
+        if getattr(self, "request", None) is None:
+            return None
+        value = self.request.query_params.get(self.expand_query_param)
+        if not value:
+            return None
+
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        expandable = getattr(self.get_serializer_class().Meta, "expandable_fields", {})
+        unknown = [name for name in names if underscoreize_key(name) not in expandable]
+        if unknown:
+            raise ValidationError(
+                {
+                    self.expand_query_param: f"Нельзя раскрыть поля: {', '.join(unknown)}."
+                }
+            )
+        return [underscoreize_key(name) for name in names]
+
+    def get_serializer(self, *args, **kwargs):
+        expand = self.get_requested_expand()
+        if expand is not None:
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        expand = self.get_requested_expand()
+        return queryset if expand is None else queryset.select_related(*expand)
+
+
+class ValuesListMixin(ExpandMixin, SparseFieldsetMixin):
+    """
+    Быстрый путь списка только на чтение.
+
+    Выборка ограничивается колонками полей сериализатора (QuerySet.values()),
+    а страница сериализуется ValuesSerializer без создания экземпляров моделей
+    и полного прохода сериализатора DRF по каждой строке. Поддерживает
+    ?fields= (SparseFieldsetMixin) и ?expand= (ExpandMixin): поля связанного
+    объекта выбираются тем же запросом через JOIN.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = ValuesSerializer(
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+            fields=self.get_requested_fields(),
+            expand=self.get_requested_expand(),
+        )
+        columns = list(serializer.columns)
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(self.paginator, KeysetPagination):
+            # Курсор строится по полям ключа сортировки, даже если их нет в ?fields=
+            key = [field.lstrip("-") for field in self.paginator.get_ordering(queryset)]
+            columns += [field for field in key if field not in columns]
+        queryset = queryset.values(*columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(queryset))
+
+
+class ConditionalRetrieveMixin:
+    """
+    Поддержка условных GET - запросов (If-None-Match / If-Modified-Since).
+
+    ETag и Last-Modified вычисляются из первичного ключа и поля updated_at без
+    сериализации объекта. Если клиент уже получил актуальную версию,
+    возвращается 304 Not Modified с пустым телом.
+
+    Если ответ содержит подписанные ссылки на защищённые файлы (signed_media),
+    в ETag входит интервал подписи, Last-Modified не раньше его начала, а
+    Cache-Control ограничен его концом: после смены интервала клиент получает
+    новое тело со свежими ссылками вместо 304.
+    """
+
+    last_modified_field = "updated_at"
+    signed_media = False
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field).timestamp()
+        etag = f"{instance.pk}-{last_modified:.6f}"
+        max_age = None
+        if self.signed_media:
+            window = signing_window()
+            window_start = window * settings.MEDIA_SIGNED_URL_MAX_AGE
+            etag = f"{etag}-{window}"
+            last_modified = max(last_modified, window_start)
+            max_age = (
+                window_start + settings.MEDIA_SIGNED_URL_MAX_AGE - int(time.time())
+            )
+        etag = quote_etag(etag)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified)
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        if max_age is not None:
+            response["Cache-Control"] = f"private, max-age={max(max_age, 0)}"
+        return response
+
+
+class BulkActionMixin:
+    """
+    Выбор объектов для массовых операций и проверка прав на них.
+
+    Объекты задаются списком ids в теле запроса или фильтрами filterset_class
+    в строке запроса. Права проверяются для всей выборки одним запросом:
+    администратор может изменять любые объекты, остальные - только свои.
+    """
+
+    bulk_max_ids = 1000
+    # Параметры filterset_class, которые не сужают выборку
+    bulk_ignored_filters = ("ordering",)
+
+    def get_bulk_queryset(self):
+        queryset = self.get_queryset()
+        data = self.request.data if isinstance(self.request.data, dict) else {}
+        ids = data.get("ids")
+
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+                raise ValidationError({"ids": ["Ожидается список целых чисел."]})
+            if len(ids) > self.bulk_max_ids:
+                raise ValidationError(
+                    {"ids": [f"Не более {self.bulk_max_ids} объектов за запрос."]}
+                )
+            return queryset.filter(pk__in=ids)
+
+        filters = getattr(self, "filterset_class", None)
+        if filters is None:
+            raise ValidationError("Укажите ids объектов или фильтр.")
+        filterset = filters(
+            self.request.query_params, queryset=queryset, request=self.request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        # django-filter пропускает пустые значения (?title=): такой фильтр
+        # не сужает выборку и не считается заданным
+        if not any(
+            value not in (None, "", [], ())
+            for name, value in filterset.form.cleaned_data.items()
+            if name not in self.bulk_ignored_filters
+        ):
+            raise ValidationError("Укажите ids объектов или фильтр.")
+        return self.filter_queryset(queryset)
+
+    def check_bulk_permissions(self, queryset):
+        request = self.request
+        if IsAdmin().has_permission(request, self):
+            return
+        if not IsAuthor().has_bulk_permission(request, self, queryset):
+            self.permission_denied(
+                request, message="Можно изменять только собственные объекты."
+            )
+
+
+class BulkUpdateMixin(BulkActionMixin):
+    """
+    PATCH - запрос {"ids": [...], "data": {...}}: значения проверяются
+    сериализатором (partial) и применяются одним UPDATE ... WHERE id IN.
+    """
+
+    bulk_update_fields = ()
+
+    def patch(self, request, *args, **kwargs):
+        data = request.data.get("data") if isinstance(request.data, dict) else None
+        if not isinstance(data, dict) or not data:
+            raise ValidationError({"data": ["Укажите изменяемые поля."]})
+        unknown = sorted(set(data) - set(self.bulk_update_fields))
+        if unknown:
+            raise ValidationError(
+                {"data": [f"Поля нельзя изменять массово: {', '.join(unknown)}."]}
+            )
+
+        serializer = self.get_serializer(data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = self.get_bulk_queryset()
+        self.check_bulk_permissions(queryset)
+        updated = self.perform_bulk_update(queryset, serializer.validated_data)
+        return Response({"updated": updated})
+
+    def perform_bulk_update(self, queryset, values):
+        # update() не вызывает save(), поэтому auto_now поле задаётся явно
+        return queryset.update(**values, updated_at=timezone.now())
+
+
+class BulkDestroyMixin(BulkActionMixin):
+    """
+    DELETE - запрос {"ids": [...]} или с фильтром: объекты удаляются
+    пачками по bulk_delete_chunk_size в одной транзакции.
+    """
+
+    bulk_delete_chunk_size = 500
+
+    def delete(self, request, *args, **kwargs):
+        queryset = self.get_bulk_queryset()
+        self.check_bulk_permissions(queryset)
+        deleted = self.perform_bulk_destroy(queryset)
+        return Response({"deleted": deleted})
+
+    def perform_bulk_destroy(self, queryset):
+        ids = list(queryset.order_by().values_list("pk", flat=True))
+        model = queryset.model
+        with transaction.atomic():
+            for start in range(0, len(ids), self.bulk_delete_chunk_size):
+                end = start + self.bulk_delete_chunk_size
+                model.objects.filter(pk__in=ids[start:end]).delete()
+        return len(ids)
@@ -0,0 +1,440 @@
+import base64
+import binascii
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core import exceptions
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from config.cache import is_cache_enabled, make_cache_key
+
+
+def estimate_count(queryset):
+    """
+    Оценка количества строк по статистике планировщика PostgreSQL.
+
+    Для выборки без условий используется pg_class.reltuples, для выборки с
+    фильтрами - оценка строк из EXPLAIN. Для остальных СУБД и для таблиц без
+    собранной статистики возвращает None.
+    Args:
+        queryset(QuerySet): Выборка, количество строк которой нужно оценить
+
+    Returns:
+        int | None: Оценка количества строк
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples = -1, если таблица ещё ни разу не анализировалась
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except exceptions.EmptyResultSet:
+            # Условие заведомо ложно (например, .none()): строк нет
+            return 0
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LookaheadPage(Page):
+    """
+    Страница, наличие следующей страницы для которой определено по
+    дополнительно выбранной строке, а не по количеству записей.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator, который не считает COUNT(*) для больших выборок.
+
+    Если оценка планировщика не меньше estimate_threshold, она используется
+    как количество (is_approximate = True). Оценка только показывается в
+    ответе: номер страницы проверяется и страница выбирается с одной лишней
+    строкой (page_size + 1), по которой определяется следующая страница.
+    Иначе выполняется точный подсчёт, результат которого кэшируется по ключу
+    cache_key на cache_timeout секунд.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        estimate_threshold=None,
+        cache_key=None,
+        cache_timeout=None,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.estimate_threshold = estimate_threshold
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+        self.is_approximate = False
+
+    @cached_property
+    def count(self):
+        if self.estimate_threshold is not None:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.is_approximate = True
+                return estimate
+
+        if self.cache_key is None:
+            return super().count
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.cache_timeout)
+        return count
+
+    def validate_number(self, number):
+        # count вычисляется первым: от него зависит is_approximate
+        if not (self.count and self.is_approximate):
+            return super().validate_number(number)
+        # Оценка может быть меньше реального количества, поэтому номер не
+        # сравнивается с num_pages: пустая страница определяется в page()
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page + 1
+        object_list = list(self.object_list[bottom:top])
+        if not object_list and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        return LookaheadPage(
+            object_list[: self.per_page],
+            number,
+            self,
+            has_next=len(object_list) > self.per_page,
+        )
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с оценочным и кэшируемым количеством записей.
+
+    В ответ добавляется признак count_is_approximate (countIsApproximate):
+    True, если count взят из статистики планировщика, а не посчитан точно.
+    Кэш точного количества привязан к поколению данных модели и нормализованному
+    набору фильтров (SQL выборки без сортировки) и работает при CACHE_ENABLED.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    @property
+    def count_estimate_threshold(self):
+        return getattr(settings, "PAGINATION_COUNT_ESTIMATE_THRESHOLD", 10000)
+
+    @property
+    def count_cache_timeout(self):
+        return getattr(settings, "PAGINATION_COUNT_CACHE_TIMEOUT", 60)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            type(self).django_paginator_class,
+            estimate_threshold=self.count_estimate_threshold,
+            cache_key=self.get_count_cache_key(queryset),
+            cache_timeout=self.count_cache_timeout,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_cache_key(self, queryset):
+        if not is_cache_enabled():
+            return None
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except exceptions.EmptyResultSet:
+            # Пустую выборку Django считает без запроса к БД - кэш не нужен
+            return None
+        return make_cache_key("count", queryset.model, sql, params)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_approximate": self.page.paginator.is_approximate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset / cursor) для бесконечной ленты.
+
+    Вместо OFFSET страница выбирается условием по составному ключу сортировки,
+    поэтому каждая страница - это диапазонное чтение по составному индексу
+    независимо от глубины пролистывания. Ключ берётся из сортировки выборки
+    (например, ?ordering=price даёт ключ (price, id)), без сортировки -
+    ordering по убыванию. Курсор непрозрачен для клиента: это base64 от
+    позиции на границе страницы и ключа, для которого она построена.
+    """
+
+    page_size = 4
+    page_size_query_param = "page_size"
+    max_page_size = 4
+    cursor_query_param = "cursor"
+    # Ключ сортировки выборки без order_by, все поля по убыванию (новые выше)
+    ordering = ("created_at", "id")
+    invalid_cursor_message = "Неверный курсор."
+    invalid_ordering_message = "Эта сортировка не поддерживается в режиме курсора."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.key = self.get_ordering(queryset)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        if reverse:
+            queryset = queryset.order_by(*[self._flip(field) for field in self.key])
+        else:
+            queryset = queryset.order_by(*self.key)
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(position, reverse))
+
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли продолжение
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.first_position = self._get_position(results[0]) if results else None
+        self.last_position = self._get_position(results[-1]) if results else None
+        if not results:
+            self.has_next = self.has_previous = False
+        return results
+
+    def get_ordering(self, queryset) -> tuple[str, ...]:
+        """
+        Ключ пагинации из сортировки выборки ("-created_at", "-id").
+
+        Допускаются только обязательные (не NULL) поля модели; первичный ключ
+        добавляется в конец, если его нет, чтобы порядок был однозначным.
+
+        Raises:
+            ValidationError: Сортировка по аннотации или выражению (например,
+                по релевантности ?search=) или по полю, допускающему NULL
+        """
+        order_by = queryset.query.order_by
+        if not order_by:
+            return tuple(f"-{field}" for field in self.ordering)
+
+        opts = queryset.model._meta
+        key = []
+        for item in order_by:
+            if not isinstance(item, str):
+                raise ValidationError({"ordering": self.invalid_ordering_message})
+            descending = item.startswith("-")
+            name = item.lstrip("-")
+            try:
+                field = opts.pk if name == "pk" else opts.get_field(name)
+            except exceptions.FieldDoesNotExist:
+                raise ValidationError({"ordering": self.invalid_ordering_message})
+            if field.is_relation or field.null or not field.concrete:
+                raise ValidationError({"ordering": self.invalid_ordering_message})
+            key.append(f"-{field.name}" if descending else field.name)
+            if field.primary_key:
+                break
+        else:
+            key.append(f"-{opts.pk.name}" if key[-1].startswith("-") else opts.pk.name)
+        return tuple(key)
+
+    @property
+    def key_fields(self) -> list[str]:
+        return [field.lstrip("-") for field in self.key]
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({"p": position, "r": int(reverse), "k": self.key})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model=None):
+        """
+        Возвращает позицию (значения полей ключа) и направление из курсора.
+
+        Курсор приходит от клиента, поэтому каждое значение позиции
+        приводится к типу поля модели (to_python): подделанный курсор
+        даёт 404, а не ошибку при построении запроса.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            position, reverse = payload["p"], bool(payload["r"])
+            key = payload["k"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # Курсор другой сортировки (ordering изменили, а cursor оставили)
+        if key != list(self.key):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.key):
+            raise NotFound(self.invalid_cursor_message)
+        if model is not None:
+            try:
+                position = [
+                    self._parse_value(model._meta.get_field(field), value)
+                    for field, value in zip(self.key_fields, position)
+                ]
+            except (exceptions.ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def _parse_value(field, value):
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError(value)
+        return field.to_python(value)
+
+    def _get_position(self, instance):
+        position = []
+        for field in self.key_fields:
+            # Страница может состоять из строк QuerySet.values()
+            if isinstance(instance, dict):
+                value = instance[field]
+            else:
+                value = getattr(instance, field)
+            position.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return position
+
+    def _position_filter(self, position, reverse):
+        # (a, b) < (x, y)  =>  a < x OR (a = x AND b < y); направление сравнения
+        # задаётся для каждого поля ключа отдельно
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.key, position):
+            descending = field.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            name = field.lstrip("-")
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+
+class PaginationModeMixin:
+    """
+    Позволяет списку переключаться между постраничной пагинацией и пагинацией
+    по курсору: режим курсора включается параметром ?pagination=cursor
+    (ссылки next/previous в этом режиме содержат параметр cursor).
+    """
+
+    cursor_pagination_class = None
+    pagination_mode_query_param = "pagination"
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.cursor_pagination_class is not None and self.is_cursor_mode():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def is_cursor_mode(self):
+        # При генерации схемы API запроса может не быть
+        if getattr(self, "request", None) is None:
+            return False
+        query_params = self.request.query_params
+        return (
+            query_params.get(self.pagination_mode_query_param) == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in query_params
+        )
@@ -0,0 +1,78 @@
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from djangorestframework_camel_case import parser, util
+from rest_framework.exceptions import ParseError
+
+from config.renderers import SCALAR_TYPES
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен: без него JSON разбирает stdlib json
+    orjson = None
+
+
+@lru_cache(maxsize=4096)
+def underscoreize_key(key: str, no_underscore_before_number: bool = False) -> str:
+    """
+    camelCase -> snake_case для одного ключа (как в djangorestframework_camel_case).
+
+    Библиотека компилирует регулярное выражение при каждом вызове; здесь
+    результат для каждого ключа вычисляется один раз.
+    """
+    return util.camel_to_underscore(
+        key, no_underscore_before_number=no_underscore_before_number
+    )
+
+
+def underscoreize(data, no_underscore_before_number: bool = False):
+    """
+    Преобразует ключи разобранного JSON в snake_case с тем же результатом, что и
+    djangorestframework_camel_case.util.underscoreize.
+    """
+    if isinstance(data, dict):
+        return {
+            (
+                underscoreize_key(key, no_underscore_before_number)
+                if isinstance(key, str)
+                else key
+            ): (
+                value
+                if isinstance(value, SCALAR_TYPES)
+                else underscoreize(value, no_underscore_before_number)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [
+            (
+                item
+                if isinstance(item, SCALAR_TYPES)
+                else underscoreize(item, no_underscore_before_number)
+            )
+            for item in data
+        ]
+    return data
+
+
+class CamelCaseJSONParser(parser.CamelCaseJSONParser):
+    """
+    CamelCaseJSONParser с кэшем преобразования ключей и разбором orjson.
+
+    При заданных ignore_fields / ignore_keys используется исходный парсер.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        options = self.json_underscoreize
+        if options.get("ignore_fields") or options.get("ignore_keys"):
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read().decode(encoding)
+            data = orjson.loads(content) if orjson else json.loads(content)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+        return underscoreize(data, bool(options.get("no_underscore_before_number")))
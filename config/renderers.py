@@ -0,0 +1,103 @@
+from functools import lru_cache
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case import render, util
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен: без него JSON кодирует stdlib json
+    orjson = None
+
+# Типы, которые не нужно обходить при преобразовании ключей
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=4096)
+def camelize_key(key: str) -> str:
+    """
+    snake_case -> camelCase для одного ключа (как в djangorestframework_camel_case).
+
+    Ключи ответов - это в основном имена полей сериализаторов, поэтому карта
+    ключей быстро заполняется и регулярное выражение для каждого ключа каждой
+    строки ответа больше не выполняется.
+    """
+    return util.camelize_re.sub(util.underscore_to_camel, key) if "_" in key else key
+
+
+def camelize(data):
+    """
+    Преобразует ключи словарей в camelCase с тем же результатом, что и
+    djangorestframework_camel_case.util.camelize, используя кэш camelize_key.
+    """
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if isinstance(key, str):
+                key = camelize_key(key)
+            result[key] = value if isinstance(value, SCALAR_TYPES) else camelize(value)
+        return result
+    if isinstance(data, list):
+        return [
+            item if isinstance(item, SCALAR_TYPES) else camelize(item) for item in data
+        ]
+    if isinstance(data, SCALAR_TYPES):
+        return data
+    # Ленивые строки, кортежи, генераторы и прочие итерируемые - как в библиотеке
+    return util.camelize(data)
+
+
+class CamelCaseJSONRenderer(render.CamelCaseJSONRenderer):
+    """
+    CamelCaseJSONRenderer с кэшем преобразования ключей и кодированием orjson.
+
+    Вывод совпадает с djangorestframework_camel_case: компактный JSON без
+    экранирования не-ASCII символов, U+2028 и U+2029 экранируются, даты и
+    прочие не-JSON типы кодируются JSONEncoder DRF. Для ответов с отступами
+    (indent в Accept), при заданных ignore_fields / ignore_keys и для значений,
+    которые orjson не кодирует, используется исходный рендерер.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        underscoreize = self.json_underscoreize
+        if (
+            indent is not None
+            or underscoreize.get("ignore_fields")
+            or underscoreize.get("ignore_keys")
+            or not self.compact
+            or self.ensure_ascii
+            or not api_settings.STRICT_JSON
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        data = camelize(data)
+        if orjson is None:
+            return super(render.CamelCaseJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые числа больше 64 бит
+            return super(render.CamelCaseJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context
+            )
+        return content.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
@@ -0,0 +1,113 @@
+import base64
+
+from django.conf import settings
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from config.storage import content_hash, hashed_name, is_protected
+
+
+class S3ContentAddressedStorage(S3Storage):
+    """
+    S3-совместимое хранилище изображений (AWS S3, MinIO) с теми же именами
+    файлов, что и у ContentAddressedStorage: <каталог>/ab/cd/<sha256><расширение>.
+
+    Кроме обычного сохранения через Django поддерживает прямую загрузку:
+    клиент получает подписанный запрос PUT (presigned_upload) и отправляет
+    файл сразу в хранилище, минуя gunicorn и nginx. Подключается через
+    MEDIA_STORAGE_BACKEND; требует boto3 и django-storages.
+    """
+
+    def _save(self, name, content):
+        name = hashed_name(name, content_hash(content))
+        if self.exists(name):
+            self._touch(name)
+            return name
+        return super()._save(name, content)
+
+    def _touch(self, name: str) -> None:
+        """
+        Обновляет LastModified объекта копированием в самого себя.
+
+        Как и os.utime в ContentAddressedStorage, защищает повторно загруженный
+        файл от сборки мусора, пока ссылка на него ещё не сохранена. S3 не
+        копирует объект в себя без изменения метаданных, поэтому они
+        передаются заново (MetadataDirective=REPLACE).
+        """
+        key = self._normalize_name(clean_name(name))
+        client = self.connection.meta.client
+        head = client.head_object(Bucket=self.bucket_name, Key=key)
+        params = {"ContentType": head.get("ContentType", "binary/octet-stream")}
+        if "CacheControl" in head:
+            params["CacheControl"] = head["CacheControl"]
+        client.copy_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            CopySource={"Bucket": self.bucket_name, "Key": key},
+            Metadata=head.get("Metadata", {}),
+            MetadataDirective="REPLACE",
+            **params,
+        )
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        """
+        Публичные изображения отдаются по постоянной ссылке (AWS_QUERYSTRING_AUTH
+        = False), защищённые (MEDIA_PROTECTED_PREFIXES) - по подписанной ссылке
+        со сроком действия MEDIA_SIGNED_URL_MAX_AGE.
+        """
+        if self.querystring_auth or not is_protected(name):
+            return super().url(name, parameters, expire, http_method)
+        params = {
+            **(parameters or {}),
+            "Bucket": self.bucket_name,
+            "Key": self._normalize_name(clean_name(name)),
+        }
+        return self.connection.meta.client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=expire or settings.MEDIA_SIGNED_URL_MAX_AGE,
+            HttpMethod=http_method,
+        )
+
+    def presigned_upload(
+        self, name: str, sha256: str, content_type: str, size: int, expire: int
+    ) -> dict:
+        """
+        Подписанный запрос PUT для прямой загрузки файла в хранилище.
+
+        В подпись входят заголовки x-amz-checksum-sha256 и Content-Length:
+        хранилище отклонит файл, содержимое или размер которого не совпадает с
+        заявленными, поэтому имя объекта остаётся хэшем его содержимого, а
+        размер не превышает проверенный при выдаче ссылки.
+        Args:
+            name(str): Имя файла в хранилище (hashed_name)
+            sha256(str): SHA-256 содержимого файла (hex)
+            content_type(str): MIME-тип файла
+            size(int): Размер файла (байты)
+            expire(int): Срок действия ссылки (секунды)
+
+        Returns:
+            dict: Метод, URL и заголовки, которые клиент должен отправить
+        """
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        params = {
+            "Bucket": self.bucket_name,
+            "Key": self._normalize_name(clean_name(name)),
+            "ContentType": content_type,
+            "ContentLength": size,
+            "ChecksumSHA256": checksum,
+        }
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(size),
+            "x-amz-checksum-sha256": checksum,
+        }
+        cache_control = self.object_parameters.get("CacheControl")
+        if cache_control:
+            params["CacheControl"] = cache_control
+            headers["Cache-Control"] = cache_control
+
+        url = self.connection.meta.client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=expire, HttpMethod="PUT"
+        )
+        return {"method": "PUT", "url": url, "headers": headers}
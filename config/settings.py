@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "crispy_forms",
     "crispy_bootstrap4",
     "django_celery_beat",
@@ -46,11 +47,12 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
     "DEFAULT_RENDERER_CLASSES": (
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        # camelCase с кэшем ключей и кодированием orjson (config/renderers.py)
+        "config.renderers.CamelCaseJSONRenderer",
         "djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer",
     ),
     "DEFAULT_PARSER_CLASSES": (
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
+        "config.parsers.CamelCaseJSONParser",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -146,6 +148,44 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+    # Изображения объявлений и аватары: имя файла - хэш содержимого,
+    # одинаковые загрузки хранятся одним файлом
+    "media": {
+        "BACKEND": os.getenv(
+            "MEDIA_STORAGE_BACKEND", "config.storage.ContentAddressedStorage"
+        )
+    },
+}
+# Настройки S3-совместимого хранилища (MEDIA_STORAGE_BACKEND =
+# config.s3.S3ContentAddressedStorage): AWS S3 или MinIO (AWS_S3_ENDPOINT_URL)
+AWS_STORAGE_BUCKET_NAME = os.getenv("AWS_STORAGE_BUCKET_NAME")
+AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")
+AWS_S3_REGION_NAME = os.getenv("AWS_S3_REGION_NAME")
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_S3_SIGNATURE_VERSION = "s3v4"
+# Публичные изображения доступны по постоянным ссылкам, защищённые -
+# по подписанным (config/s3.py)
+AWS_QUERYSTRING_AUTH = False
+# Файлы с хэшем в имени не изменяются и кэшируются бессрочно
+AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "public, max-age=31536000, immutable"}
+# Срок действия подписанного запроса на прямую загрузку в хранилище (секунды)
+MEDIA_DIRECT_UPLOAD_EXPIRE = int(os.getenv("MEDIA_DIRECT_UPLOAD_EXPIRE", 900))
+# Файлы хранилища media, изменённые за этот период, не удаляются сборкой мусора
+MEDIA_GC_GRACE_PERIOD = timedelta(hours=1)
+# Файлы media с этими префиксами отдаются только по подписанной ссылке:
+# nginx передаёт запрос Django, который проверяет подпись и возвращает
+# X-Accel-Redirect на internal - location MEDIA_ACCEL_REDIRECT_PREFIX
+MEDIA_PROTECTED_PREFIXES = ("users/",)
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+# Срок действия подписанной ссылки на защищённый файл (секунды)
+MEDIA_SIGNED_URL_MAX_AGE = int(os.getenv("MEDIA_SIGNED_URL_MAX_AGE", 3600))
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST")
 EMAIL_PORT = os.getenv("EMAIL_PORT")
@@ -173,6 +213,19 @@ if CACHE_ENABLED:
         }
     }
 
+# Начиная с этой оценки планировщика списки возвращают приблизительный count
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = int(
+    os.getenv("PAGINATION_COUNT_ESTIMATE_THRESHOLD", 10000)
+)
+# Время жизни кэша точного количества записей в списках (секунды)
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv("PAGINATION_COUNT_CACHE_TIMEOUT", 60))
+
+# Время жизни кэша страниц публичного списка объявлений (секунды)
+LIST_CACHE_TIMEOUT = int(os.getenv("LIST_CACHE_TIMEOUT", 300))
+
+# Границы ценовых корзин для фасетов списка объявлений (?facets=price)
+ADS_PRICE_FACET_BOUNDS = (0, 1000, 5000, 10000, 50000, 100000, 500000)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -180,6 +233,46 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = "users.User"
 
+# Поисковый движок объявлений (?search=): ads.search.DatabaseSearchBackend
+# (PostgreSQL / SQL) или ads.search_index.InvertedIndexSearchBackend (индекс в памяти)
+ADS_SEARCH_BACKEND = os.getenv("ADS_SEARCH_BACKEND", "ads.search.DatabaseSearchBackend")
+
+# Период полного перестроения инвертированного индекса поиска, секунды
+ADS_SEARCH_INDEX_REBUILD_INTERVAL = int(
+    os.getenv("ADS_SEARCH_INDEX_REBUILD_INTERVAL", 300)
+)
+
+# Период полного перестроения подсказок автодополнения (/ads/suggest/), секунды
+ADS_SUGGEST_REBUILD_INTERVAL = int(os.getenv("ADS_SUGGEST_REBUILD_INTERVAL", 300))
+
+# Порог сходства по триграммам для нечёткого поиска объявлений (?fuzzy=)
+ADS_TRIGRAM_SIMILARITY_THRESHOLD = float(
+    os.getenv("ADS_TRIGRAM_SIMILARITY_THRESHOLD", 0.3)
+)
+
+# Файл с дополнительными запрещенными словами для отзывов (по слову в строке)
+REVIEW_FORBIDDEN_WORDS_FILE = os.getenv("REVIEW_FORBIDDEN_WORDS_FILE")
+# Период принудительного перестроения автомата запрещенных слов, секунды
+REVIEW_FORBIDDEN_WORDS_RELOAD_INTERVAL = int(
+    os.getenv("REVIEW_FORBIDDEN_WORDS_RELOAD_INTERVAL", 300)
+)
+
+# Ширина вариантов изображений (px), которые генерируются после загрузки
+# (WebP и JPEG для каждого размера; изображение не увеличивается)
+IMAGE_VARIANT_WIDTHS = {"thumb": 200, "card": 400, "large": 1200}
+# Максимальное разрешение загружаемых изображений (пикселей): проверяется по
+# заголовку файла до декодирования (защита от decompression bomb)
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 24_000_000))
+# Качество сжатия вариантов изображений
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", 80))
+
+# Каталог для частично загруженных файлов (вне MEDIA_ROOT - не раздаётся)
+UPLOAD_SESSION_ROOT = os.getenv("UPLOAD_SESSION_ROOT", BASE_DIR / "uploads")
+# Максимальный размер одной части загрузки (не больше client_max_body_size nginx)
+UPLOAD_CHUNK_MAX_SIZE = 1024 * 1024
+# Время жизни незавершённой сессии загрузки
+UPLOAD_SESSION_TTL = timedelta(hours=24)
+
 # Настройки для Celery
 
 # URL-адрес брокера сообщений (Например, Redis,
@@ -214,6 +307,16 @@ CELERY_RESULT_SERIALIZER = "json"
 # "schedule": crontab(hour=8, minute=0),  # Ежедневно в 8:00 утра
 # },
 # }
+CELERY_BEAT_SCHEDULE = {
+    "clear-expired-upload-sessions": {
+        "task": "ads.tasks.clear_expired_upload_sessions",
+        "schedule": timedelta(hours=1),
+    },
+    "collect-media-garbage": {
+        "task": "ads.tasks.collect_media_garbage",
+        "schedule": timedelta(days=1),
+    },
+}
 
 
 # Разрешаем CORS для localhost на разных портах
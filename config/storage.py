@@ -0,0 +1,101 @@
+import hashlib
+import os
+import posixpath
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, storages
+from django.db.models import FileField
+from django.utils import timezone
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, в котором имя файла - это SHA-256 его содержимого.
+
+    Файл сохраняется как <каталог upload_to>/ab/cd/<sha256><расширение>.
+    Повторная загрузка того же содержимого не создаёт копию: возвращается имя
+    уже существующего файла, и записи ссылаются на один файл. Файлы не
+    изменяются после записи, поэтому их можно кэшировать бессрочно.
+    Удаляются они только когда на них не осталось ссылок (release_image,
+    collect_media_garbage).
+    """
+
+    def _save(self, name, content):
+        name = hashed_name(name, content_hash(content))
+        if self.exists(name):
+            # Обновляем время изменения: недавно использованный файл не будет
+            # удалён сборкой мусора, даже если ссылка на него ещё не сохранена
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
+
+
+def content_hash(content) -> str:
+    """
+    SHA-256 содержимого файла (hex), вычисляемый по частям.
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_name(name: str, sha256: str) -> str:
+    """
+    Имя файла в хранилище по хэшу содержимого: <каталог>/ab/cd/<sha256><расширение>.
+    """
+    extension = os.path.splitext(name)[1].lower()
+    return posixpath.join(
+        posixpath.dirname(name), sha256[:2], sha256[2:4], f"{sha256}{extension}"
+    )
+
+
+def is_protected(name: str) -> bool:
+    """
+    Проверяет, требует ли файл подписанной ссылки (MEDIA_PROTECTED_PREFIXES).
+    """
+    return name.startswith(tuple(settings.MEDIA_PROTECTED_PREFIXES))
+
+
+def get_media_storage():
+    """
+    Хранилище загружаемых изображений (STORAGES["media"]).
+    """
+    return storages["media"]
+
+
+def get_file_fields(storage):
+    """
+    Возвращает пары (модель, поле) для всех файловых полей, хранящихся в storage.
+    """
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and field.storage is storage:
+                yield model, field
+
+
+def is_referenced(storage, name: str) -> bool:
+    """
+    Проверяет, ссылается ли на файл хотя бы одна запись (подсчёт ссылок
+    выполняется по индексированным файловым полям, а не отдельным счётчиком).
+    """
+    return any(
+        model._default_manager.filter(**{field.name: name}).exists()
+        for model, field in get_file_fields(storage)
+    )
+
+
+def is_recent(storage, name: str) -> bool:
+    """
+    Проверяет, изменялся ли файл в течение MEDIA_GC_GRACE_PERIOD.
+
+    Такие файлы не удаляются: их могли только что загрузить повторно, а
+    запись со ссылкой на них ещё не сохранена.
+    """
+    try:
+        modified = storage.get_modified_time(name)
+    except (FileNotFoundError, NotImplementedError):
+        return False
+    # get_modified_time и timezone.now учитывают USE_TZ одинаково
+    return timezone.now() - modified < settings.MEDIA_GC_GRACE_PERIOD
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -11,6 +11,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from config.media import protected_media
+
 # from users.permissions import CanViewAPI
 
 schema_view = get_schema_view(
@@ -31,6 +33,8 @@ urlpatterns = [
     path("users/", include("users.urls", namespace="users")),
     path("ads/", include("ads.urls", namespace="ads")),
     path("reviews/", include("reviews.urls", namespace="reviews")),
+    # Защищённые файлы (MEDIA_PROTECTED_PREFIXES): проверка подписи ссылки
+    re_path(r"^media/(?P<path>users/.+)$", protected_media, name="protected-media"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from reviews.models import Review
+from reviews.models import ForbiddenWord, Review
 
 
 @admin.register(Review)
@@ -10,3 +10,9 @@ class ReviewAdmin(admin.ModelAdmin):
         "id",
         "-created_at",
     )
+
+
+@admin.register(ForbiddenWord)
+class ForbiddenWordAdmin(admin.ModelAdmin):
+    list_display = ("word", "created_at")
+    search_fields = ("word",)
@@ -0,0 +1,124 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Subquery, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ads.models import Ad
+from config.cache import bump_generation
+from reviews.models import Review
+
+
+def _latest_review_subquery():
+    return Subquery(
+        Review.objects.filter(ad=OuterRef("pk"))
+        .order_by("-created_at")
+        .values("created_at")[:1]
+    )
+
+
+def review_added(review) -> None:
+    """
+    Учитывает новый отзыв в счётчиках объявления одним UPDATE с F().
+
+    Вызывается в транзакции создания отзыва, поэтому счётчик и отзыв
+    фиксируются вместе.
+    Args:
+        review(Review): Созданный отзыв
+    """
+    Ad.objects.filter(pk=review.ad_id).update(
+        review_count=F("review_count") + 1,
+        last_reviewed_at=Case(
+            When(last_reviewed_at__gte=review.created_at, then=F("last_reviewed_at")),
+            default=Value(review.created_at),
+        ),
+        updated_at=timezone.now(),
+    )
+    bump_generation(Ad)
+
+
+def reviews_removed(ad_ids) -> None:
+    """
+    Учитывает удалённые отзывы в счётчиках объявлений.
+
+    Вызывается после удаления отзывов в той же транзакции: дата последнего
+    отзыва пересчитывается подзапросом по оставшимся отзывам.
+    Args:
+        ad_ids: id объявлений удалённых отзывов (по одному на отзыв)
+    """
+    removed = Counter(ad_ids)
+    if not removed:
+        return
+    # Один UPDATE на каждое различное количество удалённых отзывов
+    by_amount = {}
+    for ad_id, amount in removed.items():
+        by_amount.setdefault(amount, []).append(ad_id)
+    now = timezone.now()
+    for amount, ids in by_amount.items():
+        Ad.objects.filter(pk__in=ids).update(
+            review_count=Greatest(F("review_count") - amount, Value(0)),
+            last_reviewed_at=_latest_review_subquery(),
+            updated_at=now,
+        )
+    bump_generation(Ad)
+
+
+def reconcile_review_counters(batch_size: int = 1000, dry_run: bool = False) -> int:
+    """
+    Исправляет расхождения счётчиков отзывов с таблицей отзывов.
+
+    Объявления обходятся пачками по первичному ключу; фактические значения
+    считаются одним агрегирующим запросом на пачку. Строка обновляется только
+    если её счётчики не изменились после чтения, поэтому параллельно
+    созданные отзывы не теряются (такая строка будет исправлена при
+    следующем запуске).
+    Args:
+        batch_size(int): Количество объявлений в пачке
+        dry_run(bool): Только подсчитать расхождения
+
+    Returns:
+        int: Количество исправленных объявлений
+    """
+    fixed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            Ad.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .annotate(
+                actual_count=Count("reviews"),
+                actual_last=Max("reviews__created_at"),
+            )
+            .values(
+                "pk", "review_count", "last_reviewed_at", "actual_count", "actual_last"
+            )[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1]["pk"]
+
+        stale = [
+            row
+            for row in batch
+            if (row["review_count"], row["last_reviewed_at"])
+            != (row["actual_count"], row["actual_last"])
+        ]
+        if dry_run:
+            fixed += len(stale)
+            continue
+        now = timezone.now()
+        with transaction.atomic():
+            for row in stale:
+                fixed += Ad.objects.filter(
+                    pk=row["pk"],
+                    review_count=row["review_count"],
+                    last_reviewed_at=row["last_reviewed_at"],
+                ).update(
+                    review_count=row["actual_count"],
+                    last_reviewed_at=row["actual_last"],
+                    updated_at=now,
+                )
+    if fixed and not dry_run:
+        bump_generation(Ad)
+    return fixed
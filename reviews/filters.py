@@ -0,0 +1,16 @@
+import django_filters
+
+from reviews.models import Review
+
+
+class ReviewFilter(django_filters.FilterSet):
+    """
+    Фильтр отзывов по объявлению и автору.
+    """
+
+    ad = django_filters.NumberFilter(field_name="ad_id", label="Объявление")
+    author = django_filters.NumberFilter(field_name="author_id", label="Автор")
+
+    class Meta:
+        model = Review
+        fields = ["ad", "author"]
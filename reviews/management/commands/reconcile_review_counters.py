@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from reviews.counters import reconcile_review_counters
+
+
+class Command(BaseCommand):
+    help = "Repair drift between Ad review counters and the reviews table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество объявлений, проверяемых одним запросом",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только подсчитать объявления с расхождениями",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_review_counters(
+            batch_size=max(1, options["batch_size"]), dry_run=options["dry_run"]
+        )
+        self.stdout.write(f"Исправлено объявлений: {fixed}")
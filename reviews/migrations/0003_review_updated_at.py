@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0002_review_reviews_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="Обновляется при каждом сохранении отзыва",
+                verbose_name="Дата и время изменения",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0010_review_counters"),
+        ("reviews", "0003_review_updated_at"),
+    ]
+
+    operations = [
+        # Сначала создаём составной индекс, затем удаляем индекс ad_id
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["ad", "-created_at", "-id"], name="reviews_ad_created_id_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="ad",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Объявление, под которым оставлен отзыв",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reviews",
+                to="ads.ad",
+                verbose_name="Объявление",
+            ),
+        ),
+    ]
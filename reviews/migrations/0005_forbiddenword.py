@@ -0,0 +1,47 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0004_review_ad_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ForbiddenWord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "word",
+                    models.CharField(
+                        help_text="Отзывы, содержащие это слово (в любом регистре), отклоняются",
+                        max_length=100,
+                        unique=True,
+                        verbose_name="Слово",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата и время добавления"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запрещенное слово",
+                "verbose_name_plural": "Запрещенные слова",
+                "ordering": ["word"],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0005_forbiddenword"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="forbiddenword",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="По нему процессы определяют, что список слов изменился",
+                verbose_name="Дата и время изменения",
+            ),
+        ),
+    ]
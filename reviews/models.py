@@ -15,6 +15,7 @@ class Review(models.Model):
         author (ForeignKey): Пользователь, оставивший отзыв.
         ad (ForeignKey): Объявление, под которым оставлен отзыв.
         created_at (DateTimeField): Дата и время создания отзыва.
+        updated_at (DateTimeField): Дата и время последнего изменения отзыва.
     """
 
     text = models.TextField(
@@ -32,6 +33,8 @@ class Review(models.Model):
     ad = models.ForeignKey(
         Ad,
         on_delete=models.CASCADE,
+        # Поиск по ad_id обслуживает составной индекс reviews_ad_created_id_idx
+        db_index=False,
         verbose_name="Объявление",
         help_text="Объявление, под которым оставлен отзыв",
         related_name="reviews",
@@ -41,6 +44,11 @@ class Review(models.Model):
         verbose_name="Дата и время создания",
         help_text="Укажите дату и время создания отзыва",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата и время изменения",
+        help_text="Обновляется при каждом сохранении отзыва",
+    )
 
     def clean(self):
         """
@@ -80,3 +88,47 @@ created_at={self.created_at})"""
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ["-created_at"]
+        indexes = [
+            # Ключ пагинации по курсору (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="reviews_created_id_idx"),
+            # Лента отзывов одного объявления: диапазон по (ad_id, created_at, id)
+            models.Index(
+                fields=["ad", "-created_at", "-id"], name="reviews_ad_created_id_idx"
+            ),
+        ]
+
+
+class ForbiddenWord(models.Model):
+    """
+    Запрещенное слово для модерации отзывов (дополняет
+    ReviewValidator.FORBIDDEN_WORDS и файл REVIEW_FORBIDDEN_WORDS_FILE).
+
+    Атрибуты:
+        word (str): Слово или фраза.
+        created_at (DateTimeField): Дата и время добавления.
+        updated_at (DateTimeField): Дата и время последнего изменения.
+    """
+
+    word = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Слово",
+        help_text="Отзывы, содержащие это слово (в любом регистре), отклоняются",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата и время добавления",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата и время изменения",
+        help_text="По нему процессы определяют, что список слов изменился",
+    )
+
+    def __str__(self) -> str:
+        return self.word
+
+    class Meta:
+        verbose_name = "Запрещенное слово"
+        verbose_name_plural = "Запрещенные слова"
+        ordering = ["word"]
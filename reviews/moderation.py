@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from config.cache import get_generation, is_cache_enabled
+
+# Встроенный список запрещенных слов (дополняется файлом и таблицей ForbiddenWord)
+DEFAULT_FORBIDDEN_WORDS = ("спам", "реклама", "оскорбление")
+
+# Окончания, которые отбрасываются у запрещенного слова: поиск идёт по
+# подстроке, поэтому основа "реклам" находит "рекламу", "рекламой" и т.д.
+ENDINGS = sorted(
+    (
+        "иями", "ями", "ами", "ией", "ием", "иях", "ого", "его", "ому", "ему",
+        "ыми", "ими", "ая", "яя", "ое", "ее", "ые", "ие", "ый", "ий", "ой", "ей",
+        "ом", "ем", "ам", "ям", "ах", "ях", "ов", "ев", "ию", "ия", "ью",
+        "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+    ),  # fmt: skip
+    key=len,
+    reverse=True,
+)
+# Короткие слова не сокращаются, чтобы основа не совпадала со случайными словами
+MIN_STEM_LENGTH = 4
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит текст к виду для сравнения: без учёта регистра, ё = е.
+    """
+    return text.casefold().replace("ё", "е")
+
+
+def stem(word: str) -> str:
+    """
+    Отбрасывает одно окончание у нормализованного слова (для фразы - у
+    последнего слова), если остаётся не меньше MIN_STEM_LENGTH символов.
+    """
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word.removesuffix(ending)
+    return word
+
+
+class ForbiddenWordsMatcher:
+    """
+    Автомат Ахо - Корасик для поиска запрещенных слов за один проход по тексту.
+
+    Основы всех слов (normalize + stem) хранятся в префиксном дереве со
+    ссылками на наибольший собственный суффикс, поэтому время поиска зависит
+    от длины текста, а не от количества слов в списке. Автомат строится один
+    раз для списка слов и только читается, поэтому его можно использовать из
+    нескольких потоков.
+    """
+
+    def __init__(self, words):
+        # Переходы, суффиксные ссылки и найденное слово для каждого узла
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        for word in words:
+            pattern = stem(normalize(word.strip()))
+            if pattern:
+                self._add(pattern, word.strip())
+        self._link()
+
+    def _add(self, pattern: str, word: str) -> None:
+        node = 0
+        for char in pattern:
+            child = self.goto[node].get(char)
+            if child is None:
+                child = len(self.goto)
+                self.goto[node][char] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+            node = child
+        if self.output[node] is None:
+            self.output[node] = word
+
+    def _link(self) -> None:
+        # Обход в ширину: суффиксная ссылка узла ведёт на более мелкий узел,
+        # который к этому моменту уже обработан
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.output[child] is None:
+                    self.output[child] = self.output[self.fail[child]]
+
+    def find(self, text: str) -> str | None:
+        """
+        Возвращает первое (по позиции в тексте) запрещенное слово в исходном
+        написании из списка или None.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for char in normalize(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node] is not None:
+                return output[node]
+        return None
+
+
+class ForbiddenWords:
+    """
+    Автоматы запрещенных слов процесса.
+
+    Список собирается из встроенных слов (ReviewValidator.FORBIDDEN_WORDS),
+    файла REVIEW_FORBIDDEN_WORDS_FILE (по слову в строке, # - комментарий) и
+    таблицы ForbiddenWord. Автомат перестраивается без перезапуска воркеров,
+    как только меняется версия списка: время изменения файла и состояние
+    таблицы. Состояние таблицы - поколение данных в общем кэше (при
+    CACHE_ENABLED) или количество строк и последнее время изменения (один
+    агрегирующий запрос по небольшой таблице). Кроме того, автомат
+    перестраивается не реже, чем раз в reload_interval секунд.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Встроенные слова -> (версия, время построения, автомат)
+        self.matchers = {}
+
+    @property
+    def reload_interval(self):
+        return getattr(settings, "REVIEW_FORBIDDEN_WORDS_RELOAD_INTERVAL", 300)
+
+    @property
+    def path(self):
+        return getattr(settings, "REVIEW_FORBIDDEN_WORDS_FILE", None)
+
+    def get_version(self) -> tuple:
+        from reviews.models import ForbiddenWord
+
+        path = self.path
+        try:
+            mtime = os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            mtime = None
+        if is_cache_enabled():
+            table = get_generation(ForbiddenWord)
+        else:
+            table = tuple(
+                ForbiddenWord.objects.aggregate(
+                    count=Count("pk"), updated_at=Max("updated_at")
+                ).values()
+            )
+        return path, mtime, table
+
+    def load_words(self, words=DEFAULT_FORBIDDEN_WORDS) -> list[str]:
+        from reviews.models import ForbiddenWord
+
+        words = list(words)
+        if self.path:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    lines = [line.strip() for line in file]
+            except OSError:
+                lines = []
+            words.extend(line for line in lines if line and not line.startswith("#"))
+        words.extend(ForbiddenWord.objects.values_list("word", flat=True))
+        return words
+
+    def get_matcher(self, words=DEFAULT_FORBIDDEN_WORDS) -> ForbiddenWordsMatcher:
+        """
+        Автомат для встроенных слов words и слов из файла и таблицы.
+        """
+        words = tuple(words)
+        version = self.get_version()
+        with self.lock:
+            cached_version, built_at, matcher = self.matchers.get(
+                words, (None, 0.0, None)
+            )
+            expired = time.monotonic() - built_at > self.reload_interval
+            if matcher is None or expired or version != cached_version:
+                matcher = ForbiddenWordsMatcher(self.load_words(words))
+                self.matchers[words] = (version, time.monotonic(), matcher)
+            return matcher
+
+    def find(self, text: str, words=DEFAULT_FORBIDDEN_WORDS) -> str | None:
+        """
+        Возвращает первое запрещенное слово в тексте или None.
+        """
+        return self.get_matcher(words).find(text)
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.matchers.clear()
+
+
+forbidden_words = ForbiddenWords()
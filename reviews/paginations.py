@@ -1,7 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+from config.paginations import EstimatedCountPagination, KeysetPagination
 
 
-class ReviewPaginator(PageNumberPagination):
+class ReviewPaginator(EstimatedCountPagination):
     page_size = 4
     page_size_query_param = "page_size"
     max_page_size = 4
+
+
+class ReviewCursorPaginator(KeysetPagination):
+    page_size = 4
+    page_size_query_param = "page_size"
+    max_page_size = 4
+    ordering = ("created_at", "id")
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
 from ads.models import Ad
+from config.serializers import ExpandableFieldsSerializerMixin
 from reviews.models import Review
 from reviews.validators import ReviewValidator
+from users.serializers import AuthorSummarySerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(ExpandableFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Review.
     """
@@ -25,6 +27,8 @@ class ReviewSerializer(serializers.ModelSerializer):
             "ad",
             "created_at",
         )
+        # ?expand=author: автор объектом вместо id
+        expandable_fields = {"author": AuthorSummarySerializer}
 
     def validate(self, data):
         """
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.cache import bump_generation
+from reviews.models import ForbiddenWord, Review
+from reviews.moderation import forbidden_words
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, **kwargs):
+    """
+    Сбрасывает кэши, зависящие от таблицы отзывов.
+    """
+    bump_generation(Review)
+
+
+@receiver(post_save, sender=ForbiddenWord)
+@receiver(post_delete, sender=ForbiddenWord)
+def forbidden_word_changed(sender, **kwargs):
+    """
+    Перестраивает автомат запрещенных слов: в этом процессе сразу, в
+    остальных - по новому поколению данных в общем кэше.
+    """
+    bump_generation(ForbiddenWord)
+    forbidden_words.invalidate()
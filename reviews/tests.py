@@ -1,13 +1,23 @@
+import base64
+import io
 import json
+import os
+import tempfile
+from datetime import timedelta
 
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
 from ads.models import Ad
-from reviews.models import Review
+from reviews.models import ForbiddenWord, Review
+from reviews.moderation import ForbiddenWordsMatcher, forbidden_words
+from reviews.serializers import ReviewSerializer
 from reviews.validators import ReviewValidator
 from users.models import User
 
@@ -82,6 +92,29 @@ class ReviewTestCase(APITestCase):
         self.assertEqual(response_data["results"][1]["author"], self.user.id)
         self.assertEqual(response_data["results"][1]["ad"], self.ad.id)
 
+    def test_list_reviews_cursor_pagination(self):
+        """
+        Проверяет пагинацию отзывов по курсору.
+        """
+        reviews = [
+            Review.objects.create(text=f"review {i}", author=self.user, ad=self.ad)
+            for i in range(5)
+        ]
+
+        url = reverse("reviews:review-list")
+        response_data = self.client.get(url, {"pagination": "cursor"}).json()
+
+        self.assertEqual(
+            [review["id"] for review in response_data["results"]],
+            [review.id for review in reversed(reviews[1:])],
+        )
+
+        response_data = self.client.get(response_data["next"]).json()
+        self.assertEqual(
+            [review["id"] for review in response_data["results"]], [reviews[0].id]
+        )
+        self.assertIsNone(response_data["next"])
+
     def test_retrieve_review(self):
         """
         Проверяет получение одного отзыва.
@@ -102,6 +135,23 @@ class ReviewTestCase(APITestCase):
         self.assertEqual(response_data["author"], self.user.id)
         self.assertEqual(response_data["ad"], self.ad.id)
 
+    def test_retrieve_review_conditional_get(self):
+        """
+        Проверяет ответ 304 на условный запрос неизменённого отзыва.
+        """
+        review = Review.objects.create(text="Test review", author=self.user, ad=self.ad)
+        url = reverse("reviews:review-retrieve", kwargs={"pk": review.pk})
+
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        review.text = "Updated review"
+        review.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["text"], "Updated review")
+
     def test_retrieve_nonexistent_review(self):
         """
         Проверяет обработку запроса к несуществующему отзыву.
@@ -188,6 +238,67 @@ class ReviewTestCase(APITestCase):
         # Проверяем, что отзыв больше не существует в базе данных
         self.assertFalse(Review.objects.filter(id=review.id).exists())
 
+    def test_bulk_update_reviews(self):
+        """
+        Проверяет массовое изменение текста отзывов по фильтру объявления.
+        """
+        other_ad = Ad.objects.create(title="Other Ad", price=500, author=self.user)
+        Review.objects.create(text="First review", author=self.user, ad=self.ad)
+        Review.objects.create(text="Second review", author=self.user, ad=self.ad)
+        Review.objects.create(text="Third review", author=self.user, ad=other_ad)
+
+        url = reverse("reviews:review-bulk-update")
+        data = {"data": {"text": "Updated"}}
+        response = self.client.patch(
+            f"{url}?ad={self.ad.pk}",
+            data=json.dumps(data),
+            content_type="application/json",
+        )
+
+        # 1 гипотеза
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"updated": 2})
+
+        # 2 гипотеза - отзывы другого объявления не изменены
+        self.assertEqual(
+            list(Review.objects.order_by("pk").values_list("text", flat=True)),
+            ["Updated", "Updated", "Third review"],
+        )
+
+        # 3 гипотеза - текст проверяется ReviewValidator
+        data = {"ids": [1], "data": {"text": "Это спам"}}
+        response = self.client.patch(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete_reviews(self):
+        """
+        Проверяет массовое удаление отзывов и запрет удаления чужих отзывов.
+        """
+        other_user = User.objects.create_user(
+            email="other@example.com", password="testpass", is_active=True
+        )
+        own = Review.objects.create(text="Own review", author=self.user, ad=self.ad)
+        foreign = Review.objects.create(
+            text="Foreign review", author=other_user, ad=self.ad
+        )
+        url = reverse("reviews:review-bulk-delete")
+
+        # 1 гипотеза - чужой отзыв в выборке запрещает удаление целиком
+        data = {"ids": [own.pk, foreign.pk]}
+        response = self.client.delete(
+            url, data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Review.objects.count(), 2)
+
+        # 2 гипотеза - удаление своих отзывов по фильтру автора
+        response = self.client.delete(f"{url}?author={self.user.pk}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"deleted": 1})
+        self.assertEqual(list(Review.objects.all()), [foreign])
+
     def test_review_repr(self):
         """
         Проверяет строковое представление объекта Review с помощью метода __repr__.
@@ -220,6 +331,251 @@ created_at={review.created_at})"""
         self.assertEqual(Review._meta.ordering, ["-created_at"])
 
 
+class ReviewCountersTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.ad = Ad.objects.create(title="Test Ad", price=1000, author=self.user)
+
+    def create_review(self, text="Отзыв"):
+        response = self.client.post(
+            reverse("reviews:review-create"),
+            data=json.dumps({"text": text, "ad": self.ad.pk}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Review.objects.get(pk=response.json()["id"])
+
+    def test_counters_follow_create_and_delete(self):
+        """
+        Проверяет счётчик и дату последнего отзыва при создании и удалении.
+        """
+        first = self.create_review()
+        second = self.create_review()
+
+        # 1 гипотеза - создание отзывов увеличивает счётчик
+        self.ad.refresh_from_db()
+        self.assertEqual(self.ad.review_count, 2)
+        self.assertEqual(self.ad.last_reviewed_at, second.created_at)
+
+        # 2 гипотеза - счётчики видны в объявлении
+        response = self.client.get(reverse("ads:ads-list"))
+        item = response.json()["results"][0]
+        self.assertEqual(item["reviewCount"], 2)
+        self.assertIsNotNone(item["lastReviewedAt"])
+
+        # 3 гипотеза - удаление последнего отзыва возвращает дату предыдущего
+        url = reverse("reviews:review-delete", kwargs={"pk": second.pk})
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.ad.refresh_from_db()
+        self.assertEqual(self.ad.review_count, 1)
+        self.assertEqual(self.ad.last_reviewed_at, first.created_at)
+
+        # 4 гипотеза - массовое удаление обновляет счётчики
+        response = self.client.delete(
+            reverse("reviews:review-bulk-delete"),
+            data=json.dumps({"ids": [first.pk]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.ad.refresh_from_db()
+        self.assertEqual(self.ad.review_count, 0)
+        self.assertIsNone(self.ad.last_reviewed_at)
+
+    def test_counters_follow_review_moved_to_other_ad(self):
+        """
+        Проверяет счётчики обоих объявлений при переносе отзыва через PATCH.
+        """
+        other_ad = Ad.objects.create(title="Other Ad", price=500, author=self.user)
+        first = self.create_review()
+        second = self.create_review()
+
+        url = reverse("reviews:review-update", kwargs={"pk": second.pk})
+        response = self.client.patch(
+            url,
+            data=json.dumps({"ad": other_ad.pk}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 1 гипотеза - старое объявление потеряло отзыв и дату последнего отзыва
+        self.ad.refresh_from_db()
+        self.assertEqual(self.ad.review_count, 1)
+        self.assertEqual(self.ad.last_reviewed_at, first.created_at)
+
+        # 2 гипотеза - новое объявление получило отзыв
+        other_ad.refresh_from_db()
+        self.assertEqual(other_ad.review_count, 1)
+        self.assertEqual(other_ad.last_reviewed_at, second.created_at)
+
+        # 3 гипотеза - изменение текста без переноса счётчики не меняет
+        response = self.client.patch(
+            url,
+            data=json.dumps({"text": "Отличный товар"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        other_ad.refresh_from_db()
+        self.assertEqual(other_ad.review_count, 1)
+
+    def test_reconcile_review_counters(self):
+        """
+        Проверяет, что команда reconcile_review_counters исправляет расхождения.
+        """
+        other_ad = Ad.objects.create(title="Other Ad", price=500, author=self.user)
+        # Отзывы, созданные в обход представлений, не учтены в счётчиках
+        review = Review.objects.create(text="Отзыв", author=self.user, ad=self.ad)
+        Ad.objects.filter(pk=other_ad.pk).update(review_count=5)
+
+        out = io.StringIO()
+        call_command("reconcile_review_counters", "--batch-size", "1", stdout=out)
+        self.assertIn("Исправлено объявлений: 2", out.getvalue())
+
+        self.ad.refresh_from_db()
+        other_ad.refresh_from_db()
+        self.assertEqual(self.ad.review_count, 1)
+        self.assertEqual(self.ad.last_reviewed_at, review.created_at)
+        self.assertEqual(other_ad.review_count, 0)
+
+        # Повторный запуск ничего не меняет
+        out = io.StringIO()
+        call_command("reconcile_review_counters", stdout=out)
+        self.assertIn("Исправлено объявлений: 0", out.getvalue())
+
+
+class AdReviewListAPIViewTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.ad = Ad.objects.create(title="Test Ad", price=1000, author=self.user)
+        other_ad = Ad.objects.create(title="Other Ad", price=500, author=self.user)
+        for index in range(6):
+            Review.objects.create(text=f"Отзыв {index}", author=self.user, ad=self.ad)
+            Review.objects.create(text=f"Чужой {index}", author=self.user, ad=other_ad)
+
+    def test_ad_reviews_feed(self):
+        """
+        Проверяет ленту отзывов одного объявления с пагинацией по курсору.
+        """
+        url = reverse("ads:ads-reviews", kwargs={"pk": self.ad.pk})
+
+        # 1 гипотеза - только отзывы объявления, новые выше
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()
+        self.assertEqual(
+            [item["text"] for item in first_page["results"]],
+            ["Отзыв 5", "Отзыв 4", "Отзыв 3", "Отзыв 2"],
+        )
+        self.assertIsNone(first_page["previous"])
+
+        # 2 гипотеза - следующая страница по курсору
+        response = self.client.get(first_page["next"])
+        self.assertEqual(
+            [item["text"] for item in response.json()["results"]],
+            ["Отзыв 1", "Отзыв 0"],
+        )
+        self.assertIsNone(response.json()["next"])
+
+        # 3 гипотеза - несуществующее объявление
+        response = self.client.get(reverse("ads:ads-reviews", kwargs={"pk": 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # 4 гипотеза - подделанный курсор
+        payload = json.dumps(
+            {"p": ["2020-01-01T00:00:00Z", "zz"], "r": 0, "k": ["-created_at", "-id"]}
+        )
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        response = self.client.get(url, {"cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ad_reviews_use_index(self):
+        """
+        Проверяет, что страница ленты читается по индексу (ad_id, created_at, id).
+        """
+        queryset = Review.objects.filter(ad=self.ad).order_by("-created_at", "-id")
+        self.assertIn("reviews_ad_created_id_idx", queryset[:5].explain())
+
+
+class ReviewListValuesParityTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+        ad = Ad.objects.create(title="Test Ad", price=1000, author=self.user)
+        for index in range(6):
+            Review.objects.create(text=f"Отзыв {index}", author=self.user, ad=ad)
+
+    def assertParity(self, response, queryset):
+        """
+        Сравнивает байты ответа быстрого пути с рендерингом ReviewSerializer.
+        """
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = ReviewSerializer(
+            queryset, many=True, context={"request": response.wsgi_request}
+        ).data
+        renderer = CamelCaseJSONRenderer()
+        self.assertEqual(
+            renderer.render(response.data["results"]), renderer.render(expected)
+        )
+
+    def test_list_parity(self):
+        """
+        Проверяет, что список через .values() совпадает с выводом ReviewSerializer.
+        """
+        url = reverse("reviews:review-list")
+
+        # 1 гипотеза - постраничная пагинация
+        ordered = Review.objects.order_by("-created_at")
+        self.assertParity(self.client.get(url), ordered[:4])
+        self.assertParity(self.client.get(url, {"page": 2}), ordered[4:])
+
+        # 2 гипотеза - пагинация по курсору
+        ordered = Review.objects.order_by("-created_at", "-id")
+        response = self.client.get(url, {"pagination": "cursor"})
+        self.assertParity(response, ordered[:4])
+        self.assertParity(self.client.get(response.data["next"]), ordered[4:])
+
+    def test_list_sparse_fields(self):
+        """
+        Проверяет, что ?fields= оставляет в списке отзывов только нужные поля.
+        """
+        response = self.client.get(reverse("reviews:review-list"), {"fields": "id,ad"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for item in response.json()["results"]:
+            self.assertEqual(set(item), {"id", "ad"})
+
+    def test_list_expand_author(self):
+        """
+        Проверяет ?expand=author в списке отзывов, в том числе без автора.
+        """
+        other = User.objects.create_user(email="other@example.com", password="x")
+        Review.objects.create(text="Отзыв", author=other, ad=Ad.objects.first())
+        Review.objects.create(text="Без автора", author=None, ad=Ad.objects.first())
+        url = reverse("reviews:review-list")
+
+        # Проверка роли администратора + количество + страница с JOIN авторов
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"expand": "author"})
+        results = response.data["results"]
+        self.assertIsNone(results[0]["author"])
+        self.assertEqual(results[1]["author"]["id"], other.pk)
+
+        expected = ReviewSerializer(
+            Review.objects.order_by("-created_at")[:4],
+            many=True,
+            expand=["author"],
+            context={"request": response.wsgi_request},
+        ).data
+        renderer = CamelCaseJSONRenderer()
+        self.assertEqual(renderer.render(results), renderer.render(expected))
+
+
 class ReviewValidatorTest(TestCase):
     def setUp(self):
         self.validator = ReviewValidator()
@@ -323,3 +679,129 @@ class ReviewValidatorTest(TestCase):
             str(context.exception.detail[0]),
             "Текст отзыва содержит запрещенное слово: спам.",
         )
+
+
+class ForbiddenWordsTest(APITestCase):
+    def setUp(self):
+        self.validator = ReviewValidator()
+        forbidden_words.invalidate()
+        self.addCleanup(forbidden_words.invalidate)
+
+    def assertForbidden(self, text, word):
+        with self.assertRaises(ValidationError) as context:
+            self.validator.validate_forbidden_words(text)
+        self.assertEqual(
+            str(context.exception.detail[0]),
+            f"Текст отзыва содержит запрещенное слово: {word}.",
+        )
+
+    def test_matcher_normalization(self):
+        """
+        Проверяет поиск без учёта регистра, с ё = е и по формам слова.
+        """
+        matcher = ForbiddenWordsMatcher(["реклама", "Ёрш", "спам", "плохое слово"])
+        # 1 гипотеза - регистр и ё не важны, слово возвращается как в списке
+        self.assertEqual(matcher.find("Это РЕКЛАМА"), "реклама")
+        self.assertEqual(matcher.find("ершистый"), "Ёрш")
+        # 2 гипотеза - окончание слова отбрасывается, формы находятся
+        self.assertEqual(matcher.find("Без рекламы и рекламой"), "реклама")
+        # 3 гипотеза - короткие слова не сокращаются
+        self.assertIsNone(matcher.find("спа-салон"))
+        self.assertEqual(matcher.find("СПАМЕР"), "спам")
+        # 4 гипотеза - фразы и первое по позиции слово
+        self.assertEqual(matcher.find("спам и плохие слова"), "спам")
+        self.assertEqual(matcher.find("плохое слово, а потом спам"), "плохое слово")
+        self.assertIsNone(matcher.find("Отличный продавец"))
+
+    def test_matcher_overlapping_words(self):
+        """
+        Проверяет слова, вложенные друг в друга (суффиксные ссылки автомата).
+        """
+        matcher = ForbiddenWordsMatcher(["he", "she", "hers", "his"])
+        self.assertEqual(matcher.find("ushers"), "she")
+        self.assertEqual(matcher.find("ahishe"), "his")
+        self.assertIsNone(matcher.find("hs"))
+
+    def test_words_from_database_reload(self):
+        """
+        Проверяет, что изменения таблицы ForbiddenWord применяются без
+        перезапуска.
+        """
+        self.validator.validate_forbidden_words("Продавцы - мошенники")
+        word = ForbiddenWord.objects.create(word="мошенник")
+        # 1 гипотеза - новое слово применяется сразу (сигнал модели)
+        self.assertForbidden("Продавцы - мошенники", "мошенник")
+        # 2 гипотеза - удалённое слово перестаёт применяться
+        word.delete()
+        self.validator.validate_forbidden_words("Продавцы - мошенники")
+
+    def test_words_from_database_other_process(self):
+        """
+        Проверяет, что изменения таблицы без сигналов этого процесса (как из
+        другого воркера) применяются без общего кэша.
+        """
+        self.validator.validate_forbidden_words("Продавцы - мошенники")
+        # bulk_create и update() не отправляют сигналы
+        ForbiddenWord.objects.bulk_create([ForbiddenWord(word="жулик")])
+        self.assertForbidden("Жулики!", "жулик")
+        ForbiddenWord.objects.filter(word="жулик").update(
+            word="мошенник", updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        self.validator.validate_forbidden_words("Жулики!")
+        self.assertForbidden("Продавцы - мошенники", "мошенник")
+
+    def test_validator_forbidden_words_override(self):
+        """
+        Проверяет, что переопределённый FORBIDDEN_WORDS применяется.
+        """
+
+        class CustomValidator(ReviewValidator):
+            FORBIDDEN_WORDS = ["подделка"]
+
+        with self.assertRaises(ValidationError):
+            CustomValidator().validate_forbidden_words("Это подделка")
+        CustomValidator().validate_forbidden_words("Это спам")
+        self.assertForbidden("Это спам", "спам")
+
+    def test_words_from_file_reload(self):
+        """
+        Проверяет список слов из файла и его перечитывание при изменении.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("# комментарий\n\nподделка\n")
+            with override_settings(REVIEW_FORBIDDEN_WORDS_FILE=path):
+                self.assertForbidden("Это ПОДДЕЛКИ", "подделка")
+                self.validator.validate_forbidden_words("Это копия")
+
+                with open(path, "a", encoding="utf-8") as file:
+                    file.write("копия\n")
+                stat = os.stat(path)
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                self.assertForbidden("Это копия", "копия")
+
+    def test_create_review_with_forbidden_word(self):
+        """
+        Проверяет, что отзыв со словом из таблицы не создаётся.
+        """
+        user = User.objects.create_user(
+            email="words@example.com", password="testpass", is_active=True
+        )
+        author = User.objects.create_user(
+            email="seller@example.com", password="testpass", is_active=True
+        )
+        ad = Ad.objects.create(title="Телефон", price=1000, author=author)
+        ForbiddenWord.objects.create(word="обман")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.post(
+            reverse("reviews:review-create"),
+            {"text": "Сплошной ОБМАН", "ad": ad.pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(
+            "Текст отзыва содержит запрещенное слово: обман.", str(response.data)
+        )
+        self.assertFalse(Review.objects.exists())
@@ -2,6 +2,8 @@ from django.urls import path
 
 from reviews.apps import ReviewsConfig
 from reviews.views import (
+    ReviewBulkDestroyAPIView,
+    ReviewBulkUpdateAPIView,
     ReviewCreateAPIView,
     ReviewDestroyAPIView,
     ReviewListAPIView,
@@ -16,6 +18,8 @@ urlpatterns = [
     path("create/", ReviewCreateAPIView.as_view(), name="review-create"),
     path("<int:pk>/", ReviewRetrieveAPIView.as_view(), name="review-retrieve"),
     path("update/<int:pk>/", ReviewUpdateAPIView.as_view(), name="review-update"),
+    path("bulk-update/", ReviewBulkUpdateAPIView.as_view(), name="review-bulk-update"),
+    path("bulk-delete/", ReviewBulkDestroyAPIView.as_view(), name="review-bulk-delete"),
     path(
         "delete/<int:pk>/",
         ReviewDestroyAPIView.as_view(),
@@ -1,12 +1,14 @@
 from rest_framework.exceptions import ValidationError
 
+from reviews.moderation import DEFAULT_FORBIDDEN_WORDS, forbidden_words
+
 
 class ReviewValidator:
     """
     Валидатор для проверки бизнес-логики отзыва.
     """
 
-    FORBIDDEN_WORDS = ["спам", "реклама", "оскорбление"]
+    FORBIDDEN_WORDS = DEFAULT_FORBIDDEN_WORDS
     MAX_TEXT_LENGTH = 1000
 
     def __call__(self, data: dict[str, any]) -> None:
@@ -38,12 +40,14 @@ class ReviewValidator:
     def validate_forbidden_words(self, text: str) -> None:
         """
         Проверка на наличие запрещенных слов в тексте отзыва.
+
+        Текст нормализуется один раз и проверяется одним проходом автомата
+        по FORBIDDEN_WORDS вместе со словами из файла и таблицы
+        ForbiddenWord (reviews/moderation.py).
         """
-        for word in self.FORBIDDEN_WORDS:
-            if word in text.lower():
-                raise ValidationError(
-                    f"Текст отзыва содержит запрещенное слово: {word}."
-                )
+        word = forbidden_words.find(text, self.FORBIDDEN_WORDS)
+        if word is not None:
+            raise ValidationError(f"Текст отзыва содержит запрещенное слово: {word}.")
 
     def validate_text_length(self, text: str) -> None:
         """
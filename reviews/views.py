@@ -1,9 +1,21 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
 from ads.models import Ad
+from config.cache import bump_generation
+from config.mixins import (
+    BulkDestroyMixin,
+    BulkUpdateMixin,
+    ConditionalRetrieveMixin,
+    ValuesListMixin,
+)
+from config.paginations import PaginationModeMixin
+from reviews.counters import review_added, reviews_removed
+from reviews.filters import ReviewFilter
 from reviews.models import Review
-from reviews.paginations import ReviewPaginator
+from reviews.paginations import ReviewCursorPaginator, ReviewPaginator
 from reviews.serializers import ReviewSerializer
 from users.permissions import IsAdmin, IsAuthor
 
@@ -16,17 +28,38 @@ class ReviewCreateAPIView(generics.CreateAPIView):
     def perform_create(self, serializer):
         ad_id = self.request.data.get("ad")
         ad = Ad.objects.get(id=ad_id)
-        serializer.save(author=self.request.user, ad=ad)
+        with transaction.atomic():
+            review = serializer.save(author=self.request.user, ad=ad)
+            review_added(review)
 
 
-class ReviewListAPIView(generics.ListAPIView):
+class ReviewListAPIView(ValuesListMixin, PaginationModeMixin, generics.ListAPIView):
     serializer_class = ReviewSerializer
     queryset = Review.objects.all().order_by("-created_at")
     pagination_class = ReviewPaginator
+    # пагинация по курсору (?pagination=cursor) для бесконечной ленты
+    cursor_pagination_class = ReviewCursorPaginator
     permission_classes = (IsAdmin | IsAuthenticated,)
 
 
-class ReviewRetrieveAPIView(generics.RetrieveAPIView):
+class AdReviewListAPIView(ValuesListMixin, generics.ListAPIView):
+    """
+    Отзывы одного объявления (/ads/<pk>/reviews/), новые выше.
+
+    Пагинация по курсору: каждая страница - диапазонное чтение индекса
+    (ad_id, created_at, id) независимо от общего количества отзывов.
+    """
+
+    serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPaginator
+    permission_classes = (IsAdmin | IsAuthenticated,)
+
+    def get_queryset(self):
+        ad = get_object_or_404(Ad.objects.only("pk"), pk=self.kwargs["pk"])
+        return Review.objects.filter(ad=ad)
+
+
+class ReviewRetrieveAPIView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     serializer_class = ReviewSerializer
     queryset = Review.objects.all()
     permission_classes = (
@@ -43,6 +76,15 @@ class ReviewUpdateAPIView(generics.UpdateAPIView):
         IsAdmin | IsAuthor,
     )
 
+    def perform_update(self, serializer):
+        old_ad_id = serializer.instance.ad_id
+        with transaction.atomic():
+            review = serializer.save()
+            if review.ad_id != old_ad_id:
+                # Отзыв перенесён на другое объявление - учитываем в обоих
+                reviews_removed([old_ad_id])
+                review_added(review)
+
 
 class ReviewDestroyAPIView(generics.DestroyAPIView):
     serializer_class = ReviewSerializer
@@ -51,3 +93,46 @@ class ReviewDestroyAPIView(generics.DestroyAPIView):
         IsAuthenticated,
         IsAdmin | IsAuthor,
     )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            reviews_removed([instance.ad_id])
+
+
+class ReviewBulkUpdateAPIView(BulkUpdateMixin, generics.GenericAPIView):
+    """
+    Массовое изменение текста отзывов одним UPDATE.
+
+    Тело запроса: {"ids": [...], "data": {"text": ...}}; вместо ids можно
+    передать фильтры ReviewFilter (?ad=, ?author=) в строке запроса.
+    """
+
+    serializer_class = ReviewSerializer
+    queryset = Review.objects.all()
+    filterset_class = ReviewFilter
+    permission_classes = (IsAuthenticated,)
+    bulk_update_fields = ("text",)
+
+    def perform_bulk_update(self, queryset, values):
+        updated = super().perform_bulk_update(queryset, values)
+        bump_generation(Review)
+        return updated
+
+
+class ReviewBulkDestroyAPIView(BulkDestroyMixin, generics.GenericAPIView):
+    """
+    Массовое удаление отзывов по списку ids или по фильтрам ReviewFilter.
+    """
+
+    serializer_class = ReviewSerializer
+    queryset = Review.objects.all()
+    filterset_class = ReviewFilter
+    permission_classes = (IsAuthenticated,)
+
+    def perform_bulk_destroy(self, queryset):
+        with transaction.atomic():
+            ad_ids = list(queryset.order_by().values_list("ad_id", flat=True))
+            deleted = super().perform_bulk_destroy(queryset)
+            reviews_removed(ad_ids)
+        return deleted
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="обновляется при каждом сохранении пользователя",
+                verbose_name="дата и время изменения",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-18 04:52
+
+import config.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_image_status_user_image_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                help_text="Загрузите аватарку",
+                null=True,
+                storage=config.storage.get_media_storage,
+                upload_to="users/avatars/",
+                verbose_name="аватар",
+            ),
+        ),
+    ]
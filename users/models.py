@@ -5,6 +5,9 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
+from config.images import IMAGE_STATUS_CHOICES, IMAGE_STATUS_NONE
+from config.storage import get_media_storage
+
 NULLABLE = {"blank": True, "null": True}
 
 
@@ -67,10 +70,33 @@ class User(AbstractUser):
 
     image = models.ImageField(
         upload_to="users/avatars/",
+        storage=get_media_storage,
+        # Индекс для подсчёта ссылок на файл при его освобождении
+        db_index=True,
         verbose_name="аватар",
         help_text="Загрузите аватарку",
         **NULLABLE
     )
+    # Заполняются задачей Celery после загрузки аватара (config/images.py)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="варианты аватара",
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_STATUS_NONE,
+        editable=False,
+        verbose_name="состояние обработки аватара",
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="дата и время изменения",
+        help_text="обновляется при каждом сохранении пользователя",
+    )
 
     ROLE_USER = "user"
     ROLE_ADMIN = "admin"
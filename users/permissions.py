@@ -28,3 +28,9 @@ class IsAuthor(permissions.BasePermission):
         if obj.author == request.user:
             return True
         return False
+
+    def has_bulk_permission(self, request, view, queryset):
+        """
+        Проверяет одним запросом, что все объекты выборки принадлежат пользователю.
+        """
+        return not queryset.exclude(author=request.user).exists()
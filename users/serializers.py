@@ -3,10 +3,13 @@ import secrets
 from django.core import signing
 from rest_framework import serializers
 
+from config.images import ImageThumbnailField, ImageVariantsField
+from config.media import MediaImageField
+from config.serializers import SparseFieldsetSerializerMixin
 from users.models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели User.
     """
@@ -23,7 +26,7 @@ class UserSerializer(serializers.ModelSerializer):
     phone = serializers.CharField(allow_null=True, required=False)
     country = serializers.CharField(allow_null=True, required=False)
     role = serializers.CharField(read_only=True)
-    image = serializers.ImageField(
+    image = MediaImageField(
         # Поле может быть пустым
         allow_null=True,
         # Необязательно для заполнения
@@ -31,6 +34,9 @@ class UserSerializer(serializers.ModelSerializer):
         # Возвращать полный URL (если настроен MEDIA_URL)
         use_url=True,
     )
+    # Уменьшенные копии изображения (WebP и JPEG) и состояние их генерации
+    image_variants = ImageVariantsField()
+    image_status = serializers.CharField(read_only=True)
 
     def create(self, validated_data):
         email = validated_data.get("email")
@@ -66,10 +72,32 @@ class UserSerializer(serializers.ModelSerializer):
             "phone",  # Не обязателен для заполнения
             "country",  # Не обязателен для заполнения
             "image",  # Не обязателен для заполнения
+            "image_variants",  # Только для чтения
+            "image_status",  # Только для чтения
             "role",  # Только для чтения
         )
 
 
+class AuthorSummarySerializer(serializers.ModelSerializer):
+    """
+    Краткие данные автора для списков объявлений и отзывов (?expand=author).
+    """
+
+    # URL миниатюры аватара (вариант thumb в WebP) или None
+    avatar = ImageThumbnailField()
+
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "first_name",
+            "last_name",
+            "tg_nick",
+            "avatar",
+        )
+        read_only_fields = fields
+
+
 class PasswordResetSerializer(serializers.Serializer):
     """
     Сериализатор для отправки email на сброс пароля
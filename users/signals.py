@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.cache import bump_generation
+from config.images import release_deleted_image, schedule_image_variants
+from users.models import User
+from users.tasks import generate_user_image_variants
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, **kwargs):
+    """
+    Сбрасывает кэши, зависящие от таблицы пользователей (встроенные авторы).
+    """
+    bump_generation(User)
+
+
+@receiver(post_save, sender=User)
+def schedule_user_image_variants(sender, instance, **kwargs):
+    """
+    Ставит генерацию уменьшенных копий аватара после его загрузки.
+    """
+    schedule_image_variants(instance, generate_user_image_variants)
+
+
+@receiver(post_delete, sender=User)
+def release_user_image(sender, instance, **kwargs):
+    """
+    Удаляет файл аватара, если на него больше не ссылаются другие записи.
+    """
+    release_deleted_image(instance)
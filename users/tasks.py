@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from config.images import process_image_variants
+from users.models import User
+
+
+@shared_task
+def generate_user_image_variants(user_id: int) -> None:
+    """
+    Генерирует уменьшенные копии аватара пользователя.
+    """
+    if not process_image_variants(User, user_id):
+        # Аватар заменили во время обработки - обрабатываем новый
+        generate_user_image_variants.delay(user_id)
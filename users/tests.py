@@ -1,10 +1,18 @@
 import json
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
 
 from django.contrib.auth.models import Group
 from django.core import mail, signing
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.mail import EmailMessage
 from django.core.management import call_command
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APITestCase
 
@@ -113,6 +121,150 @@ class UserRegisterAPIViewTest(APITestCase):
 
 
 #  Тесты для подтверждения email
+class UserRetrieveAPIViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_retrieve_user_conditional_get(self):
+        """
+        Проверяет ответ 304 на условный запрос неизменённого пользователя.
+        """
+        url = reverse("users:user-retrieve", kwargs={"pk": self.user.pk})
+
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.user.first_name = "Иван"
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["firstName"], "Иван")
+
+    @override_settings(MEDIA_SIGNED_URL_MAX_AGE=3600)
+    def test_retrieve_user_conditional_get_signing_window(self):
+        """
+        Проверяет, что ETag меняется со сменой интервала подписи ссылок.
+        """
+        url = reverse("users:user-retrieve", kwargs={"pk": self.user.pk})
+        now = 3600 * 500000 + 600
+
+        # 1 гипотеза - ответ кэшируется только до конца интервала подписи
+        with patch("time.time", return_value=now):
+            response = self.client.get(url)
+            etag = response["ETag"]
+            self.assertEqual(response["Cache-Control"], "private, max-age=3000")
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # 2 гипотеза - в следующем интервале - новое тело, а не 304
+        with patch("time.time", return_value=now + 3600):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+            last_modified = response["Last-Modified"]
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class UserListAPIViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123", is_active=True
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_sparse_fields(self):
+        """
+        Проверяет, что ?fields= сужает ответ и выборку пользователей.
+        """
+        url = reverse("users:user-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "id,email,firstName"})
+
+        # 1 гипотеза - в ответе только запрошенные поля
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [{"id": self.user.pk, "email": self.user.email, "firstName": ""}],
+        )
+
+        # 2 гипотеза - остальные колонки не читаются
+        select = [q["sql"] for q in queries if 'FROM "users_user"' in q["sql"]]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn("phone", select[-1])
+        self.assertNotIn("image", select[-1])
+
+        # 3 гипотеза - поля только для записи запросить нельзя
+        response = self.client.get(url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProtectedMediaTest(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="password123", is_active=True
+        )
+        self.user.image = SimpleUploadedFile("avatar.png", b"\x89PNG\r\n\x1a\n")
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_avatar_signed_url(self):
+        """
+        Проверяет, что аватар отдаётся только по подписанной ссылке, а сам файл
+        передаётся nginx через X-Accel-Redirect.
+        """
+        url = reverse("users:user-retrieve", kwargs={"pk": self.user.pk})
+        image_url = self.client.get(url).json()["image"]
+        self.assertIn("signature=", image_url)
+
+        # 1 гипотеза - по подписанной ссылке Django не отдаёт содержимое файла
+        self.client.force_authenticate(user=None)
+        response = self.client.get(image_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.user.image.name}"
+        )
+        self.assertTrue(response["Cache-Control"].startswith("private, max-age="))
+
+        # 2 гипотеза - ссылка с чужой или изменённой подписью отклоняется
+        response = self.client.get(image_url.replace("signature=", "signature=x"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(image_url.split("?")[0])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        # 3 гипотеза - просроченная ссылка отклоняется
+        with patch("config.media.time.time", return_value=time.time() + 3 * 3600):
+            response = self.client.get(image_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_public_image_url_not_signed(self):
+        """
+        Проверяет, что изображения объявлений отдаются без подписи (напрямую nginx).
+        """
+        ad = Ad.objects.create(
+            title="moto",
+            price=100,
+            author=self.user,
+            image=SimpleUploadedFile("photo.png", b"\x89PNG\r\n\x1a\n"),
+        )
+        response = self.client.get(reverse("ads:ads-retrieve", kwargs={"pk": ad.pk}))
+        self.assertEqual(
+            response.json()["image"], f"http://testserver/media/{ad.image.name}"
+        )
+
+
 class EmailVerificationAPIViewTest(APITestCase):
     """
     Проверяет подтверждение email пользователя.
@@ -11,6 +11,7 @@ from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 
 from config import settings
+from config.mixins import ConditionalRetrieveMixin, SparseFieldsetMixin
 from config.settings import DEFAULT_FROM_EMAIL
 from users.models import User
 from users.serializers import (
@@ -30,16 +31,18 @@ class UserCreateAPIView(CreateAPIView):
         user.save()
 
 
-class UserListAPIView(generics.ListAPIView):
+class UserListAPIView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     permission_classes = [IsAuthenticated]
 
 
-class UserRetrieveAPIView(generics.RetrieveAPIView):
+class UserRetrieveAPIView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     permission_classes = [IsAuthenticated]
+    # аватары отдаются по подписанным ссылкам с ограниченным сроком действия
+    signed_media = True
 
 
 #  поддерживает как put так и putch